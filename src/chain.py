@@ -1,34 +1,16 @@
-from src.fp import Fp
-from src.fp2 import Fp2
-from src.fp6 import Fp6
-from src.utils import (
-    sbb,
-    mac,
-    adc,
-    wrapping_mul_u64,
-    wrapping_sub_u64,
-    CtOption,
-    Choice,
-    BLS_X,
-    BLS_X_IS_NEGATIVE,
-)
-from src.scalar import Scalar
-from src.fp12 import (
-    Fp12,
-)
-from src.g1 import G1Affine
-from src.g2 import G2Affine, G2Projective
-from abc import ABC, abstractmethod
+# Addition chains for the fixed exponents of the base field. They only rely on
+# `square` and `*`, so they apply to both `Fp` and `Fp2` elements.
 
 
-def square(x: Fp2, n):
+def square(x, n):
     result = x
     for _ in range(n):
         result = result.square()
     return result
 
 
-def chain_pm3div4(var0: Fp2):
+# Computes var0^((p - 3) / 4)
+def chain_pm3div4(var0):
     var1 = var0.square()  # /* 0 : 2 */
     var9 = var1 * var0  # /* 1 : 3 */
     var5 = var1.square()  # /* 2 : 4 */
@@ -312,3 +294,21 @@ def chain_pm3div4(var0: Fp2):
     var1 *= var2
     #  456 : 1000602388805416848354447456433976039139220704984751971333014534031007912622709466110671907282253916009473568139946
     return var1.square()
+
+
+# Computes var0^(p - 2) = (var0^((p - 3) / 4))^4 * var0, which is the
+# inverse of var0 when var0 is nonzero.
+def chain_pm2(var0):
+    return square(chain_pm3div4(var0), 2) * var0
+
+
+# Computes var0^((p + 1) / 4) = var0^((p - 3) / 4) * var0, which is a square
+# root of var0 when var0 is a quadratic residue (as p = 3 mod 4).
+def chain_pp1div4(var0):
+    return chain_pm3div4(var0) * var0
+
+
+# Computes var0^((p - 1) / 2) = (var0^((p - 3) / 4))^2 * var0, which is the
+# Legendre symbol of var0 when var0 is in Fp.
+def chain_pm1div2(var0):
+    return chain_pm3div4(var0).square() * var0
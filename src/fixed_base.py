@@ -0,0 +1,181 @@
+import hashlib
+import mmap
+import struct
+from src.groups import GROUPS, group_name
+from src.msm import msm_window_count, window_scalar_to_int, conditional_lookup
+from src.scalar import Scalar
+from src.utils import Choice, signed_digits
+
+# Fixed-base scalar multiplication with precomputed tables.
+#
+# The scalar is recoded in signed base-2^w digits d_0, ..., d_(count-1) in
+# [-2^(w - 1), 2^(w - 1)), and the table of a base point P holds, for every
+# window i, the affine multiples j * 2^(w * i) * P for j = 1, ..., 2^(w - 1).
+# The product is then the sum of one (possibly negated) entry per window: no
+# doublings at all, and a single mixed addition per window. Every entry is read
+# with `conditional_lookup`, which scans its whole window, so the sequence of
+# operations does not depend on the scalar.
+#
+# Tables can be saved to a file and loaded back, so that worker processes do not
+# rebuild them at startup. The file holds:
+#
+#     [ header ]                           `HEADER`: magic, version, group,
+#                                          width and window count
+#     [ checksum ]                         SHA-256 of the header and payload
+#     [ x | y ] for every entry            2 * size bytes each, window by window
+#     [ infinity ] for every entry         1 byte each (0 or 1)
+#
+# where the coordinates are encoded with the bulk codecs of the field (see
+# `Fp.encode_many`) and size is 48 for G1 and 96 for G2.
+
+# The default window width, which trades the size of the table (2^(w - 1)
+# entries in each of `msm_window_count(w)` windows) against the number of mixed
+# additions. The scans grow with the table, so wider windows stop paying off.
+FIXED_BASE_WIDTH = 5
+
+MAGIC = b"BLS12FBT"
+VERSION = 1
+HEADER = struct.Struct("<8sH2sBHx")
+CHECKSUM_SIZE = 32
+
+# The tables of the generators of G1 and G2, built on first use.
+GENERATOR_TABLES = {}
+
+
+# A table of precomputed multiples of a fixed base point of G1 or G2.
+class FixedBaseTable:
+    def __init__(self, group, width, windows):
+        # "G1" or "G2"
+        self.group = group
+        self.width = width
+        # windows[i][j - 1] = j * 2^(width * i) * P, in affine coordinates
+        self.windows = windows
+
+    # Builds the table of the point `base` (affine or projective) with windows
+    # of `width` bits. All the entries are normalized with a single inversion.
+    def build(base, width=FIXED_BASE_WIDTH):
+        if not 2 <= width <= 16:
+            raise ValueError("Window width must be between 2 and 16")
+
+        group = group_name(type(base))
+        projective, affine, from_affine, module, field, size = GROUPS[group]
+        if isinstance(base, affine):
+            base = from_affine(base)
+
+        entries = []
+        for _ in range(msm_window_count(width)):
+            multiple = base
+            for _ in range(1 << (width - 1)):
+                entries.append(multiple)
+                multiple = multiple + base
+            for _ in range(width):
+                base = base.double()
+
+        normalized = [affine.identity() for _ in entries]
+        projective.batch_normalize(entries, normalized)
+
+        half = 1 << (width - 1)
+        windows = [normalized[i : i + half] for i in range(0, len(normalized), half)]
+        return FixedBaseTable(group, width, windows)
+
+    # Returns the table of the generator of the group of the projective type
+    # `projective` (`G1Projective` or `G2Projective`), building it on first use.
+    def generator(projective):
+        group = group_name(projective)
+        if group not in GENERATOR_TABLES:
+            GENERATOR_TABLES[group] = FixedBaseTable.build(projective.generator())
+        return GENERATOR_TABLES[group]
+
+    # Multiplies the base point of this table by the scalar `by` (a `Scalar` or
+    # an integer in [0, 2^256)), returning a projective point. Raises ValueError
+    # for integers out of that range.
+    def multiply(self, by: Scalar):
+        projective, affine, from_affine, module, field, size = GROUPS[self.group]
+        digits = signed_digits(window_scalar_to_int(by), self.width, len(self.windows))
+
+        acc = projective.identity()
+        for d, window in zip(digits, self.windows):
+            acc = module.add_mixed(acc, conditional_lookup(affine, window, d))
+
+        return acc
+
+    # Serializes this table in the file format described above.
+    def to_bytes(self):
+        projective, affine, from_affine, module, field, size = GROUPS[self.group]
+        entries = [entry for window in self.windows for entry in window]
+
+        coordinates = []
+        for p in entries:
+            coordinates.append(p.x)
+            coordinates.append(p.y)
+        payload = bytes(field.encode_many(coordinates)) + bytes(
+            p.infinity.value for p in entries
+        )
+
+        header = HEADER.pack(
+            MAGIC, VERSION, self.group.encode(), self.width, len(self.windows)
+        )
+        return header + hashlib.sha256(header + payload).digest() + payload
+
+    # Deserializes a table produced by `to_bytes` from any buffer-protocol object
+    # (bytes, mmap, ...), which is read without being copied. Raises ValueError
+    # if the header is not that of a supported table, if the checksum does not
+    # match, or if an entry is not canonically encoded.
+    #
+    # The checksum detects corrupted files, not forged ones: tables must only be
+    # loaded from trusted locations.
+    def from_bytes(buffer):
+        view = memoryview(buffer).cast("B")
+        try:
+            if len(view) < HEADER.size + CHECKSUM_SIZE:
+                raise ValueError("Truncated fixed-base table")
+
+            magic, version, group, width, count = HEADER.unpack(view[: HEADER.size])
+            if magic != MAGIC:
+                raise ValueError("Not a fixed-base table")
+            if version != VERSION:
+                raise ValueError("Unsupported fixed-base table version")
+            group = group.decode("ascii", "replace")
+            if group not in GROUPS or not 2 <= width <= 16:
+                raise ValueError("Invalid fixed-base table header")
+            if count != msm_window_count(width):
+                raise ValueError("Invalid fixed-base table header")
+
+            projective, affine, from_affine, module, field, size = GROUPS[group]
+            half = 1 << (width - 1)
+            n = count * half
+            offset = HEADER.size + CHECKSUM_SIZE
+            if len(view) != offset + (2 * size + 1) * n:
+                raise ValueError("Truncated fixed-base table")
+
+            checksum = hashlib.sha256(view[: HEADER.size])
+            checksum.update(view[offset:])
+            if checksum.digest() != view[HEADER.size : offset]:
+                raise ValueError("Fixed-base table checksum mismatch")
+
+            coordinates = field.decode_many(view[offset : offset + 2 * size * n])
+            flags = bytes(view[offset + 2 * size * n :])
+            if coordinates.choice != 1 or max(flags) > 1:
+                raise ValueError("Invalid fixed-base table entries")
+            coordinates = coordinates.value
+        finally:
+            view.release()
+
+        entries = [
+            affine(coordinates[2 * i], coordinates[2 * i + 1], Choice(flag))
+            for i, flag in enumerate(flags)
+        ]
+        windows = [entries[i : i + half] for i in range(0, n, half)]
+        return FixedBaseTable(group, width, windows)
+
+    # Writes this table to the file at `path`.
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    # Loads a table saved with `save`, mapping the file into memory rather than
+    # reading it. See `from_bytes` for the errors raised.
+    def load(path):
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return FixedBaseTable.from_bytes(mapped)
@@ -6,9 +6,15 @@ from src.utils import (
     wrapping_mul_u64,
     wrapping_sub_u64,
     array_to_number,
+    number_to_array,
+    jacobi,
+    montgomery_batch_invert,
     CtOption,
     Choice,
+    pow_sliding_window,
+    BACKEND,
 )
+from src.chain import chain_pm2, chain_pp1div4
 
 
 class Fp:
@@ -119,7 +125,9 @@ class Fp:
 
         return Fp([r6, r7, r8, r9, r10, r11]).subtract_p()
 
-    def mul(self, rhs):
+    # Computes the full double-width product of `self` and `rhs` as twelve
+    # 64-bit limbs, without reducing it.
+    def mul_unreduced(self, rhs):
         t0, carry = mac(0, self.array[0], rhs.array[0], 0)
         t1, carry = mac(0, self.array[0], rhs.array[1], carry)
         t2, carry = mac(0, self.array[0], rhs.array[2], carry)
@@ -162,7 +170,25 @@ class Fp:
         t9, carry = mac(t9, self.array[5], rhs.array[4], carry)
         t10, t11 = mac(t10, self.array[5], rhs.array[5], carry)
 
-        return Fp.montgomery_reduce(t0, t1, t2, t3, t4, t5, t6, t7, t8, t9, t10, t11)
+        return (t0, t1, t2, t3, t4, t5, t6, t7, t8, t9, t10, t11)
+
+    def mul(self, rhs):
+        return Fp.montgomery_reduce(*self.mul_unreduced(rhs))
+
+    # Returns the product of `self` and `rhs` as an unreduced double-width
+    # integer. Sums and differences of such products can be accumulated with
+    # plain integer arithmetic and reduced only once, with `from_wide`.
+    def mul_wide(self, rhs):
+        return array_to_number(self.mul_unreduced(rhs))
+
+    # Montgomery-reduces the (possibly negative) double-width integer `t`,
+    # computing t / R mod p. This is the single reduction step of a lazily
+    # reduced computation built from `mul_wide`.
+    @staticmethod
+    def from_wide(t):
+        # Bring t into [0, pR), where a single Montgomery reduction followed by
+        # a conditional subtraction gives a fully reduced result.
+        return Fp.montgomery_reduce(*number_to_array(t % WIDE_MODULUS, 12))
 
     def subtract_p(self):
         r0, borrow = sbb(self.array[0], MODULUS[0], 0)
@@ -242,6 +268,72 @@ class Fp:
 
         return CtOption(tmp, is_some)
 
+    # Returns the integer holding the Montgomery form of `self`.
+    def montgomery_int(self):
+        return array_to_number(self.array)
+
+    # Builds an element from the integer holding its Montgomery form.
+    @staticmethod
+    def from_montgomery_int(value):
+        return Fp(number_to_array(value, 6))
+
+    # Decodes the concatenation of N big-endian 48-byte encodings held in any
+    # buffer-protocol object (bytes, bytearray, memoryview, mmap, ...). The buffer
+    # is read through a memoryview without copying it, and the result is
+    # `CtOption(elements, is_some)`, where `is_some` is 1 if and only if every
+    # encoding is canonical.
+    @staticmethod
+    def decode_many(buffer):
+        view = memoryview(buffer).cast("B")
+        if len(view) % 48 != 0:
+            raise ValueError("Buffer length must be a multiple of 48 bytes")
+
+        values = [
+            int.from_bytes(view[i : i + 48], byteorder="big")
+            for i in range(0, len(view), 48)
+        ]
+
+        # The encodings are all canonical if and only if the largest one is
+        # smaller than the modulus.
+        is_some = 1 if max(values, default=0) < MODULUS_INT else 0
+
+        # Convert to Montgomery form by computing
+        # (a.R^0 * R^2) / R = a.R
+        r2 = R2.montgomery_int()
+        elements = [
+            Fp.from_montgomery_int(r - MODULUS_INT if r >= MODULUS_INT else r)
+            for r in (
+                (t + ((t * INV_WIDE) & MASK_384) * MODULUS_INT) >> 384
+                for t in (v * r2 for v in values)
+            )
+        ]
+
+        return CtOption(elements, is_some)
+
+    # Writes the big-endian 48-byte encodings of `elements` one after the other into
+    # the writable buffer `out`, which must hold at least 48 * len(elements) bytes.
+    # When `out` is omitted a new bytearray is allocated. Returns `out`.
+    @staticmethod
+    def encode_many(elements, out=None):
+        if out is None:
+            out = bytearray(48 * len(elements))
+        view = memoryview(out).cast("B")
+        if len(view) < 48 * len(elements):
+            raise ValueError("Output buffer is too small")
+
+        offset = 0
+        for e in elements:
+            # Turn into canonical form by computing
+            # (a.R) / R = a
+            t = e.montgomery_int()
+            t = ((t + ((t * INV_WIDE) & MASK_384) * MODULUS_INT) >> 384) & MASK_384
+            if t >= MODULUS_INT:
+                t -= MODULUS_INT
+            view[offset : offset + 48] = t.to_bytes(48, "big")
+            offset += 48
+
+        return out
+
     def neg(self):
         d0, borrow = sbb(MODULUS[0], self.array[0], 0)
         d1, borrow = sbb(MODULUS[1], self.array[1], borrow)
@@ -388,49 +480,56 @@ class Fp:
         # Perform Montgomery reduction
         return Fp.montgomery_reduce(t0, t1, t2, t3, t4, t5, t6, t7, t8, t9, t10, t11)
 
+    # Exponentiates `self` by `by`, where `by` is a little-endian order
+    # list of 64-bit limbs, using sliding windows.
+    #
+    # **This operation is variable time with respect to the exponent.**
     def pow_vartime(self, by):
-        res = Fp.one()
-
-        for e in reversed(by):
-            for i in reversed(range(64)):
-                res = res.square()
-
-                if (e >> i) & 1 == 1:
-                    res *= self
-
-        return res
+        return pow_sliding_window(self, array_to_number(by))
 
     def sqrt(self):
         # We use Shank's method, as p = 3 (mod 4). This means
         # we only need to exponentiate by (p+1)/4. This only
         # works for elements that are actually quadratic residue,
         # so we check that we got the correct result at the end.
-        sqrt = self.pow_vartime(
-            [
-                0xEE7F_BFFF_FFFF_EAAB,
-                0x07AA_FFFF_AC54_FFFF,
-                0xD9CC_34A8_3DAC_3D89,
-                0xD91D_D2E1_3CE1_44AF,
-                0x92C6_E9ED_90D2_EB35,
-                0x0680_447A_8E5F_F9A6,
-            ]
-        )
+        sqrt = chain_pp1div4(self)
         return CtOption(sqrt, sqrt.square().eq(self))
 
     def invert(self):
         # Exponentiate by p - 2
-        t = self.pow_vartime(
-            [
-                0xB9FE_FFFF_FFFF_AAA9,
-                0x1EAB_FFFE_B153_FFFF,
-                0x6730_D2A0_F6B0_F624,
-                0x6477_4B84_F385_12BF,
-                0x4B1B_A7B6_434B_ACD7,
-                0x1A01_11EA_397F_E69A,
-            ]
-        )
+        t = chain_pm2(self)
         return CtOption(t, not self.is_zero())
 
+    # Computes the multiplicative inverse with CPython's extended Euclidean
+    # algorithm instead of an exponentiation.
+    #
+    # **This operation is variable time.** It must only be used on public data;
+    # `invert` remains the constant-time default.
+    def invert_vartime(self):
+        t = array_to_number(self.array)
+        if t == 0:
+            return CtOption(Fp.zero(), False)
+
+        # For t = aR this gives (aR)^{-1}, and the Montgomery multiplication
+        # by R^3 brings it back to Montgomery form a^{-1}R.
+        return CtOption(Fp(number_to_array(pow(t, -1, MODULUS_INT), 6)) * R3, True)
+
+    # Returns the Legendre symbol of this element: 0 if it is zero, 1 if it is a
+    # nonzero square and -1 otherwise. It is computed with the binary Jacobi
+    # algorithm instead of an exponentiation by (p - 1) / 2.
+    #
+    # **This operation is variable time.** It must only be used on public data.
+    def legendre(self):
+        # The Montgomery form aR has the same symbol as a, because R = (2^192)^2
+        # is a square.
+        return jacobi(array_to_number(self.array), MODULUS_INT)
+
+    # Inverts every element of `elements` at the cost of a single inversion,
+    # using Montgomery's trick. Zero elements are skipped and map to zero.
+    @staticmethod
+    def batch_invert(elements):
+        return montgomery_batch_invert(Fp, elements)
+
     def sum_of_products(a, b):
         if len(a) != len(b):
             raise ValueError("Input lists must have the same length")
@@ -505,6 +604,137 @@ class Fp:
         )
 
 
+# An element of `Fp` backed by a single Python integer instead of six 64-bit limbs.
+# The integer holds the Montgomery form aR mod p, so values are bit-for-bit identical
+# to the limb representation and `array` is still available as a (computed) view.
+# Products are formed with CPython's native bignum multiplication and reduced with a
+# whole-integer Montgomery reduction, which replaces the ~100 `mac`/`adc` calls of
+# the limb implementation.
+class FpNative(Fp):
+    def __init__(self, array):
+        self.value = array_to_number(array)
+
+    @property
+    def array(self):
+        return number_to_array(self.value, 6)
+
+    @staticmethod
+    def from_value(value):
+        res = FpNative.__new__(FpNative)
+        res.value = value
+        return res
+
+    @staticmethod
+    def zero():
+        return FpNative.from_value(0)
+
+    def is_zero(self):
+        return self.value == 0
+
+    def eq(self, other):
+        return self.value == other.value
+
+    @staticmethod
+    def reduce_wide(t):
+        # Montgomery reduction of the double-width integer `t`, computing
+        # t / R mod p. The carry out of the top limb is dropped and a single
+        # conditional subtraction is performed, exactly as in the limb code.
+        t = ((t + ((t * INV_WIDE) & MASK_384) * MODULUS_INT) >> 384) & MASK_384
+        return t - MODULUS_INT if t >= MODULUS_INT else t
+
+    @staticmethod
+    def montgomery_reduce(t0, t1, t2, t3, t4, t5, t6, t7, t8, t9, t10, t11):
+        return FpNative.from_value(
+            FpNative.reduce_wide(
+                array_to_number([t0, t1, t2, t3, t4, t5, t6, t7, t8, t9, t10, t11])
+            )
+        )
+
+    def mul(self, rhs):
+        return FpNative.from_value(FpNative.reduce_wide(self.value * rhs.value))
+
+    def mul_wide(self, rhs):
+        return self.value * rhs.value
+
+    @staticmethod
+    def from_wide(t):
+        # Unlike `reduce_wide`, which mirrors the limb code, the accumulator may
+        # be negative or exceed pR here: the Montgomery step is exact on Python
+        # integers and the result is only a few multiples of p away from the
+        # canonical range.
+        t = (t + ((t * INV_WIDE) & MASK_384) * MODULUS_INT) >> 384
+        return FpNative.from_value(t if 0 <= t < MODULUS_INT else t % MODULUS_INT)
+
+    def square(self):
+        return FpNative.from_value(FpNative.reduce_wide(self.value * self.value))
+
+    def subtract_p(self):
+        v = self.value
+        return FpNative.from_value(v - MODULUS_INT if v >= MODULUS_INT else v)
+
+    def to_bytes(self):
+        return FpNative.reduce_wide(self.value).to_bytes(48, "big")
+
+    def montgomery_int(self):
+        return self.value
+
+    def pow_vartime(self, by):
+        # CPython's modular exponentiation works on the canonical value a, which
+        # is converted back to Montgomery form aR afterwards.
+        a = FpNative.reduce_wide(self.value)
+        r = pow(a, array_to_number(by), MODULUS_INT)
+        return FpNative.from_value(FpNative.reduce_wide(r * R2.value))
+
+    @staticmethod
+    def from_montgomery_int(value):
+        return FpNative.from_value(value)
+
+    def from_bytes(bytes):
+        v = int.from_bytes(bytes[0:48], byteorder="big")
+
+        # The encoding is canonical if and only if it is smaller than the modulus.
+        is_some = 1 if v < MODULUS_INT else 0
+
+        # Convert to Montgomery form by computing
+        # (a.R^0 * R^2) / R = a.R
+        return CtOption(
+            FpNative.from_value(FpNative.reduce_wide(v * R2.value)), is_some
+        )
+
+    def neg(self):
+        v = self.value
+        return FpNative.from_value((MODULUS_INT - v) & MASK_384 if v else 0)
+
+    def add(self, rhs):
+        v = (self.value + rhs.value) & MASK_384
+        return FpNative.from_value(v - MODULUS_INT if v >= MODULUS_INT else v)
+
+    def sub(self, rhs):
+        r = rhs.value
+        v = (((MODULUS_INT - r) & MASK_384 if r else 0) + self.value) & MASK_384
+        return FpNative.from_value(v - MODULUS_INT if v >= MODULUS_INT else v)
+
+    def sum_of_products(a, b):
+        if len(a) != len(b):
+            raise ValueError("Input lists must have the same length")
+        t = 0
+        for a_i, b_i in zip(a, b):
+            t += a_i.value * b_i.value
+        return FpNative.from_value(FpNative.reduce_wide(t))
+
+    def lexicographically_largest(self):
+        return FpNative.reduce_wide(self.value) > (MODULUS_INT - 1) // 2
+
+    def conditional_select(a, b, choice: Choice):
+        return FpNative.from_value(
+            choice.value * b.value + (1 - choice.value) * a.value
+        )
+
+
+if BACKEND == "native":
+    Fp = FpNative
+
+
 # p = 4002409555221667393417789825735904156556882819939007885332058136124031650490837864442687629129015664037894272559787
 MODULUS = [
     0xB9FE_FFFF_FFFF_AAAB,
@@ -515,9 +745,20 @@ MODULUS = [
     0x1A01_11EA_397F_E69A,
 ]
 
+# p as a single integer, for the native backend
+MODULUS_INT = array_to_number(MODULUS)
+
+MASK_384 = (1 << 384) - 1
+
 # INV = -(p^{-1} mod 2^64) mod 2^64
 INV = 0x89F3_FFFC_FFFC_FFFD
 
+# INV_WIDE = -(p^{-1} mod 2^384) mod 2^384, used by whole-integer Montgomery reduction
+INV_WIDE = -pow(MODULUS_INT, -1, 1 << 384) & MASK_384
+
+# pR, the bound below which a double-width value can be Montgomery-reduced
+WIDE_MODULUS = MODULUS_INT << 384
+
 # R = 2^384 mod p
 R = Fp(
     [
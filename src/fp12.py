@@ -4,6 +4,9 @@ from src.utils import (
     adc,
     wrapping_mul_u64,
     wrapping_sub_u64,
+    array_to_number,
+    montgomery_batch_invert,
+    pow_sliding_window,
     CtOption,
     Choice,
 )
@@ -63,17 +66,18 @@ class Fp12:
         return Fp12(Fp6.random(rng), Fp6.random(rng))
 
     def mul_by_014(self, c0: Fp2, c1: Fp2, c4: Fp2):
-        aa = self.c0.mul_by_01(c0, c1)
-        bb = self.c1.mul_by_1(c4)
+        # The Fp6 products are kept unreduced (see `Fp.mul_wide`), so that each
+        # of the twelve output coefficients is reduced exactly once.
+        aa = self.c0.mul_by_01_wide(c0, c1)
+        bb = self.c1.mul_by_1_wide(c4)
         o = c1 + c4
         c1 = self.c1 + self.c0
-        c1 = c1.mul_by_01(c0, o)
-        c1 = c1 - aa - bb
-        c0 = bb
-        c0 = c0.mul_by_nonresidue()
-        c0 = c0 + aa
+        c1 = c1.mul_by_01_wide(c0, o)
+        c1 = [c1[i] - aa[i] - bb[i] for i in range(6)]
+        c0 = Fp6.mul_by_nonresidue_wide(bb)
+        c0 = [c0[i] + aa[i] for i in range(6)]
 
-        return Fp12(c0, c1)
+        return Fp12(Fp6.from_wide(c0), Fp6.from_wide(c1))
 
     def conjugate(self):
         return Fp12(self.c0, -self.c1)
@@ -88,16 +92,24 @@ class Fp12:
         return Fp12(self.c0 - rhs.c0, self.c1 - rhs.c1)
 
     def square(self):
-        ab = self.c0 * self.c1
+        # As in `mul`, the Fp6 products stay unreduced until the end.
+        ab = self.c0.mul_wide(self.c1)
         c0c1 = self.c0 + self.c1
         c0 = self.c1.mul_by_nonresidue()
         c0 = c0 + self.c0
-        c0 = c0 * c0c1
-        c0 = c0 - ab
-        c1 = ab + ab
-        c0 = c0 - ab.mul_by_nonresidue()
+        c0 = c0.mul_wide(c0c1)
+        ab_v = Fp6.mul_by_nonresidue_wide(ab)
+        c0 = [c0[i] - ab[i] - ab_v[i] for i in range(6)]
+        c1 = [ab[i] + ab[i] for i in range(6)]
 
-        return Fp12(c0, c1)
+        return Fp12(Fp6.from_wide(c0), Fp6.from_wide(c1))
+
+    # Exponentiates `self` by `by`, where `by` is a little-endian order
+    # list of 64-bit limbs, using sliding windows.
+    #
+    # **This operation is variable time with respect to the exponent.**
+    def pow_vartime(self, by):
+        return pow_sliding_window(self, array_to_number(by))
 
     def invert(self):
         a = (self.c0.square() - self.c1.square().mul_by_nonresidue()).invert()
@@ -107,49 +119,44 @@ class Fp12:
 
         return CtOption(None, False)
 
+    # Inverts every element of `elements` at the cost of a single inversion,
+    # using Montgomery's trick. Zero elements are skipped and map to zero.
+    @staticmethod
+    def batch_invert(elements):
+        return montgomery_batch_invert(Fp12, elements)
+
     def mul(self, other):
-        aa = self.c0 * other.c0
-        bb = self.c1 * other.c1
+        # Karatsuba over Fp6 with lazy reduction: the three Fp6 products are
+        # kept as unreduced double-width integers (see `Fp.mul_wide`) and
+        # combined before reducing each of the twelve output coefficients once,
+        # instead of reducing every Fp2 product along the way.
+        aa = self.c0.mul_wide(other.c0)
+        bb = self.c1.mul_wide(other.c1)
         o = other.c0 + other.c1
         c1 = self.c1 + self.c0
-        c1 = c1 * o
-        c1 = c1 - aa
-        c1 = c1 - bb
-        c0 = bb.mul_by_nonresidue()
-        c0 = c0 + aa
+        c1 = c1.mul_wide(o)
+        c1 = [c1[i] - aa[i] - bb[i] for i in range(6)]
+        c0 = Fp6.mul_by_nonresidue_wide(bb)
+        c0 = [c0[i] + aa[i] for i in range(6)]
 
-        return Fp12(c0, c1)
+        return Fp12(Fp6.from_wide(c0), Fp6.from_wide(c1))
 
     # Raises this element to p.
-    def frobenius_map(self):
-        c0 = self.c0.frobenius_map()
-        c1 = self.c1.frobenius_map()
-
-        # c1 = c1 * (u + 1)^((p - 1) / 6)
-        c1 = c1 * Fp6.from_fp2(
-            Fp2(
-                Fp(
-                    [
-                        0x0708_9552_B319_D465,
-                        0xC669_5F92_B50A_8313,
-                        0x97E8_3CCC_D117_228F,
-                        0xA35B_AECA_B2DC_29EE,
-                        0x1CE3_93EA_5DAA_CE4D,
-                        0x08F2_220F_B0FB_66EB,
-                    ]
-                ),
-                Fp(
-                    [
-                        0xB2F6_6AAD_4CE5_D646,
-                        0x5842_A06B_FC49_7CEC,
-                        0xCF48_95D4_2599_D394,
-                        0xC11B_9CBA_40A8_E8D0,
-                        0x2E38_13CB_E5A0_DE89,
-                        0x110E_EFDA_8884_7FAF,
-                    ]
-                ),
-            )
-        )
+    # Raises this element to p^k, with the coefficients of the table below.
+    def frobenius_map(self, k=1):
+        k %= 12
+        if k == 0:
+            return self
+        if k == 6:
+            # Fp6 is fixed by p^6 and w^(p^6) = (u + 1)^((p^6 - 1) / 6) w = -w
+            return self.conjugate()
+
+        c0 = self.c0.frobenius_map(k)
+        c1 = self.c1.frobenius_map(k)
+
+        # c1 = c1 * (u + 1)^((p^k - 1) / 6)
+        g = FROBENIUS_COEFFS[k]
+        c1 = Fp6(c1.c0 * g, c1.c1 * g, c1.c2 * g)
 
         return Fp12(c0, c1)
 
@@ -158,3 +165,35 @@ class Fp12:
             Fp6.conditional_select(a.c0, b.c0, choice),
             Fp6.conditional_select(a.c1, b.c1, choice),
         )
+
+
+# FROBENIUS_COEFFS[k] = (u + 1)^((p^k - 1) / 6) for 0 <= k < 12, so that
+# w^(p^k) = FROBENIUS_COEFFS[k] w. As for the Fp6 coefficients, every entry is
+# the conjugate of the previous one times the entry for k = 1.
+FROBENIUS_COEFFS = [
+    Fp2.one(),
+    Fp2(
+        Fp(
+            [
+                0x0708_9552_B319_D465,
+                0xC669_5F92_B50A_8313,
+                0x97E8_3CCC_D117_228F,
+                0xA35B_AECA_B2DC_29EE,
+                0x1CE3_93EA_5DAA_CE4D,
+                0x08F2_220F_B0FB_66EB,
+            ]
+        ),
+        Fp(
+            [
+                0xB2F6_6AAD_4CE5_D646,
+                0x5842_A06B_FC49_7CEC,
+                0xCF48_95D4_2599_D394,
+                0xC11B_9CBA_40A8_E8D0,
+                0x2E38_13CB_E5A0_DE89,
+                0x110E_EFDA_8884_7FAF,
+            ]
+        ),
+    ),
+]
+for _ in range(10):
+    FROBENIUS_COEFFS.append(FROBENIUS_COEFFS[-1].conjugate() * FROBENIUS_COEFFS[1])
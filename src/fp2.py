@@ -4,10 +4,14 @@ from src.utils import (
     adc,
     wrapping_mul_u64,
     wrapping_sub_u64,
+    array_to_number,
+    montgomery_batch_invert,
+    pow_sliding_window,
     CtOption,
     Choice,
 )
 from src.fp import Fp
+from src.chain import chain_pm3div4, chain_pm1div2
 
 
 class Fp2:
@@ -120,14 +124,36 @@ class Fp2:
 
         return Fp2(a * b, c * self.c1)
 
+    # Returns the product of `self` and `rhs` as a pair of unreduced double-width
+    # integers, one per coefficient (see `Fp.mul_wide`). Extension fields build
+    # their products out of these pairs and reduce once per output coefficient.
+    def mul_wide(self, rhs):
+        return (
+            self.c0.mul_wide(rhs.c0) - self.c1.mul_wide(rhs.c1),
+            self.c0.mul_wide(rhs.c1) + self.c1.mul_wide(rhs.c0),
+        )
+
+    # Returns the square of `self` as a pair of unreduced double-width integers,
+    # using the same complex squaring as `square`.
+    def square_wide(self):
+        return (
+            (self.c0 + self.c1).mul_wide(self.c0 - self.c1),
+            (self.c0 + self.c0).mul_wide(self.c1),
+        )
+
+    # Reduces a pair of double-width integers into an element of Fp2.
+    @staticmethod
+    def from_wide(w):
+        return Fp2(Fp.from_wide(w[0]), Fp.from_wide(w[1]))
+
     @staticmethod
     def random(rng):
         return Fp2(Fp.random(rng), Fp.random(rng))
 
-    # Raises this element to p.
-    def frobenius_map(self):
-        # This is always just a conjugation.
-        return self.conjugate()
+    # Raises this element to p^k.
+    def frobenius_map(self, k=1):
+        # This is always just a conjugation, which is an involution.
+        return self.conjugate() if k & 1 else self
 
     # Computes the multiplicative inverse of this field
     # element, returning None in the case that this element
@@ -156,17 +182,52 @@ class Fp2:
 
         return CtOption(None, False)
 
-    def pow_vartime(self, by):
-        res = Fp2.one()
+    # Returns whether or not this element is a square in Fp2.
+    #
+    # **This operation is variable time.** It must only be used on public data.
+    def is_square(self):
+        # a + bu is a square in Fp2 if and only if its norm
+        # (a + bu)(a - bu) = a^2 + b^2 is a square in Fp.
+        return ((self.c0).square() + (self.c1).square()).legendre() != -1
 
-        for e in reversed(by):
-            for i in reversed(range(64)):
-                res = res.square()
+    # Inverts every element of `elements` at the cost of a single inversion,
+    # using Montgomery's trick. Zero elements are skipped and map to zero.
+    @staticmethod
+    def batch_invert(elements):
+        return montgomery_batch_invert(Fp2, elements)
+
+    # Decodes N consecutive 96-byte encodings, each made of the 48-byte big-endian
+    # encodings of c1 then c0 (the order used for G2 coordinates), from any
+    # buffer-protocol object. See `Fp.decode_many`.
+    @staticmethod
+    def decode_many(buffer):
+        view = memoryview(buffer).cast("B")
+        if len(view) % 96 != 0:
+            raise ValueError("Buffer length must be a multiple of 96 bytes")
 
-                if (e >> i) & 1 == 1:
-                    res *= self
+        coefficients = Fp.decode_many(view)
+        c = coefficients.value
+        elements = [Fp2(c[i + 1], c[i]) for i in range(0, len(c), 2)]
 
-        return res
+        return CtOption(elements, coefficients.choice)
+
+    # Writes the 96-byte encodings of `elements` into the writable buffer `out`, or
+    # into a new bytearray when `out` is omitted. See `Fp.encode_many`.
+    @staticmethod
+    def encode_many(elements, out=None):
+        coefficients = []
+        for e in elements:
+            coefficients.append(e.c1)
+            coefficients.append(e.c0)
+
+        return Fp.encode_many(coefficients, out)
+
+    # Exponentiates `self` by `by`, where `by` is a little-endian order
+    # list of 64-bit limbs, using sliding windows.
+    #
+    # **This operation is variable time with respect to the exponent.**
+    def pow_vartime(self, by):
+        return pow_sliding_window(self, array_to_number(by))
 
     def sqrt(self):
         # Algorithm 9, https://eprint.iacr.org/2012/685.pdf
@@ -175,16 +236,7 @@ class Fp2:
             return CtOption(Fp2.zero(), True)
 
         # a1 = self^((p - 3) / 4)
-        a1 = self.pow_vartime(
-            [
-                0xEE7F_BFFF_FFFF_EAAA,
-                0x07AA_FFFF_AC54_FFFF,
-                0xD9CC_34A8_3DAC_3D89,
-                0xD91D_D2E1_3CE1_44AF,
-                0x92C6_E9ED_90D2_EB35,
-                0x0680_447A_8E5F_F9A6,
-            ]
-        )
+        a1 = chain_pm3div4(self)
 
         # alpha = a1^2 * self = self^((p - 3) / 2 + 1) = self^((p - 1) / 2)
         alpha = a1.square() * self
@@ -199,16 +251,7 @@ class Fp2:
             return CtOption(Fp2(-x0.c1, x0.c0), alpha.eq(-Fp2.one()))
 
         # Otherwise, the correct solution is (1 + alpha)^((q - 1) // 2) * x0
-        result = (alpha + Fp2.one()).pow_vartime(
-            [
-                0xDCFF_7FFF_FFFF_D555,
-                0x0F55_FFFF_58A9_FFFF,
-                0xB398_6950_7B58_7B12,
-                0xB23B_A5C2_79C2_895F,
-                0x258D_D3DB_21A5_D66B,
-                0x0D00_88F5_1CBF_F34D,
-            ]
-        ) * x0
+        result = chain_pm1div2(alpha + Fp2.one()) * x0
 
         # Only return the result if it's really the square root (and so
         # self is actually quadratic nonresidue)
@@ -4,6 +4,9 @@ from src.utils import (
     adc,
     wrapping_mul_u64,
     wrapping_sub_u64,
+    array_to_number,
+    montgomery_batch_invert,
+    pow_sliding_window,
     CtOption,
     Choice,
 )
@@ -60,15 +63,33 @@ class Fp6:
         return Fp6(Fp2.random(rng), Fp2.random(rng), Fp2.random(rng))
 
     def mul_by_1(self, c1: Fp2):
-        return Fp6((self.c2 * c1).mul_by_nonresidue(), self.c0 * c1, self.c1 * c1)
+        return Fp6.from_wide(self.mul_by_1_wide(c1))
 
     def mul_by_01(self, c0: Fp2, c1: Fp2):
-        a_a = self.c0 * c0
-        b_b = self.c1 * c1
-        t1 = (self.c2 * c1).mul_by_nonresidue() + a_a
-        t2 = (c0 + c1) * (self.c0 + self.c1) - a_a - b_b
-        t3 = self.c2 * c0 + b_b
-        return Fp6(t1, t2, t3)
+        return Fp6.from_wide(self.mul_by_01_wide(c0, c1))
+
+    # Unreduced version of `mul_by_1`, see `mul_wide`.
+    def mul_by_1_wide(self, c1: Fp2):
+        t1 = (self.c2).mul_wide(c1)
+        t2 = (self.c0).mul_wide(c1)
+        t3 = (self.c1).mul_wide(c1)
+        return [t1[0] - t1[1], t1[0] + t1[1], t2[0], t2[1], t3[0], t3[1]]
+
+    # Unreduced version of `mul_by_01`, see `mul_wide`.
+    def mul_by_01_wide(self, c0: Fp2, c1: Fp2):
+        a_a = (self.c0).mul_wide(c0)
+        b_b = (self.c1).mul_wide(c1)
+        c2_c1 = (self.c2).mul_wide(c1)
+        s = (c0 + c1).mul_wide(self.c0 + self.c1)
+        c2_c0 = (self.c2).mul_wide(c0)
+        return [
+            c2_c1[0] - c2_c1[1] + a_a[0],
+            c2_c1[0] + c2_c1[1] + a_a[1],
+            s[0] - a_a[0] - b_b[0],
+            s[1] - a_a[1] - b_b[1],
+            c2_c0[0] + b_b[0],
+            c2_c0[1] + b_b[1],
+        ]
 
     # Multiply by quadratic nonresidue v.
     def mul_by_nonresidue(self):
@@ -80,40 +101,21 @@ class Fp6:
         return Fp6(self.c2.mul_by_nonresidue(), self.c0, self.c1)
 
     # Raises this element to p.
-    def frobenius_map(self):
-        c0 = self.c0.frobenius_map()
-        c1 = self.c1.frobenius_map()
-        c2 = self.c2.frobenius_map()
-
-        # c1 = c1 * (u + 1)^((p - 1) / 3)
-        c1 = c1 * Fp2(
-            Fp.zero(),
-            Fp(
-                [
-                    0xCD03_C9E4_8671_F071,
-                    0x5DAB_2246_1FCD_A5D2,
-                    0x5870_42AF_D385_1B95,
-                    0x8EB6_0EBE_01BA_CB9E,
-                    0x03F9_7D6E_83D0_50D2,
-                    0x18F0_2065_5463_8741,
-                ]
-            ),
-        )
+    # Raises this element to p^k, with the coefficients of the tables below.
+    def frobenius_map(self, k=1):
+        k %= 6
+        if k == 0:
+            return self
 
-        # c2 = c2 * (u + 1)^((2p - 2) / 3)
-        c2 = c2 * Fp2(
-            Fp(
-                [
-                    0x890D_C9E4_8675_45C3,
-                    0x2AF3_2253_3285_A5D5,
-                    0x5088_0866_309B_7E2C,
-                    0xA20D_1B8C_7E88_1024,
-                    0x14E4_F04F_E2DB_9068,
-                    0x14E5_6D3F_1564_853A,
-                ]
-            ),
-            Fp.zero(),
-        )
+        c0 = self.c0.frobenius_map(k)
+        c1 = self.c1.frobenius_map(k)
+        c2 = self.c2.frobenius_map(k)
+
+        # c1 = c1 * (u + 1)^((p^k - 1) / 3)
+        c1 = c1 * FROBENIUS_COEFFS_C1[k]
+
+        # c2 = c2 * (u + 1)^((2p^k - 2) / 3)
+        c2 = c2 * FROBENIUS_COEFFS_C2[k]
 
         return Fp6(c0, c1, c2)
 
@@ -176,21 +178,83 @@ class Fp6:
     def mul(self, rhs):
         return self.mul_interleaved(rhs)
 
-    def square(self):
-        s0 = self.c0.square()
-        ab = self.c0 * self.c1
-        s1 = ab + ab
-        s2 = (self.c0 - self.c1 + self.c2).square()
-        bc = self.c1 * self.c2
-        s3 = bc + bc
-        s4 = self.c2.square()
+    # Returns the product of `self` and `b` as a list of six unreduced
+    # double-width integers, the Fp coefficients c0.c0, c0.c1, ..., c2.c1 of the
+    # result (see `Fp.mul_wide`). Fp12 combines such products before reducing
+    # each coefficient once with `from_wide`.
+    def mul_wide(self, b):
+        a = self
+        a0_b0 = a.c0.mul_wide(b.c0)
+        a0_b1 = a.c0.mul_wide(b.c1)
+        a0_b2 = a.c0.mul_wide(b.c2)
+        a1_b0 = a.c1.mul_wide(b.c0)
+        a1_b1 = a.c1.mul_wide(b.c1)
+        a1_b2 = a.c1.mul_wide(b.c2)
+        a2_b0 = a.c2.mul_wide(b.c0)
+        a2_b1 = a.c2.mul_wide(b.c1)
+        a2_b2 = a.c2.mul_wide(b.c2)
+
+        # c0 = a0 b0 + (a1 b2 + a2 b1)(u + 1)
+        # c1 = a0 b1 + a1 b0 + a2 b2 (u + 1)
+        # c2 = a0 b2 + a1 b1 + a2 b0
+        t0 = a1_b2[0] + a2_b1[0]
+        t1 = a1_b2[1] + a2_b1[1]
+        return [
+            a0_b0[0] + t0 - t1,
+            a0_b0[1] + t0 + t1,
+            a0_b1[0] + a1_b0[0] + a2_b2[0] - a2_b2[1],
+            a0_b1[1] + a1_b0[1] + a2_b2[0] + a2_b2[1],
+            a0_b2[0] + a1_b1[0] + a2_b0[0],
+            a0_b2[1] + a1_b1[1] + a2_b0[1],
+        ]
+
+    # Multiplies an unreduced result of `mul_wide` by the quadratic nonresidue v.
+    @staticmethod
+    def mul_by_nonresidue_wide(w):
+        # (a + bv + cv^2) v = c(u + 1) + av + bv^2
+        return [w[4] - w[5], w[4] + w[5], w[0], w[1], w[2], w[3]]
 
+    # Reduces six double-width integers, as returned by `mul_wide`, into an
+    # element of Fp6.
+    @staticmethod
+    def from_wide(w):
         return Fp6(
-            s3.mul_by_nonresidue() + s0,
-            s4.mul_by_nonresidue() + s1,
-            s1 + s2 + s3 - s0 - s4,
+            Fp2(Fp.from_wide(w[0]), Fp.from_wide(w[1])),
+            Fp2(Fp.from_wide(w[2]), Fp.from_wide(w[3])),
+            Fp2(Fp.from_wide(w[4]), Fp.from_wide(w[5])),
         )
 
+    def square(self):
+        return Fp6.from_wide(self.square_wide())
+
+    # Unreduced version of `square`, see `mul_wide`.
+    def square_wide(self):
+        s0 = self.c0.square_wide()
+        ab = self.c0.mul_wide(self.c1)
+        s2 = (self.c0 - self.c1 + self.c2).square_wide()
+        bc = self.c1.mul_wide(self.c2)
+        s4 = self.c2.square_wide()
+
+        # s1 = 2ab and s3 = 2bc, and the result is
+        # (s3 (u + 1) + s0) + (s4 (u + 1) + s1) v + (s1 + s2 + s3 - s0 - s4) v^2
+        s1 = (ab[0] + ab[0], ab[1] + ab[1])
+        s3 = (bc[0] + bc[0], bc[1] + bc[1])
+        return [
+            s3[0] - s3[1] + s0[0],
+            s3[0] + s3[1] + s0[1],
+            s4[0] - s4[1] + s1[0],
+            s4[0] + s4[1] + s1[1],
+            s1[0] + s2[0] + s3[0] - s0[0] - s4[0],
+            s1[1] + s2[1] + s3[1] - s0[1] - s4[1],
+        ]
+
+    # Exponentiates `self` by `by`, where `by` is a little-endian order
+    # list of 64-bit limbs, using sliding windows.
+    #
+    # **This operation is variable time with respect to the exponent.**
+    def pow_vartime(self, by):
+        return pow_sliding_window(self, array_to_number(by))
+
     def invert(self):
         c0 = (self.c1 * self.c2).mul_by_nonresidue()
         c0 = self.c0.square() - c0
@@ -212,6 +276,12 @@ class Fp6:
         else:
             return CtOption(Fp6.zero(), False)
 
+    # Inverts every element of `elements` at the cost of a single inversion,
+    # using Montgomery's trick. Zero elements are skipped and map to zero.
+    @staticmethod
+    def batch_invert(elements):
+        return montgomery_batch_invert(Fp6, elements)
+
     def add(self, rhs):
         return Fp6(self.c0 + rhs.c0, self.c1 + rhs.c1, self.c2 + rhs.c2)
 
@@ -227,3 +297,33 @@ class Fp6:
             Fp2.conditional_select(a.c1, b.c1, choice),
             Fp2.conditional_select(a.c2, b.c2, choice),
         )
+
+
+# FROBENIUS_COEFFS_C1[k] = (u + 1)^((p^k - 1) / 3) and
+# FROBENIUS_COEFFS_C2[k] = (u + 1)^((2p^k - 2) / 3) for 0 <= k < 6, so that
+# v^(p^k) = FROBENIUS_COEFFS_C1[k] v and (v^2)^(p^k) = FROBENIUS_COEFFS_C2[k] v^2.
+#
+# Since (p^k - 1) / 3 = p (p^(k - 1) - 1) / 3 + (p - 1) / 3, every coefficient is
+# the conjugate of the previous one times the coefficient for k = 1.
+FROBENIUS_COEFFS_C1 = [
+    Fp2.one(),
+    Fp2(
+        Fp.zero(),
+        Fp(
+            [
+                0xCD03_C9E4_8671_F071,
+                0x5DAB_2246_1FCD_A5D2,
+                0x5870_42AF_D385_1B95,
+                0x8EB6_0EBE_01BA_CB9E,
+                0x03F9_7D6E_83D0_50D2,
+                0x18F0_2065_5463_8741,
+            ]
+        ),
+    ),
+]
+for _ in range(4):
+    FROBENIUS_COEFFS_C1.append(
+        FROBENIUS_COEFFS_C1[-1].conjugate() * FROBENIUS_COEFFS_C1[1]
+    )
+
+FROBENIUS_COEFFS_C2 = [c.square() for c in FROBENIUS_COEFFS_C1]
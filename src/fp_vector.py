@@ -0,0 +1,110 @@
+from typing import List
+from operator import add as _add, sub as _sub, mul as _mul
+from src.fp import Fp, MODULUS_INT, MASK_384, INV_WIDE
+
+
+# A batch of N independent elements of `Fp`, operated on element-wise.
+#
+# Every element is stored as the Python integer holding its Montgomery form aR mod p
+# (the same representation as `FpNative`), and each operation walks the whole batch
+# in a single comprehension: products use CPython's bignum multiplication and are
+# reduced with a whole-integer Montgomery reduction, so no intermediate `Fp` object
+# is created and the interpreter overhead is paid once per element rather than once
+# per limb operation.
+#
+# Elements are always kept fully reduced, so a vector converts back to `Fp` with
+# `to_list` without any further work and compares element-wise with `eq`.
+class FpVector:
+    def __init__(self, values: List[int]):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i):
+        return Fp.from_montgomery_int(self.values[i])
+
+    def __mul__(self, other):
+        return self.mul(other)
+
+    def __add__(self, other):
+        return self.add(other)
+
+    def __sub__(self, other):
+        return self.sub(other)
+
+    def __neg__(self):
+        return self.neg()
+
+    @staticmethod
+    def zeros(n):
+        return FpVector([0] * n)
+
+    @staticmethod
+    def from_list(elements):
+        return FpVector([e.montgomery_int() for e in elements])
+
+    def to_list(self):
+        return [Fp.from_montgomery_int(v) for v in self.values]
+
+    def eq(self, other):
+        return self.values == other.values
+
+    # Raises ValueError unless `rhs` has as many elements as this vector, so that
+    # element-wise operations never silently truncate the longer one.
+    def check_length(self, rhs):
+        if len(self.values) != len(rhs.values):
+            raise ValueError("Vectors must have the same length")
+
+    def add(self, rhs):
+        self.check_length(rhs)
+        p = MODULUS_INT
+        return FpVector(
+            [s - p if s >= p else s for s in map(_add, self.values, rhs.values)]
+        )
+
+    def sub(self, rhs):
+        self.check_length(rhs)
+        p = MODULUS_INT
+        return FpVector(
+            [d + p if d < 0 else d for d in map(_sub, self.values, rhs.values)]
+        )
+
+    def neg(self):
+        p = MODULUS_INT
+        return FpVector([p - v if v else 0 for v in self.values])
+
+    # Montgomery-reduces a list of double-width integers (e.g. element-wise products
+    # of Montgomery forms), computing t / R mod p for every entry.
+    @staticmethod
+    def montgomery_reduce(wide):
+        p = MODULUS_INT
+        inv = INV_WIDE
+        mask = MASK_384
+        return FpVector(
+            [
+                r - p if r >= p else r
+                for r in ((t + ((t * inv) & mask) * p) >> 384 for t in wide)
+            ]
+        )
+
+    def mul(self, rhs):
+        self.check_length(rhs)
+        return FpVector.montgomery_reduce(map(_mul, self.values, rhs.values))
+
+    def square(self):
+        return FpVector.montgomery_reduce(v * v for v in self.values)
+
+    # Multiplies every element of the vector by the same element `scalar` of `Fp`.
+    def mul_by_fp(self, scalar: Fp):
+        s = scalar.montgomery_int()
+        return FpVector.montgomery_reduce(v * s for v in self.values)
+
+    # Returns the sum of the elements of the vector as an element of `Fp`.
+    def sum(self):
+        return Fp.from_montgomery_int(sum(self.values) % MODULUS_INT)
+
+    # Returns the sum of the element-wise products of two vectors, reducing once.
+    def inner_product(self, rhs):
+        self.check_length(rhs)
+        return Fp.from_wide(sum(map(_mul, self.values, rhs.values)))
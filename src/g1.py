@@ -9,8 +9,20 @@ from src.utils import (
     Choice,
     BLS_X,
     BLS_X_IS_NEGATIVE,
+    signed_digits,
+    wnaf,
+)
+from src.scalar import Scalar, MODULUS_INT as SCALAR_MODULUS
+from src.msm import (
+    pippenger,
+    to_affine,
+    scalar_to_int,
+    wnaf_width,
+    small_multiples,
+    odd_multiples,
+    wnaf_sum,
+    conditional_lookup,
 )
-from src.scalar import Scalar
 
 
 # This is an element of $\mathbb{G}_1$ represented in the affine coordinate space.
@@ -319,31 +331,104 @@ class G1Projective:
             tmp, G1Projective.identity(), Choice(1) if self.is_identity() else Choice(0)
         )
 
+    # Multiplies this point by `by`, a scalar given as little-endian bytes (or as
+    # a `Scalar` or a nonnegative integer), recoded in signed 4-bit windows (see
+    # `signed_digits`): for scalars below 2^256, 65 windows, so 256 doublings and
+    # 65 additions of an entry of the table P, 2P, ..., 8P, instead of 255 of
+    # each with double-and-add. The entries are read with `conditional_lookup`,
+    # so the sequence of operations does not depend on the scalar. Longer
+    # scalars get more windows.
     def multiply(self, by):
-        acc = G1Projective.identity()
+        k = scalar_to_int(by)
+        digits = signed_digits(k, 4, (max(k.bit_length(), 256) + 3) // 4 + 1)
+        table = small_multiples(self, 8)
 
-        # This is a simple double-and-add implementation of point
-        # multiplication, moving from most significant to least
-        # significant bit of the scalar.
+        acc = conditional_lookup(G1Projective, table, digits[-1])
+        for d in reversed(digits[:-1]):
+            for _ in range(4):
+                acc = acc.double()
+            acc += conditional_lookup(G1Projective, table, d)
 
-        # We skip the leading bit because it's always unset for Fq
-        # elements.
+        return acc
 
-        first_bit = True
+    # Applies the endomorphism (x, y) -> (BETA * x, y), which multiplies the
+    # points of G1 by the eigenvalue GLV_LAMBDA = -x^2 mod q.
+    def endomorphism(self):
+        return G1Projective(self.x * BETA, self.y, self.z)
+
+    # Splits the canonical value k < q of a scalar into two halves (k1, k2) of at
+    # most 128 bits with k = k1 + k2 * x^2, so that k * P = k1 * P + k2 * Q for
+    # Q = x^2 * P = -endomorphism(P).
+    #
+    # The vectors (x^2, 1) and (-1, x^2 - 1) form a reduced basis of the lattice
+    # of the pairs (a, b) with a + b * GLV_LAMBDA = 0 mod q. As q = x^4 - x^2 + 1,
+    # rounding against this basis reduces to the Euclidean division of k by x^2.
+    # Raises ValueError if k is not in [0, q).
+    def glv_decompose(k):
+        if not 0 <= k < SCALAR_MODULUS:
+            raise ValueError("Scalar must be in the range [0, q)")
+        return (k % GLV_X2, k // GLV_X2)
+
+    # Returns the tables [P, 2P, ..., 8P] and [Q, 2Q, ..., 8Q] of multiples of
+    # `self` and of Q = -endomorphism(self).
+    def glv_tables(self):
+        table = small_multiples(self, 8)
+        return (table, [-p.endomorphism() for p in table])
+
+    # Multiplies this point by the scalar `by` with the GLV method: both halves
+    # of `glv_decompose` are recoded in 33 signed 4-bit windows, which share a
+    # single chain of 132 doublings (instead of 255). Each window adds one entry
+    # of each table of `glv_tables`, read with `conditional_lookup`, so the
+    # sequence of operations does not depend on the scalar.
+    #
+    # The endomorphism acts as GLV_LAMBDA on the points of G1 only, so this must
+    # not be used on points outside of the subgroup.
+    def multiply_glv(self, by: Scalar):
+        k1, k2 = G1Projective.glv_decompose(scalar_to_int(by))
+        windows = [signed_digits(k1, 4, 33), signed_digits(k2, 4, 33)]
+        tables = self.glv_tables()
 
-        for byte in reversed(by):
-            for i in range(7, -1, -1):
-                if first_bit:
-                    first_bit = False
-                    continue
-                bit = (byte >> i) & 1
+        acc = G1Projective.identity()
+        for window in reversed(range(33)):
+            for _ in range(4):
                 acc = acc.double()
-                acc = G1Projective.conditional_select(
-                    acc, acc + self, Choice(1) if bit else Choice(0)
-                )
+
+            for digits, table in zip(windows, tables):
+                acc += conditional_lookup(G1Projective, table, digits[window])
 
         return acc
 
+    # Multiplies this point by the scalar `by` with the GLV method, recoding
+    # both halves of `glv_decompose` in width-5 NAF: they share a chain of at
+    # most 129 doublings, and each needs about one addition every 6 bits, taken
+    # from the odd multiples P, 3P, ..., 15P and their endomorphism images.
+    #
+    # As `multiply_glv`, this must not be used on points outside of G1.
+    #
+    # **This operation is variable time with respect to the scalar.**
+    def multiply_glv_vartime(self, by: Scalar):
+        k1, k2 = G1Projective.glv_decompose(scalar_to_int(by))
+        odd = odd_multiples(self, 8)
+        return wnaf_sum(
+            G1Projective,
+            [wnaf(k1, 5), wnaf(k2, 5)],
+            [odd, [-p.endomorphism() for p in odd]],
+        )
+
+    # Multiplies this point by `by`, a `Scalar`, an integer or little-endian
+    # bytes as taken by `multiply`, recoded in NAF of width `wnaf_width`: for a
+    # full-size scalar, about 255 doublings and 50 additions (including the
+    # precomputation of P, 3P, ..., 15P) instead of 255 of each. Unlike
+    # `multiply_glv_vartime`, this works on any point of the curve.
+    #
+    # **This operation is variable time with respect to the scalar.** It must
+    # only be used on public scalars; use `multiply` or `multiply_glv` for
+    # secret ones.
+    def multiply_vartime(self, by):
+        k = scalar_to_int(by)
+        w = wnaf_width(k.bit_length())
+        return wnaf_sum(G1Projective, [wnaf(k, w)], [odd_multiples(self, 1 << (w - 2))])
+
     def mul_by_x(self):
         xself = G1Projective.identity()
 
@@ -369,40 +454,38 @@ class G1Projective:
     def batch_normalize(p, q):
         assert len(p) == len(q)
 
-        acc = Fp.one()
-        for p_item, q_item in zip(p, q):
-            # We use the `x` field of `G1Affine` to store the product
-            # of previous z-coordinates seen.
-            q_item.x = acc
-
-            # We will end up skipping all identities in p
-            acc = Fp.conditional_select(
-                acc * p_item.z, acc, Choice(1) if p_item.is_identity() else Choice(0)
-            )
-
-        # This is the inverse, as all z-coordinates are nonzero and the ones
-        # that are not are skipped.
-        acc = acc.invert().value
+        # Identities have a zero z-coordinate, which the batch inversion
+        # skips, so all the z-coordinates are inverted at once.
+        zinvs = Fp.batch_invert([p_item.z for p_item in p])
 
-        for p_item, q_item in zip(reversed(p), reversed(q)):
-            skip = p_item.is_identity()
+        for p_item, q_item, zinv in zip(p, q, zinvs):
+            skip = Choice(1) if p_item.is_identity() else Choice(0)
 
-            # Compute tmp = 1/z
-            tmp = q_item.x * acc
-
-            # Cancel out z-coordinate in denominator of `acc`
-            acc = Fp.conditional_select(
-                acc * p_item.z, acc, Choice(1) if skip else Choice(0)
-            )
+            tmp = G1Affine(p_item.x * zinv, p_item.y * zinv, Choice(0))
+            tmp = G1Affine.conditional_select(tmp, G1Affine.identity(), skip)
 
             # Set the coordinates to the correct value
-            q_item.x = p_item.x * tmp
-            q_item.y = p_item.y * tmp
-            q_item.infinity = Choice(1) if skip else Choice(0)
-
-            q_item = G1Affine.conditional_select(
-                q_item, G1Affine.identity(), Choice(1) if skip else Choice(0)
-            )
+            q_item.x = tmp.x
+            q_item.y = tmp.y
+            q_item.infinity = tmp.infinity
+
+    # Computes the multi-scalar multiplication sum(scalars[i] * points[i]) with
+    # the bucket method (see `src.msm`). `points` may mix `G1Affine` and
+    # `G1Projective` values; the projective ones are normalized together first,
+    # so that buckets are built with mixed additions. With `batch_affine`, the
+    # buckets are accumulated in affine coordinates with shared inversions,
+    # which is cheaper on large inputs.
+    #
+    # **This operation is variable time with respect to the scalars.**
+    def msm(points, scalars, batch_affine=False):
+        return pippenger(
+            G1Projective,
+            G1Projective.from_g1_affine,
+            add_mixed,
+            to_affine(G1Projective, G1Affine, points),
+            scalars,
+            batch_affine=batch_affine,
+        )
 
 
 B = Fp(
@@ -416,6 +499,11 @@ B = Fp(
     ]
 )
 
+# x^2, and the eigenvalue -x^2 mod q of the endomorphism (x, y) -> (BETA * x, y)
+# on G1, a nontrivial third root of unity modulo q
+GLV_X2 = BLS_X * BLS_X
+GLV_LAMBDA = SCALAR_MODULUS - GLV_X2
+
 # A nontrivial third root of unity in Fp
 BETA = Fp(
     [
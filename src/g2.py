@@ -10,8 +10,21 @@ from src.utils import (
     Choice,
     BLS_X,
     BLS_X_IS_NEGATIVE,
+    signed_digits,
+    wnaf,
+    x_digits,
 )
 from src.scalar import Scalar
+from src.msm import (
+    pippenger,
+    to_affine,
+    scalar_to_int,
+    wnaf_width,
+    small_multiples,
+    odd_multiples,
+    wnaf_sum,
+    conditional_lookup,
+)
 
 
 # This is an element of $\mathbb{G}_2$ represented in the affine coordinate space.
@@ -363,31 +376,96 @@ class G2Projective:
     def sub(self, rhs):
         return self + (-rhs)
 
+    # Multiplies this point by `by`, a scalar given as little-endian bytes (or as
+    # a `Scalar` or a nonnegative integer), recoded in signed 4-bit windows (see
+    # `signed_digits`): for scalars below 2^256, 65 windows, so 256 doublings and
+    # 65 additions of an entry of the table P, 2P, ..., 8P, instead of 255 of
+    # each with double-and-add. The entries are read with `conditional_lookup`,
+    # so the sequence of operations does not depend on the scalar. Longer
+    # scalars get more windows.
     def multiply(self, by):
-        acc = G2Projective.identity()
+        k = scalar_to_int(by)
+        digits = signed_digits(k, 4, (max(k.bit_length(), 256) + 3) // 4 + 1)
+        table = small_multiples(self, 8)
 
-        # This is a simple double-and-add implementation of point
-        # multiplication, moving from most significant to least
-        # significant bit of the scalar.
+        acc = conditional_lookup(G2Projective, table, digits[-1])
+        for d in reversed(digits[:-1]):
+            for _ in range(4):
+                acc = acc.double()
+            acc += conditional_lookup(G2Projective, table, d)
 
-        # We skip the leading bit because it's always unset for Fq
-        # elements.
+        return acc
 
-        first_bit = True
+    # Splits the canonical value k < q of a scalar into its four base-X digits
+    # (k0, k1, k2, k3), least significant first, where X = -x = BLS_X is
+    # 64 bits long. As psi acts on G2 as multiplication by p = x (mod q),
+    # X^i * P is (-1)^i * psi^i(P), so k * P is the sum of the digits times the
+    # `gls_bases` of P.
+    def gls_decompose(k):
+        return x_digits(k)
+
+    # Returns the points X^i * P = (-1)^i * psi^i(P) for i = 0, 1, 2, 3, given
+    # `table`, a list of multiples of P, for each of them: the i-th list holds
+    # the same multiples of X^i * P.
+    def gls_bases(table):
+        psi1 = [p.psi() for p in table]
+        psi2 = [p.psi2() for p in table]
+        psi3 = [p.psi() for p in psi2]
+        return [table, [-p for p in psi1], psi2, [-p for p in psi3]]
+
+    # Multiplies this point by the scalar `by` with the GLS method: the four
+    # digits of `gls_decompose` are recoded in 17 signed 4-bit windows, which
+    # share a single chain of 68 doublings (instead of 255). Each window adds
+    # one entry of each table of the multiples 1 to 8 of the `gls_bases`, read
+    # with `conditional_lookup`, so the sequence of operations does not depend
+    # on the scalar.
+    #
+    # psi acts as multiplication by x on the points of G2 only, so this must
+    # not be used on points outside of the subgroup.
+    def multiply_gls(self, by: Scalar):
+        windows = [
+            signed_digits(d, 4, 17)
+            for d in G2Projective.gls_decompose(scalar_to_int(by))
+        ]
+        tables = G2Projective.gls_bases(small_multiples(self, 8))
 
-        for byte in reversed(by):
-            for i in range(7, -1, -1):
-                if first_bit:
-                    first_bit = False
-                    continue
-                bit = (byte >> i) & 1
+        acc = G2Projective.identity()
+        for window in reversed(range(17)):
+            for _ in range(4):
                 acc = acc.double()
-                acc = G2Projective.conditional_select(
-                    acc, acc + self, Choice(1) if bit else Choice(0)
-                )
+
+            for digits, table in zip(windows, tables):
+                acc += conditional_lookup(G2Projective, table, digits[window])
 
         return acc
 
+    # Multiplies this point by the scalar `by` with the GLS method, recoding the
+    # four digits of `gls_decompose` in width-5 NAF: they share a chain of at
+    # most 65 doublings, and each needs about one addition every 6 bits, taken
+    # from the odd multiples P, 3P, ..., 15P of the `gls_bases`.
+    #
+    # As `multiply_gls`, this must not be used on points outside of G2.
+    #
+    # **This operation is variable time with respect to the scalar.**
+    def multiply_gls_vartime(self, by: Scalar):
+        nafs = [wnaf(d, 5) for d in G2Projective.gls_decompose(scalar_to_int(by))]
+        tables = G2Projective.gls_bases(odd_multiples(self, 8))
+        return wnaf_sum(G2Projective, nafs, tables)
+
+    # Multiplies this point by `by`, a `Scalar`, an integer or little-endian
+    # bytes as taken by `multiply`, recoded in NAF of width `wnaf_width`: for a
+    # full-size scalar, about 255 doublings and 50 additions (including the
+    # precomputation of P, 3P, ..., 15P) instead of 255 of each. Unlike
+    # `multiply_gls_vartime`, this works on any point of the curve.
+    #
+    # **This operation is variable time with respect to the scalar.** It must
+    # only be used on public scalars; use `multiply` or `multiply_gls` for
+    # secret ones.
+    def multiply_vartime(self, by):
+        k = scalar_to_int(by)
+        w = wnaf_width(k.bit_length())
+        return wnaf_sum(G2Projective, [wnaf(k, w)], [odd_multiples(self, 1 << (w - 2))])
+
     def psi(self):
         # 1 / ((u+1) ^ ((q-1)/3))
         psi_coeff_x = Fp2(
@@ -485,40 +563,20 @@ class G2Projective:
     def batch_normalize(p, q):
         assert len(p) == len(q)
 
-        acc = Fp2.one()
-        for p_item, q_item in zip(p, q):
-            # We use the `x` field of `G1Affine` to store the product
-            # of previous z-coordinates seen.
-            q_item.x = acc
+        # Identities have a zero z-coordinate, which the batch inversion
+        # skips, so all the z-coordinates are inverted at once.
+        zinvs = Fp2.batch_invert([p_item.z for p_item in p])
 
-            # We will end up skipping all identities in p
-            acc = Fp2.conditional_select(
-                acc * p_item.z, acc, Choice(1) if p_item.is_identity() else Choice(0)
-            )
+        for p_item, q_item, zinv in zip(p, q, zinvs):
+            skip = Choice(1) if p_item.is_identity() else Choice(0)
 
-        # This is the inverse, as all z-coordinates are nonzero and the ones
-        # that are not are skipped.
-        acc = acc.invert().value
-
-        for p_item, q_item in zip(reversed(p), reversed(q)):
-            skip = p_item.is_identity()
-
-            # Compute tmp = 1/z
-            tmp = q_item.x * acc
-
-            # Cancel out z-coordinate in denominator of `acc`
-            acc = Fp2.conditional_select(
-                acc * p_item.z, acc, Choice(1) if skip else Choice(0)
-            )
+            tmp = G2Affine(p_item.x * zinv, p_item.y * zinv, Choice(0))
+            tmp = G2Affine.conditional_select(tmp, G2Affine.identity(), skip)
 
             # Set the coordinates to the correct value
-            q_item.x = p_item.x * tmp
-            q_item.y = p_item.y * tmp
-            q_item.infinity = Choice(1) if skip else Choice(0)
-
-            q_item = G2Affine.conditional_select(
-                q_item, G2Affine.identity(), Choice(1) if skip else Choice(0)
-            )
+            q_item.x = tmp.x
+            q_item.y = tmp.y
+            q_item.infinity = tmp.infinity
 
     # Clears the cofactor, using [Budroni-Pintore](https://ia.cr/2017/419).
     # This is equivalent to multiplying by $h\_\textrm{eff} = 3(z^2 - 1) \cdot
@@ -531,6 +589,30 @@ class G2Projective:
         # psi^2(2P) + [x^2 - x - 1] P + [x - 1] psi(P)
         return self.double().psi2() + (t1 + t2).mul_by_x() - t1 - t2 - self
 
+    # Computes the multi-scalar multiplication sum(scalars[i] * points[i]) with
+    # the bucket method (see `src.msm`). `points` may mix `G2Affine` and
+    # `G2Projective` values; the projective ones are normalized together first,
+    # so that buckets are built with mixed additions. With `batch_affine`, the
+    # buckets are accumulated in affine coordinates with shared inversions,
+    # which is cheaper on large inputs.
+    #
+    # The window width is tuned with the cost ratios of G2 (see
+    # `MSM_ADDITION_RATIO`).
+    #
+    # **This operation is variable time with respect to the scalars.**
+    def msm(points, scalars, batch_affine=False):
+        return pippenger(
+            G2Projective,
+            G2Projective.from_g2_affine,
+            add_mixed,
+            to_affine(G2Projective, G2Affine, points),
+            scalars,
+            batch_affine=batch_affine,
+            ratio=(
+                MSM_BATCH_AFFINE_ADDITION_RATIO if batch_affine else MSM_ADDITION_RATIO
+            ),
+        )
+
 
 # Adds this point to another point in the affine model.
 def add_mixed(self: G2Projective, rhs: G2Affine):
@@ -602,3 +684,10 @@ B = Fp2(
 )
 
 B3 = Fp2.add(Fp2.add(B, B), B)
+
+# Cost of the projective additions summing up the buckets of an MSM relative to
+# the additions filling them. Over Fp2, mixed additions cost almost as much as
+# projective ones, while affine additions sharing their inversions cost from
+# 1.2 (native backend) to 2.2 (limbs backend) times less.
+MSM_ADDITION_RATIO = 1.05
+MSM_BATCH_AFFINE_ADDITION_RATIO = 1.5
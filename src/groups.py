@@ -0,0 +1,40 @@
+from src.fp import Fp
+from src.fp2 import Fp2
+from src.g1 import G1Affine, G1Projective
+from src.g2 import G2Affine, G2Projective
+import src.g1
+import src.g2
+
+# The arithmetic of each group: (projective, affine, from_affine, module,
+# coordinate field, coordinate size in bytes), shared by the code that handles
+# both groups alike, such as `parallel_msm` (whose workers are told the group by
+# its name) and `FixedBaseTable`. The mixed addition is called as
+# `module.add_mixed`, looked up at call time, so that the counting wrapper
+# installed by `OpCounter` sees it.
+GROUPS = {
+    "G1": (
+        G1Projective,
+        G1Affine,
+        G1Projective.from_g1_affine,
+        src.g1,
+        Fp,
+        48,
+    ),
+    "G2": (
+        G2Projective,
+        G2Affine,
+        G2Projective.from_g2_affine,
+        src.g2,
+        Fp2,
+        96,
+    ),
+}
+
+
+# Returns the name of the group ("G1" or "G2") of the projective or affine type
+# `cls`, raising ValueError for any other type.
+def group_name(cls):
+    for name, (projective, affine, *_) in GROUPS.items():
+        if cls is projective or cls is affine:
+            return name
+    raise ValueError("Unsupported group")
@@ -0,0 +1,181 @@
+import time
+from collections import Counter
+from functools import wraps
+from inspect import getattr_static
+
+# Field operations counted on every level of the tower. Operations a class does
+# not provide are skipped.
+FIELD_OPERATIONS = [
+    "add",
+    "sub",
+    "neg",
+    "mul",
+    "square",
+    "sum_of_products",
+    "invert",
+    "invert_vartime",
+    "sqrt",
+    "pow",
+    "pow_vartime",
+    "mul_wide",
+    "from_wide",
+    "montgomery_reduce",
+    "reduce_wide",
+    "frobenius_map",
+]
+
+# Group operations counted on G1 and G2, on top of the module-level `add_mixed`.
+GROUP_OPERATIONS = [
+    "add",
+    "double",
+    "multiply",
+    "multiply_vartime",
+    "multiply_glv",
+    "multiply_glv_vartime",
+    "multiply_gls",
+    "multiply_gls_vartime",
+]
+
+# The `OpCounter` currently recording, if any.
+_active = None
+
+
+# Records the wall time and operation counts of a top-level API call (such as
+# `pairing` or `map_to_curve`) while an `OpCounter` is active. When no counter
+# is active the call goes straight through.
+def instrumented(f):
+    name = f.__qualname__
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if _active is None:
+            return f(*args, **kwargs)
+        return _active.record(name, f, args, kwargs)
+
+    return wrapper
+
+
+# The operation counts and wall time of one top-level API call.
+class ApiCall:
+    def __init__(self, name, seconds, counts):
+        self.name = name
+        self.seconds = seconds
+        self.counts = counts
+
+    def __str__(self):
+        return f"{self.name}: {self.seconds * 1000:.3f} ms"
+
+
+# Counts field and group operations performed inside a `with` block:
+#
+#     with OpCounter() as counter:
+#         pairing(p, q)
+#     print(counter.report())
+#
+# `counts` maps names such as "Fp.mul", "Fp12.square" or "G1.add_mixed" to the
+# number of calls, and `calls` lists every outermost `instrumented` API call with
+# its wall time and its own counts. Operations on a level include the ones made
+# on behalf of the levels above it, so a single `Fp2.mul` also shows up as the
+# `Fp.sum_of_products` calls it performs.
+#
+# The counting wrappers are installed on the classes when the block is entered
+# and removed when it exits, so the arithmetic runs unmodified, at no cost,
+# whenever no counter is active.
+class OpCounter:
+    def __init__(self):
+        self.counts = Counter()
+        self.calls = []
+        self._patched = []
+        self._depth = 0
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("An OpCounter is already active")
+
+        for owner, label, names in _targets():
+            for name in names:
+                self._patch(owner, label, name)
+        _active = self
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        _active = None
+
+        for owner, name, original in reversed(self._patched):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._patched = []
+        return False
+
+    def _patch(self, owner, label, name):
+        try:
+            attr = getattr_static(owner, name)
+        except AttributeError:
+            return
+
+        counts = self.counts
+        key = f"{label}.{name}"
+        is_static = isinstance(attr, staticmethod)
+        f = attr.__func__ if is_static else attr
+
+        def counting(*args, **kwargs):
+            counts[key] += 1
+            return f(*args, **kwargs)
+
+        # Remember whether the attribute was defined on `owner` itself or
+        # inherited, so that `__exit__` restores exactly the original lookup.
+        self._patched.append((owner, name, vars(owner).get(name)))
+        setattr(owner, name, staticmethod(counting) if is_static else counting)
+
+    def record(self, name, f, args, kwargs):
+        # Nested API calls (e.g. the `final_exponentiation` inside `pairing`)
+        # are accounted to the outermost call only.
+        if self._depth > 0:
+            return f(*args, **kwargs)
+
+        before = self.counts.copy()
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            self._depth -= 1
+            self.calls.append(ApiCall(name, seconds, self.counts - before))
+
+    # Returns a human readable summary of the totals and of every API call.
+    def report(self):
+        lines = [f"{key}: {count}" for key, count in sorted(self.counts.items())]
+        for call in self.calls:
+            lines.append(str(call))
+            for key, count in sorted(call.counts.items()):
+                lines.append(f"    {key}: {count}")
+        return "\n".join(lines)
+
+
+# The classes and modules instrumented by `OpCounter`, as (owner, label, names).
+# They are imported lazily since the arithmetic modules import this one.
+def _targets():
+    import src.fp
+    import src.fp2
+    import src.fp6
+    import src.fp12
+    import src.scalar
+    import src.g1
+    import src.g2
+
+    return [
+        (src.fp.Fp, "Fp", FIELD_OPERATIONS),
+        (src.fp2.Fp2, "Fp2", FIELD_OPERATIONS),
+        (src.fp6.Fp6, "Fp6", FIELD_OPERATIONS),
+        (src.fp12.Fp12, "Fp12", FIELD_OPERATIONS),
+        (src.scalar.Scalar, "Scalar", FIELD_OPERATIONS),
+        (src.g1.G1Projective, "G1", GROUP_OPERATIONS),
+        (src.g1, "G1", ["add_mixed"]),
+        (src.g2.G2Projective, "G2", GROUP_OPERATIONS),
+        (src.g2, "G2", ["add_mixed"]),
+    ]
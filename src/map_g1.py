@@ -20,6 +20,7 @@ from src.g1 import G1Affine, G1Projective
 from src.g2 import G2Affine, G2Projective
 from abc import ABC, abstractmethod
 from src.chain import chain_pm3div4
+from src.instrument import instrumented
 
 
 # Implementation of hash-to-curve for the G1 group.
@@ -770,6 +771,7 @@ def iso_map(u: G1Projective):
     )
 
 
+@instrumented
 def map_to_curve(u: Fp):
     pt = map_to_curve_simple_swu(u)
     return iso_map(pt)
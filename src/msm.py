@@ -0,0 +1,261 @@
+from src.scalar import MODULUS_INT
+from src.utils import Choice, signed_digits
+
+# Multi-scalar multiplication with the bucket method (Pippenger), shared by the
+# G1 and G2 implementations.
+#
+# Every scalar is recoded in signed base-2^c digits in [-2^(c - 1), 2^(c - 1)),
+# so that each c-bit window only needs the 2^(c - 1) buckets for the digits
+# 1, ..., 2^(c - 1): a negative digit adds the negated point to the bucket of its
+# absolute value. Within a window, bucket j collects the points whose digit is
+# j + 1, and the weighted sum of the buckets is obtained with two additions per
+# bucket from a running sum. The windows are combined with c doublings each.
+
+
+# The inverse of the Montgomery constant R = 2^256 mod q.
+R_INV_INT = pow(1 << 256, -1, MODULUS_INT)
+
+
+# The number of signed c-bit windows of a scalar. Scalars are below 2^255, and
+# the window above the top bit absorbs the carry of the recoding.
+def msm_window_count(c):
+    return 256 // c + 1
+
+
+# Picks the window width minimising the cost of an MSM of `n` terms: each window
+# costs one addition per term to fill the buckets, plus two per bucket to sum
+# them up. `ratio` is the cost of the latter (projective) additions relative to
+# the former, which depends on the group and on how buckets are filled.
+def msm_window_width(n, ratio=1.0):
+    return min(range(2, 17), key=lambda c: msm_window_count(c) * (n + ratio * (1 << c)))
+
+
+# Returns the canonical integer value of a `Scalar` (read from its Montgomery
+# form aR as aR * R^-1 mod q), or the integer encoded by a little-endian sequence
+# of bytes such as the argument of `multiply` (integers are returned as is).
+def scalar_to_int(s):
+    if isinstance(s, int):
+        return s
+    if isinstance(s, (list, tuple, bytes, bytearray)):
+        return int.from_bytes(bytes(s), "little")
+    return s.montgomery_int() * R_INV_INT % MODULUS_INT
+
+
+# Returns `scalar_to_int(s)`, raising ValueError unless it lies in [0, 2^256),
+# the range covered by `msm_window_count` signed windows of any width.
+def window_scalar_to_int(s):
+    k = scalar_to_int(s)
+    if not 0 <= k < 1 << 256:
+        raise ValueError("Scalar must be in the range [0, 2^256)")
+    return k
+
+
+# Returns `points` with every point of the `projective` type replaced by its
+# `affine` form, all of them being normalized together with a single inversion.
+def to_affine(projective, affine, points):
+    pending = [p for p in points if isinstance(p, projective)]
+    if not pending:
+        return points
+
+    normalized = [affine.identity() for _ in pending]
+    projective.batch_normalize(pending, normalized)
+    normalized.reverse()
+    return [normalized.pop() if isinstance(p, projective) else p for p in points]
+
+
+# Adds up the points of every bucket in affine coordinates, returning for every
+# bucket its sum as an (x, y) pair, or None for the identity.
+#
+# The points of each bucket are added pairwise, and all the additions of a round
+# (across all the buckets) share a single batch inversion of their slope
+# denominators; every round halves the number of points left in each bucket.
+def batch_affine_sums(field, buckets):
+    while True:
+        pairs = []
+        for j, bucket in enumerate(buckets):
+            while len(bucket) >= 2:
+                pairs.append((j, bucket.pop(), bucket.pop()))
+        if not pairs:
+            break
+
+        # Slope denominators: x2 - x1 for an addition, 2y for a doubling. A zero
+        # denominator means the sum is the identity (or an order-2 point, which
+        # is not in the subgroup), and the batch inversion maps it to zero.
+        denominators = []
+        for j, (x1, y1), (x2, y2) in pairs:
+            if x1.eq(x2) and y1.eq(y2):
+                denominators.append(y1 + y1)
+            elif x1.eq(x2):
+                denominators.append(field.zero())
+            else:
+                denominators.append(x2 - x1)
+
+        for (j, (x1, y1), (x2, y2)), inv in zip(
+            pairs, field.batch_invert(denominators)
+        ):
+            if inv.is_zero():
+                continue
+            if x1.eq(x2):
+                x1_squared = x1.square()
+                slope = (x1_squared + x1_squared + x1_squared) * inv
+            else:
+                slope = (y2 - y1) * inv
+            x3 = slope.square() - x1 - x2
+            buckets[j].append((x3, slope * (x1 - x3) - y1))
+
+    return [bucket[0] if bucket else None for bucket in buckets]
+
+
+# Computes sum(scalars[i] * points[i]) for the affine `points` (`G1Affine` or
+# `G2Affine`), using `projective` (`G1Projective` or `G2Projective`), its
+# conversion from affine coordinates `from_affine` and the matching mixed
+# addition `add_mixed` for the group arithmetic. The scalars are `Scalar`s or
+# integers in [0, 2^256); integers out of that range raise ValueError.
+#
+# The window width `width` defaults to `msm_window_width(len(points), ratio)`. With
+# `batch_affine`, buckets are accumulated in affine coordinates with shared
+# inversions (see `batch_affine_sums`) instead of with mixed additions.
+#
+# **This operation is variable time with respect to the scalars.**
+def pippenger(
+    projective,
+    from_affine,
+    add_mixed,
+    points,
+    scalars,
+    width=None,
+    batch_affine=False,
+    ratio=1.0,
+):
+    if len(points) != len(scalars):
+        raise ValueError("Input lists must have the same length")
+    if not points:
+        return projective.identity()
+
+    c = msm_window_width(len(points), ratio) if width is None else width
+    count = msm_window_count(c)
+    digits = [signed_digits(window_scalar_to_int(s), c, count) for s in scalars]
+    negated = [p.neg() for p in points]
+
+    if batch_affine:
+        affine = type(points[0])
+        field = type(points[0].x)
+        # The identity contributes nothing, and has no affine coordinates
+        terms = [
+            (d, (p.x, p.y), (p.x, q.y))
+            for d, p, q in zip(digits, points, negated)
+            if not p.infinity.value
+        ]
+
+    acc = projective.identity()
+    for window in reversed(range(count)):
+        for _ in range(c):
+            acc = acc.double()
+
+        if batch_affine:
+            buckets = [[] for _ in range(1 << (c - 1))]
+            for d, p, q in terms:
+                d = d[window]
+                if d > 0:
+                    buckets[d - 1].append(p)
+                elif d < 0:
+                    buckets[-d - 1].append(q)
+            buckets = [
+                None if s is None else affine(s[0], s[1], Choice(0))
+                for s in batch_affine_sums(field, buckets)
+            ]
+        else:
+            buckets = [None] * (1 << (c - 1))
+            for d, p, q in zip(digits, points, negated):
+                d = d[window]
+                if d > 0:
+                    j = d - 1
+                elif d < 0:
+                    j, p = (-d - 1, q)
+                else:
+                    continue
+                if buckets[j] is None:
+                    buckets[j] = from_affine(p)
+                else:
+                    buckets[j] = add_mixed(buckets[j], p)
+
+        # sum((j + 1) * buckets[j]) as the sum of the running sums of the
+        # buckets from the top
+        running = None
+        window_sum = None
+        for bucket in reversed(buckets):
+            if bucket is not None:
+                if running is None:
+                    running = from_affine(bucket) if batch_affine else bucket
+                elif batch_affine:
+                    running = add_mixed(running, bucket)
+                else:
+                    running = running + bucket
+            if running is not None:
+                window_sum = running if window_sum is None else window_sum + running
+
+        if window_sum is not None:
+            acc = acc + window_sum
+
+    return acc
+
+
+# The NAF width minimising the cost of a variable-time multiplication by a
+# scalar of `bits` bits: 2^(w - 2) additions to precompute the odd multiples,
+# plus one addition every w + 1 bits on average.
+def wnaf_width(bits):
+    return min(range(2, 9), key=lambda w: (1 << (w - 2)) + bits / (w + 1))
+
+
+# Returns the n multiples P, 2P, ..., nP of the projective point `p`.
+def small_multiples(p, n):
+    table = [p]
+    for _ in range(n - 1):
+        table.append(table[-1] + p)
+    return table
+
+
+# Returns the n odd multiples P, 3P, ..., (2n - 1)P of the projective point `p`.
+def odd_multiples(p, n):
+    double = p.double()
+    odd = [p]
+    for _ in range(n - 1):
+        odd.append(odd[-1] + double)
+    return odd
+
+
+# Computes sum(naf_i * P_i) from the NAFs `nafs` (see `wnaf`) and the tables of
+# odd multiples P_i, 3P_i, ... (see `odd_multiples`) `tables` of the points P_i,
+# interleaving the NAFs so that they share a single chain of doublings: every
+# nonzero digit d of nafs[i] adds the entry |d| * P_i of tables[i], negated when
+# d < 0.
+#
+# **This operation is variable time with respect to the NAFs.**
+def wnaf_sum(projective, nafs, tables):
+    acc = None
+    for i in reversed(range(max(map(len, nafs), default=0))):
+        if acc is not None:
+            acc = acc.double()
+
+        for naf, table in zip(nafs, tables):
+            if i < len(naf) and naf[i] != 0:
+                d = naf[i]
+                p = table[d >> 1] if d > 0 else -table[-d >> 1]
+                acc = p if acc is None else acc + p
+
+    return projective.identity() if acc is None else acc
+
+
+# Returns d * P for a signed digit d with |d| <= len(table), given the multiples
+# `table` = [P, 2P, ...] of a point P of the projective or affine type `cls`.
+# Every entry of the table is read with `conditional_select`, and the result is
+# negated with another one, so that the sequence of operations does not depend
+# on d.
+def conditional_lookup(cls, table, d):
+    is_negative = Choice(1) if d < 0 else Choice(0)
+    d = abs(d)
+
+    acc = cls.identity()
+    for j, entry in enumerate(table, 1):
+        acc = cls.conditional_select(acc, entry, Choice(1) if j == d else Choice(0))
+    return cls.conditional_select(acc, -acc, is_negative)
@@ -0,0 +1,247 @@
+from src.scalar import (
+    Scalar,
+    MODULUS_INT,
+    ROOT_OF_UNITY,
+    ROOT_OF_UNITY_INV,
+    GENERATOR,
+    S,
+)
+from src.msm import scalar_to_int
+
+# Number-theoretic transforms over the scalar field, on power-of-two domains of
+# up to 2^S points generated by the powers of `ROOT_OF_UNITY`.
+#
+# The transforms operate on lists of integers holding the Montgomery forms of the
+# scalars. Since the transform is linear, multiplying a Montgomery form aR by a
+# twiddle factor w given as a plain integer and reducing modulo q yields (aw)R,
+# so the twiddles are kept as plain integers and no Montgomery reduction is
+# needed. Additions and subtractions are left unreduced between stages (the
+# integers only grow by a bit per stage), and every value is reduced once at the
+# end.
+
+
+ROOT_OF_UNITY_INT = scalar_to_int(ROOT_OF_UNITY)
+ROOT_OF_UNITY_INV_INT = scalar_to_int(ROOT_OF_UNITY_INV)
+
+# Twiddle tables, indexed by (log_n, inverse): the powers w^j for 0 <= j < n / 2
+# of the primitive n-th root of unity w (or its inverse).
+TWIDDLES = {}
+
+# Bit-reversal permutations, indexed by log_n.
+BIT_REVERSE = {}
+
+# Powers of coset shifts, indexed by (log_n, shift): shift^i for 0 <= i < n.
+COSET_POWERS = {}
+
+
+# Returns log2(n), checking that `n` is a supported domain size.
+def domain_log_size(n):
+    log_n = n.bit_length() - 1
+    if n < 1 or n != 1 << log_n or log_n > S:
+        raise ValueError("NTT size must be a power of two no larger than 2^32")
+    return log_n
+
+
+# Returns the (cached) twiddle table for a domain of 2^log_n points.
+def twiddles(log_n, inverse=False):
+    key = (log_n, inverse)
+    if key not in TWIDDLES:
+        q = MODULUS_INT
+        root = ROOT_OF_UNITY_INV_INT if inverse else ROOT_OF_UNITY_INT
+        w = pow(root, 1 << (S - log_n), q)
+
+        table = [1] * max((1 << log_n) >> 1, 1)
+        for j in range(1, len(table)):
+            table[j] = table[j - 1] * w % q
+        TWIDDLES[key] = table
+
+    return TWIDDLES[key]
+
+
+# Returns the (cached) bit-reversal permutation of 2^log_n indices.
+def bit_reverse(log_n):
+    if log_n not in BIT_REVERSE:
+        rev = [0]
+        for _ in range(log_n):
+            rev = [r << 1 for r in rev] + [(r << 1) | 1 for r in rev]
+        BIT_REVERSE[log_n] = rev
+
+    return BIT_REVERSE[log_n]
+
+
+# Returns the (cached) powers shift^i, 0 <= i < 2^log_n, of the plain integer
+# `shift`.
+def coset_powers(log_n, shift):
+    key = (log_n, shift)
+    if key not in COSET_POWERS:
+        q = MODULUS_INT
+        powers = [1] * (1 << log_n)
+        for i in range(1, len(powers)):
+            powers[i] = powers[i - 1] * shift % q
+        COSET_POWERS[key] = powers
+
+    return COSET_POWERS[key]
+
+
+# Combines pairs of blocks of m values into blocks of 2m values (one radix-2
+# stage of the decimation-in-time transform). `w` holds the m twiddles w_2m^j.
+def radix2_stage(a, n, m, w):
+    q = MODULUS_INT
+    step = 2 * m
+
+    if m < n // step:
+        # Many small blocks: handle the j-th butterfly of every block at once
+        for j in range(m):
+            wj = w[j]
+            u = a[j::step]
+            v = [x * wj % q for x in a[j + m :: step]]
+            a[j::step] = [x + y for x, y in zip(u, v)]
+            a[j + m :: step] = [x - y for x, y in zip(u, v)]
+    else:
+        # Few large blocks: handle a whole block at once
+        for s in range(0, n, step):
+            u = a[s : s + m]
+            v = [x * wj % q for x, wj in zip(a[s + m : s + step], w)]
+            a[s : s + m] = [x + y for x, y in zip(u, v)]
+            a[s + m : s + step] = [x - y for x, y in zip(u, v)]
+
+
+# Combines groups of four blocks of m values into blocks of 4m values, fusing two
+# radix-2 stages into a single radix-4 pass. `w1`, `w2` and `w3` hold the twiddles
+# w_2m^j, w_4m^j and w_4m^(j + m) for 0 <= j < m.
+def radix4_stage(a, n, m, w1, w2, w3):
+    q = MODULUS_INT
+    step = 4 * m
+
+    def butterflies(x0, x1, x2, x3, w1, w2, w3):
+        t1 = [x * w % q for x, w in zip(x1, w1)]
+        t2 = [x * w % q for x, w in zip(x3, w1)]
+        a1 = [x + y for x, y in zip(x0, t1)]
+        b1 = [x - y for x, y in zip(x0, t1)]
+        u = [(x + y) * w % q for x, y, w in zip(x2, t2, w2)]
+        v = [(x - y) * w % q for x, y, w in zip(x2, t2, w3)]
+        return (
+            [x + y for x, y in zip(a1, u)],
+            [x + y for x, y in zip(b1, v)],
+            [x - y for x, y in zip(a1, u)],
+            [x - y for x, y in zip(b1, v)],
+        )
+
+    if m < n // step:
+        # Many small blocks: handle the j-th butterfly of every block at once
+        for j in range(m):
+            count = n // step
+            (
+                a[j::step],
+                a[j + m :: step],
+                a[j + 2 * m :: step],
+                a[j + 3 * m :: step],
+            ) = butterflies(
+                a[j::step],
+                a[j + m :: step],
+                a[j + 2 * m :: step],
+                a[j + 3 * m :: step],
+                [w1[j]] * count,
+                [w2[j]] * count,
+                [w3[j]] * count,
+            )
+    else:
+        # Few large blocks: handle a whole block at once
+        for s in range(0, n, step):
+            (
+                a[s : s + m],
+                a[s + m : s + 2 * m],
+                a[s + 2 * m : s + 3 * m],
+                a[s + 3 * m : s + step],
+            ) = butterflies(
+                a[s : s + m],
+                a[s + m : s + 2 * m],
+                a[s + 2 * m : s + 3 * m],
+                a[s + 3 * m : s + step],
+                w1,
+                w2,
+                w3,
+            )
+
+
+# Transforms the list `a` of Montgomery-form integers in place, evaluating the
+# polynomial with coefficients `a` at the powers of the n-th root of unity (or,
+# with `inverse`, interpolating it back from these evaluations). All values are
+# fully reduced on return. Returns `a`.
+def ntt_in_place(a, inverse=False):
+    q = MODULUS_INT
+    n = len(a)
+    log_n = domain_log_size(n)
+    table = twiddles(log_n, inverse)
+
+    a[:] = [a[r] for r in bit_reverse(log_n)]
+
+    # Radix-4 passes, finishing with a radix-2 pass when log_n is odd
+    m = 1
+    while m < n:
+        if 4 * m <= n:
+            w = table[:: n // (4 * m)]
+            radix4_stage(a, n, m, w[: 2 * m : 2], w[:m], w[m : 2 * m])
+            m *= 4
+        else:
+            radix2_stage(a, n, m, table[:: n // (2 * m)])
+            m *= 2
+
+    if inverse:
+        n_inv = pow(n, -1, q)
+        a[:] = [x * n_inv % q for x in a]
+    else:
+        a[:] = [x % q for x in a]
+
+    return a
+
+
+# Writes `a` into `out` as scalars, allocating it when it is omitted.
+def to_scalars(a, out):
+    if out is None:
+        out = [None] * len(a)
+    elif len(out) != len(a):
+        raise ValueError("Output list must have the same length as the input")
+
+    for i, x in enumerate(a):
+        out[i] = Scalar.from_montgomery_int(x)
+
+    return out
+
+
+# Evaluates the polynomial with coefficients `values` (a list of 2^k scalars, in
+# increasing degree) at the 2^k-th roots of unity w^0, w^1, .... The result is
+# written into `out`, which may be `values` itself, or into a new list when `out`
+# is omitted. Returns the evaluations.
+def ntt(values, out=None):
+    a = [v.montgomery_int() for v in values]
+    return to_scalars(ntt_in_place(a), out)
+
+
+# Inverse of `ntt`: interpolates the coefficients of the polynomial taking the
+# values `values` at the 2^k-th roots of unity.
+def intt(values, out=None):
+    a = [v.montgomery_int() for v in values]
+    return to_scalars(ntt_in_place(a, True), out)
+
+
+# Evaluates the polynomial with coefficients `values` on the coset shift * H of
+# the domain H of the 2^k-th roots of unity. The shift defaults to the
+# multiplicative generator `GENERATOR`, which lies outside of every such domain.
+def coset_ntt(values, shift: Scalar = None, out=None):
+    q = MODULUS_INT
+    shift = scalar_to_int(GENERATOR if shift is None else shift)
+    powers = coset_powers(domain_log_size(len(values)), shift)
+
+    a = [v.montgomery_int() * p % q for v, p in zip(values, powers)]
+    return to_scalars(ntt_in_place(a), out)
+
+
+# Inverse of `coset_ntt`.
+def coset_intt(values, shift: Scalar = None, out=None):
+    q = MODULUS_INT
+    shift = scalar_to_int(GENERATOR if shift is None else shift)
+    powers = coset_powers(domain_log_size(len(values)), pow(shift, -1, q))
+
+    a = ntt_in_place([v.montgomery_int() for v in values], True)
+    return to_scalars([x * p % q for x, p in zip(a, powers)], out)
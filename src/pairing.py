@@ -9,7 +9,10 @@ from src.utils import (
     wrapping_sub_u64,
     CtOption,
     Choice,
+    wnaf,
+    signed_digits,
     BLS_X,
+    x_digits,
     BLS_X_IS_NEGATIVE,
 )
 from src.scalar import Scalar
@@ -18,6 +21,8 @@ from src.fp12 import (
 )
 from src.g1 import G1Affine
 from src.g2 import G2Affine, G2Projective
+from src.instrument import instrumented
+from src.msm import conditional_lookup
 from abc import ABC, abstractmethod
 
 
@@ -74,6 +79,26 @@ class MillerLoopResult:
 
         return (c0, c1)
 
+    # Unreduced version of `fp4_square`, returning two pairs of double-width
+    # integers (see `Fp2.mul_wide`).
+    def fp4_square_wide(a: Fp2, b: Fp2):
+        t0 = a.square_wide()
+        t1 = b.square_wide()
+        t2 = (a + b).square_wide()
+        c0 = (t1[0] - t1[1] + t0[0], t1[0] + t1[1] + t0[1])
+        c1 = (t2[0] - t0[0] - t1[0], t2[1] - t0[1] - t1[1])
+
+        return (c0, c1)
+
+    # Computes 3 t + 2 s z for the unreduced pair `t`, the element `z` of Fp2
+    # and s = 1 or -1, and reduces it. The Montgomery integer of z shifted by
+    # 384 bits is its double-width form, so 2z is shifted by 385 bits.
+    def cyclotomic_combine(t, z: Fp2, s):
+        return Fp2(
+            Fp.from_wide(3 * t[0] + s * (z.c0.montgomery_int() << 385)),
+            Fp.from_wide(3 * t[1] + s * (z.c1.montgomery_int() << 385)),
+        )
+
     # Adaptation of Algorithm 5.5.4, Guide to Pairing-Based Cryptography
     # Faster Squaring in the Cyclotomic Subgroup of Sixth Degree Extensions
     # https://eprint.iacr.org/2009/565.pdf
@@ -85,32 +110,25 @@ class MillerLoopResult:
         z1 = f.c1.c1
         z5 = f.c1.c2
 
-        (t0, t1) = MillerLoopResult.fp4_square(z0, z1)
+        # The squares are kept unreduced (see `Fp.mul_wide`) and every output
+        # coefficient is reduced once, in `cyclotomic_combine`.
+        (t0, t1) = MillerLoopResult.fp4_square_wide(z0, z1)
 
         # For A
-        z0 = t0 - z0
-        z0 = z0 + z0 + t0
-
-        z1 = t1 + z1
-        z1 = z1 + z1 + t1
+        z0 = MillerLoopResult.cyclotomic_combine(t0, z0, -1)
+        z1 = MillerLoopResult.cyclotomic_combine(t1, z1, 1)
 
-        (t0, t1) = MillerLoopResult.fp4_square(z2, z3)
-        (t2, t3) = MillerLoopResult.fp4_square(z4, z5)
+        (t0, t1) = MillerLoopResult.fp4_square_wide(z2, z3)
+        (t2, t3) = MillerLoopResult.fp4_square_wide(z4, z5)
 
         # For C
-        z4 = t0 - z4
-        z4 = z4 + z4 + t0
-
-        z5 = t1 + z5
-        z5 = z5 + z5 + t1
+        z4 = MillerLoopResult.cyclotomic_combine(t0, z4, -1)
+        z5 = MillerLoopResult.cyclotomic_combine(t1, z5, 1)
 
         # For B
-        t0 = t3.mul_by_nonresidue()
-        z2 = t0 + z2
-        z2 = z2 + z2 + t0
-
-        z3 = t2 - z3
-        z3 = z3 + z3 + t2
+        t0 = (t3[0] - t3[1], t3[0] + t3[1])
+        z2 = MillerLoopResult.cyclotomic_combine(t0, z2, 1)
+        z3 = MillerLoopResult.cyclotomic_combine(t2, z3, -1)
 
         return Fp12(
             Fp6(
@@ -125,32 +143,110 @@ class MillerLoopResult:
             ),
         )
 
+    # Karabina's compressed squaring in the cyclotomic subgroup
+    # Squaring in cyclotomic subgroups, https://eprint.iacr.org/2010/542.pdf
+    #
+    # Writing f = g0 + g1 w^2 + g2 w^4 + g3 w + g4 w^3 + g5 w^5, that is
+    # f = (g0 + g1 v + g2 v^2) + (g3 + g4 v + g5 v^2) w, the square of f only
+    # depends on the compressed form (g1, g2, g3, g5), from which g0 and g4 can
+    # be recovered with `cyclotomic_decompress`. This costs 6 squarings in Fp2
+    # instead of the 9 of `cyclotomic_square`.
+    def compressed_cyclotomic_square(g):
+        (g1, g2, g3, g5) = g
+
+        t0 = g1.square()
+        t1 = g5.square()
+        t2 = g3.square()
+        t3 = g2.square()
+
+        # 2 g1 g5 (u + 1)
+        t4 = ((g1 + g5).square() - t0 - t1).mul_by_nonresidue()
+        # 2 g2 g3
+        t5 = (g2 + g3).square() - t2 - t3
+
+        # h1 = 3 (g3^2 + g2^2 (u + 1)) - 2 g1
+        t6 = t2 + t3.mul_by_nonresidue()
+        h1 = t6 - g1
+        h1 = h1 + h1 + t6
+
+        # h2 = 3 (g1^2 + g5^2 (u + 1)) - 2 g2
+        t6 = t0 + t1.mul_by_nonresidue()
+        h2 = t6 - g2
+        h2 = h2 + h2 + t6
+
+        # h3 = 3 (2 g1 g5 (u + 1)) + 2 g3
+        h3 = t4 + g3
+        h3 = h3 + h3 + t4
+
+        # h5 = 3 (2 g2 g3) + 2 g5
+        h5 = t5 + g5
+        h5 = h5 + h5 + t5
+
+        return (h1, h2, h3, h5)
+
+    # Recovers the elements of the cyclotomic subgroup from their compressed
+    # forms (g1, g2, g3, g5), sharing a single inversion between all of them:
+    #
+    #   g4 = ((u + 1) g5^2 + 3 g1^2 - 2 g2) / 4 g3    if g3 != 0
+    #   g4 = 2 g1 g5 / g2                            otherwise
+    #   g0 = (u + 1)(2 g4^2 + g3 g5 - 3 g1 g2) + 1
+    def cyclotomic_decompress(gs):
+        numerators = []
+        denominators = []
+        for g1, g2, g3, g5 in gs:
+            g3_is_zero = Choice(1) if g3.is_zero() else Choice(0)
+
+            t0 = g1.square()
+            t1 = t0 - g2
+            num = g5.square().mul_by_nonresidue() + t1 + t1 + t0
+            den = g3 + g3
+            den = den + den
+
+            t0 = g1 * g5
+            numerators.append(Fp2.conditional_select(num, t0 + t0, g3_is_zero))
+            denominators.append(Fp2.conditional_select(den, g2, g3_is_zero))
+
+        # When g2 = g3 = 0 the element is one: the denominator is zero and
+        # maps to zero, and so do g4 and every other coefficient but g0.
+        inverses = Fp2.batch_invert(denominators)
+
+        res = []
+        for (g1, g2, g3, g5), num, inv in zip(gs, numerators, inverses):
+            g4 = num * inv
+
+            t0 = g1 * g2
+            t1 = g4.square() - t0
+            t1 = t1 + t1 - t0 + g3 * g5
+            g0 = t1.mul_by_nonresidue() + Fp2.one()
+
+            res.append(Fp12(Fp6(g0, g1, g2), Fp6(g3, g4, g5)))
+
+        return res
+
     def cyclotomic_exp(f: Fp12):
         x = BLS_X
-        tmp = Fp12.one()
-        found_one = False
 
-        for b in reversed([(x >> b) & 1 for b in range(64)]):
-            if found_one:
-                tmp = MillerLoopResult.cyclotomic_square(tmp)
-            else:
-                found_one = b
+        # Square the compressed form of f once per bit of x, keeping the
+        # compressed squares f^(2^i) for the set bits of x. The sparse x only
+        # has six of them, which are decompressed together and multiplied.
+        g = (f.c0.c1, f.c0.c2, f.c1.c0, f.c1.c2)
+        squares = []
+        for i in range(1, x.bit_length()):
+            g = MillerLoopResult.compressed_cyclotomic_square(g)
+            if (x >> i) & 1:
+                squares.append(g)
 
-            if b:
-                tmp *= f
+        tmp = f if x & 1 else Fp12.one()
+        for s in MillerLoopResult.cyclotomic_decompress(squares):
+            tmp *= s
 
         return tmp.conjugate()
 
+    @instrumented
     def final_exponentiation(self):
         f = self.fp
-        t0 = (
-            f.frobenius_map()
-            .frobenius_map()
-            .frobenius_map()
-            .frobenius_map()
-            .frobenius_map()
-            .frobenius_map()
-        )
+        # f^(p^6) is a conjugation
+        t0 = f.frobenius_map(6)
 
         a = Fp12.invert(f)
 
@@ -158,7 +254,7 @@ class MillerLoopResult:
             t1 = a.value
             t2 = t0 * t1
             t1 = t2
-            t2 = t2.frobenius_map().frobenius_map()
+            t2 = t2.frobenius_map(2)
             t2 *= t1
             t1 = MillerLoopResult.cyclotomic_square(t2).conjugate()
             t3 = MillerLoopResult.cyclotomic_exp(t2)
@@ -173,11 +269,11 @@ class MillerLoopResult:
             t4 *= t5 * t2
             t5 = t2.conjugate()
             t1 *= t2
-            t1 = t1.frobenius_map().frobenius_map().frobenius_map()
+            t1 = t1.frobenius_map(3)
             t6 *= t5
             t6 = t6.frobenius_map()
             t3 *= t0
-            t3 = t3.frobenius_map().frobenius_map()
+            t3 = t3.frobenius_map(2)
             t3 *= t1
             t3 *= t6
             f = t3 * t4
@@ -219,22 +315,134 @@ class Gt:
         else:
             raise ValueError("Unsupported type for multiplication")
 
+    # Splits the scalar `k` into four digits k = k0 + k1 X + k2 X^2 + k3 X^3,
+    # with X = -x = BLS_X and 0 <= ki < X < 2^64. Since q < X^4, the digits
+    # are just the base X expansion of k.
+    @staticmethod
+    def decompose(k: Scalar):
+        return x_digits(int.from_bytes(bytes(k.to_bytes()), "little"))
+
+    # Returns f^(X^i) for i = 0, 1, 2, 3. Every element of Gt has order q
+    # and p = x (mod q), so raising to X = -x is a Frobenius map followed by
+    # a conjugation, which inverts elements of the cyclotomic subgroup.
+    @staticmethod
+    def frobenius_bases(f: Fp12):
+        return [
+            f,
+            f.frobenius_map().conjugate(),
+            f.frobenius_map(2),
+            f.frobenius_map(3).conjugate(),
+        ]
+
+    # Multiplies this element by the scalar `other`, in constant time. See
+    # `multi_exp`.
     def mul(self, other: Scalar):
-        acc = Gt.identity()
-
-        # This is a simple double-and-add implementation of group element
-        # multiplication, moving from most significant to least
-        # significant bit of the scalar.
-        #
-        # We skip the leading bit because it's always unset for Fq
-        # elements.
-        for byte in reversed(other.to_bytes()):
-            for i in range(7, -1, -1):
-                bit = Choice(1) if (byte >> i) & 1 else Choice(0)
-                acc = acc.double()
-                acc = Gt.conditional_select(acc, acc + self, bit)
-
-        return acc
+        return Gt.multi_exp([self], [other])
+
+    # Multiplies this element by the scalar `other`. See `multi_exp_vartime`.
+    #
+    # **This operation is variable time with respect to the scalar.**
+    def mul_vartime(self, other: Scalar):
+        return Gt.multi_exp_vartime([self], [other])
+
+    # Returns, for each of the four `frobenius_bases` of f, the table of its
+    # powers 1 to 8, as elements of Gt. The powers of f are mapped to the other
+    # bases with the Frobenius instead of being multiplied out again.
+    @staticmethod
+    def window_tables(f: Fp12):
+        table = [f]
+        for _ in range(7):
+            table.append(table[-1] * f)
+
+        tables = [[Gt(t) for t in table], [], [], []]
+        for t in table:
+            bases = Gt.frobenius_bases(t)
+            for i in range(1, 4):
+                tables[i].append(Gt(bases[i]))
+
+        return tables
+
+    # Returns, for each of the four `frobenius_bases` of f, the table of its
+    # odd powers 1, 3, ..., 15.
+    @staticmethod
+    def odd_power_tables(f: Fp12):
+        f2 = MillerLoopResult.cyclotomic_square(f)
+        table = [f]
+        for _ in range(7):
+            table.append(table[-1] * f2)
+
+        tables = [table] + [[], [], []]
+        for t in table:
+            bases = Gt.frobenius_bases(t)
+            for i in range(1, 4):
+                tables[i].append(bases[i])
+
+        return tables
+
+    # Computes the sum (product, in multiplicative notation) of
+    # `bases[i] * scalars[i]`, in constant time.
+    #
+    # Every scalar is split into four 64-bit digits with `decompose`, which
+    # turns each term into four terms over the `frobenius_bases` of its base.
+    # All of them are processed together (Straus), so the 4-bit windows share
+    # a single chain of 68 cyclotomic squarings. The digits are recoded in
+    # signed windows, whose entries are read from the table of powers 1 to 8
+    # with `conditional_lookup` (a negative digit conjugates, i.e. inverts, the
+    # entry).
+    @staticmethod
+    def multi_exp(bases, scalars):
+        if len(bases) != len(scalars):
+            raise ValueError("Input lists must have the same length")
+
+        windows = []
+        tables = []
+        for base, scalar in zip(bases, scalars):
+            windows += [signed_digits(d, 4, 17) for d in Gt.decompose(scalar)]
+            tables += Gt.window_tables(base.fp)
+
+        acc = Fp12.one()
+        for window in reversed(range(17)):
+            for _ in range(4):
+                acc = MillerLoopResult.cyclotomic_square(acc)
+
+            for digits, table in zip(windows, tables):
+                acc *= conditional_lookup(Gt, table, digits[window]).fp
+
+        return Gt(acc)
+
+    # Computes the sum (product, in multiplicative notation) of
+    # `bases[i] * scalars[i]`.
+    #
+    # This uses the same decomposition as `multi_exp`, with every digit
+    # recoded in width-5 NAF: all terms share a single chain of at most 65
+    # cyclotomic squarings, negative digits cost a conjugation, and each term
+    # needs about one multiplication every 6 bits.
+    #
+    # **This operation is variable time with respect to the scalars.**
+    @staticmethod
+    def multi_exp_vartime(bases, scalars):
+        if len(bases) != len(scalars):
+            raise ValueError("Input lists must have the same length")
+
+        nafs = []
+        tables = []
+        for base, scalar in zip(bases, scalars):
+            nafs += [wnaf(d, 5) for d in Gt.decompose(scalar)]
+            tables += Gt.odd_power_tables(base.fp)
+
+        acc = None
+        for j in reversed(range(max((len(naf) for naf in nafs), default=0))):
+            if acc is not None:
+                acc = MillerLoopResult.cyclotomic_square(acc)
+
+            for naf, table in zip(nafs, tables):
+                d = naf[j] if j < len(naf) else 0
+                if d == 0:
+                    continue
+                t = table[d >> 1] if d > 0 else table[(-d) >> 1].conjugate()
+                acc = t if acc is None else acc * t
+
+        return Gt.identity() if acc is None else Gt(acc)
 
     # Returns the group identity, which is $1$.
     @staticmethod
@@ -254,9 +462,10 @@ class Gt:
     def conditional_select(a, b, choice: Choice):
         return Gt(Fp12.conditional_select(a.fp, b.fp, choice))
 
-    # Doubles this group element.
+    # Doubles this group element. Elements of Gt lie in the cyclotomic
+    # subgroup, where squaring is cheaper.
     def double(self):
-        return Gt(self.fp.square())
+        return Gt(MillerLoopResult.cyclotomic_square(self.fp))
 
     def neg(self):
         # The element is unitary, so we just conjugate.
@@ -411,6 +620,128 @@ class Gt:
             )
         )
 
+    # Checks that this element lies in Gt: it must be in the cyclotomic
+    # subgroup, f^(p^4 - p^2 + 1) = 1, and satisfy f^p = f^x, which for
+    # BLS12 curves only holds for elements of order q
+    # (https://eprint.iacr.org/2021/1130.pdf, section 6).
+    def is_valid(self):
+        f = self.fp
+        if f.is_zero():
+            return False
+        if not (f.frobenius_map(4) * f).eq(f.frobenius_map(2)):
+            return False
+
+        return f.frobenius_map().eq(MillerLoopResult.cyclotomic_exp(f))
+
+    # Serializes this element as the 576-byte concatenation of its six Fp2
+    # coefficients c0.c0, c0.c1, c0.c2, c1.c0, c1.c1, c1.c2, each encoded as
+    # c1 || c0 (see `Fp2.encode_many`).
+    def to_bytes(self):
+        f = self.fp
+        return bytes(
+            Fp2.encode_many([f.c0.c0, f.c0.c1, f.c0.c2, f.c1.c0, f.c1.c1, f.c1.c2])
+        )
+
+    # Attempts to deserialize an element produced by `to_bytes`, checking
+    # that the encoding is canonical and that the element lies in Gt.
+    def from_bytes(bytes):
+        if len(bytes) < 576:
+            return CtOption(Gt.identity(), Choice(0))
+
+        coefficients = Fp2.decode_many(bytes[0:576])
+        c = coefficients.value
+        res = Gt(Fp12(Fp6(c[0], c[1], c[2]), Fp6(c[3], c[4], c[5])))
+
+        is_some = coefficients.choice == 1 and res.is_valid()
+        return CtOption(res, Choice(1) if is_some else Choice(0))
+
+    # Compresses this element with the T2 torus map, see `GtCompressed`.
+    def compress(self):
+        return Gt.batch_compress([self])[0]
+
+    # Compresses every element of `elements`, sharing a single inversion.
+    @staticmethod
+    def batch_compress(elements):
+        # c = (1 + c0) / c1. The identity is the only element of Gt with
+        # c1 = 0, and it maps to c = 0 since zero inverts to zero.
+        inverses = Fp6.batch_invert([e.fp.c1 for e in elements])
+        return [
+            GtCompressed((e.fp.c0 + Fp6.one()) * inv)
+            for e, inv in zip(elements, inverses)
+        ]
+
+
+# An element of Gt compressed to half its size with the T2 torus map.
+#
+# Every element f = c0 + c1 w of Gt has norm f (c0 - c1 w) = c0^2 - c1^2 v = 1
+# over Fp6, so it is determined by c = (1 + c0) / c1, from which
+#
+#   f = (c + w) / (c - w) = (c^2 + v + 2 c w) / (c^2 - v).
+#
+# The only element of the torus with c1 = 0 in Gt is the identity, which is
+# represented by c = 0 (c = 0 would otherwise decompress to -1, which is not in
+# Gt). Inversion (negation in the additive notation of `Gt`) maps c to -c, so it
+# is performed directly on the compressed form, as is equality, while any other
+# arithmetic needs decompression, which `batch_decompress` amortizes with a
+# single inversion.
+class GtCompressed:
+    def __init__(self, c: Fp6):
+        self.c = c
+
+    def __neg__(self):
+        return self.neg()
+
+    def eq(self, other):
+        return self.c.eq(other.c)
+
+    def neg(self):
+        return GtCompressed(-self.c)
+
+    def is_identity(self):
+        return self.c.is_zero()
+
+    def decompress(self):
+        return GtCompressed.batch_decompress([self])[0]
+
+    # Decompresses every element of `elements`, sharing a single inversion.
+    @staticmethod
+    def batch_decompress(elements):
+        v = Fp6(Fp2.zero(), Fp2.one(), Fp2.zero())
+        squares = [e.c.square() for e in elements]
+        inverses = Fp6.batch_invert([c2 - v for c2 in squares])
+
+        res = []
+        for e, c2, inv in zip(elements, squares, inverses):
+            f = Fp12((c2 + v) * inv, (e.c + e.c) * inv)
+            res.append(
+                Gt(
+                    Fp12.conditional_select(
+                        f,
+                        Fp12.one(),
+                        Choice(1) if e.c.is_zero() else Choice(0),
+                    )
+                )
+            )
+
+        return res
+
+    # Serializes this element as the 288-byte concatenation of the Fp2
+    # coefficients c0, c1, c2 of c, each encoded as c1 || c0.
+    def to_bytes(self):
+        return bytes(Fp2.encode_many([self.c.c0, self.c.c1, self.c.c2]))
+
+    # Attempts to deserialize an element produced by `to_bytes`, checking
+    # that the encoding is canonical and that it decompresses into Gt.
+    def from_bytes(bytes):
+        if len(bytes) < 288:
+            return CtOption(GtCompressed(Fp6.zero()), Choice(0))
+
+        coefficients = Fp2.decode_many(bytes[0:288])
+        res = GtCompressed(Fp6(*coefficients.value))
+
+        is_some = coefficients.choice == 1 and res.decompress().is_valid()
+        return CtOption(res, Choice(1) if is_some else Choice(0))
+
 
 class AdderG2Prepared(MillerLoopDriver):
     def __init__(self, cur: G2Projective, base: G2Affine, coeffs: [(Fp2, Fp2, Fp2)]):
@@ -634,6 +965,7 @@ def miller_loop(driver: MillerLoopDriver):
 # $$(a_1, b_1), (a_2, b_2), ..., (a_n, b_n).$$
 #
 # Requires the `alloc` and `pairing` crate features to be enabled.
+@instrumented
 def multi_miller_loop(terms: [(G1Affine, G2Prepared)]):
     adder = AdderMulti(terms, 0)
     tmp = miller_loop(adder)
@@ -641,6 +973,7 @@ def multi_miller_loop(terms: [(G1Affine, G2Prepared)]):
     return MillerLoopResult(tmp)
 
 
+@instrumented
 def pairing(p: G1Affine, q: G2Affine):
     either_identity = p.is_identity().value == 1 or q.is_identity()
     p = G1Affine.conditional_select(
@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from src.groups import GROUPS, group_name
+from src.msm import pippenger, to_affine, window_scalar_to_int
+from src.utils import Choice
+
+# Multi-scalar multiplication spread over a pool of processes.
+#
+# The affine points and the scalars are packed once into a shared memory block,
+# which the workers attach to by name: each of them decodes its own chunk of
+# points straight from the block (with the bulk `decode_many` codecs), runs
+# `pippenger` on it, and sends back its partial sum as packed bytes. The parent
+# adds the partial sums up. Nothing but the block name and the chunk bounds is
+# pickled on the way in.
+#
+# The block holds, for N points with coordinates of `size` bytes:
+#
+#     [ x_0 | y_0 | ... | x_(N-1) | y_(N-1) ]    2 * size * N bytes
+#     [ infinity_0 | ... | infinity_(N-1) ]     N bytes (0 or 1)
+#     [ s_0 | ... | s_(N-1) ]                   32 * N bytes, little endian
+
+# Below this number of points per process, the cost of starting the pool and of
+# packing the inputs outweighs the gain, so smaller inputs are handled serially.
+PARALLEL_MSM_THRESHOLD = 256
+
+
+# Computes the partial MSM of the points start to end - 1 (out of n) of the
+# shared memory block `name`, returning the packed X, Y and Z coordinates of the
+# projective result.
+def msm_chunk(group, name, n, start, end, batch_affine):
+    projective, affine, from_affine, module, field, size = GROUPS[group]
+
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        view = block.buf
+        coordinates = field.decode_many(view[2 * size * start : 2 * size * end]).value
+        flags = bytes(view[2 * size * n + start : 2 * size * n + end])
+        offset = (2 * size + 1) * n
+        scalars = [
+            int.from_bytes(view[offset + 32 * i : offset + 32 * i + 32], "little")
+            for i in range(start, end)
+        ]
+        del view
+
+        points = [
+            affine(coordinates[2 * i], coordinates[2 * i + 1], Choice(flag))
+            for i, flag in enumerate(flags)
+        ]
+        acc = pippenger(
+            projective,
+            from_affine,
+            module.add_mixed,
+            points,
+            scalars,
+            batch_affine=batch_affine,
+        )
+    finally:
+        block.close()
+
+    return bytes(field.encode_many([acc.x, acc.y, acc.z]))
+
+
+# Computes sum(scalars[i] * points[i]) in G1 or G2 (as selected by `projective`,
+# `G1Projective` or `G2Projective`), splitting the points into one chunk per
+# worker process.
+#
+# The points are split into `max_workers` chunks, by default one per CPU, which
+# run on `executor` when one is given (so that a pool can be reused across
+# calls) and otherwise on a new `ProcessPoolExecutor`. Inputs too small to give
+# every chunk at least `PARALLEL_MSM_THRESHOLD` points use fewer chunks, down to
+# the serial `msm` of the group.
+#
+# **This operation is variable time with respect to the scalars.**
+def parallel_msm(
+    projective, points, scalars, batch_affine=False, max_workers=None, executor=None
+):
+    if len(points) != len(scalars):
+        raise ValueError("Input lists must have the same length")
+
+    group = group_name(projective)
+    projective, affine, from_affine, module, field, size = GROUPS[group]
+
+    n = len(points)
+    workers = max_workers or os.cpu_count() or 1
+    chunks = min(workers, n // PARALLEL_MSM_THRESHOLD)
+    if chunks <= 1:
+        return projective.msm(points, scalars, batch_affine)
+
+    points = to_affine(projective, affine, points)
+    block = shared_memory.SharedMemory(create=True, size=(2 * size + 33) * n)
+    try:
+        view = block.buf
+        coordinates = []
+        for p in points:
+            coordinates.append(p.x)
+            coordinates.append(p.y)
+        field.encode_many(coordinates, view[: 2 * size * n])
+        view[2 * size * n : (2 * size + 1) * n] = bytes(
+            p.infinity.value for p in points
+        )
+        offset = (2 * size + 1) * n
+        for i, s in enumerate(scalars):
+            view[offset + 32 * i : offset + 32 * i + 32] = window_scalar_to_int(
+                s
+            ).to_bytes(32, "little")
+        del view
+
+        bounds = [n * k // chunks for k in range(chunks + 1)]
+        args = [
+            (group, block.name, n, bounds[k], bounds[k + 1], batch_affine)
+            for k in range(chunks)
+        ]
+
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=chunks) as pool:
+                partials = list(pool.map(msm_chunk, *zip(*args)))
+        else:
+            partials = list(executor.map(msm_chunk, *zip(*args)))
+    finally:
+        block.close()
+        block.unlink()
+
+    acc = projective.identity()
+    for packed in partials:
+        x, y, z = field.decode_many(packed).value
+        acc = acc + projective(x, y, z)
+    return acc
@@ -0,0 +1,441 @@
+from typing import List
+from src.scalar import Scalar, MODULUS_INT
+from src.ntt import ntt_in_place, twiddles, domain_log_size
+from src.msm import scalar_to_int
+
+# Polynomials over the scalar field.
+#
+# Internally a polynomial is a list of canonical integers modulo q, in increasing
+# degree order, without trailing zero coefficients. The module-level functions
+# operate on such lists and are the building blocks of `Polynomial`, which adds
+# lazy conversion between the coefficient form and the evaluation form on the
+# power-of-two domains of roots of unity used by `src.ntt`.
+
+# Montgomery constant R = 2^256 mod q, to convert canonical integers to scalars
+# (see `msm.scalar_to_int` for the other way).
+R_INT = (1 << 256) % MODULUS_INT
+
+# Below these sizes the quadratic algorithms beat the NTT-based ones.
+MUL_THRESHOLD = 64
+DIVMOD_THRESHOLD = 256
+
+# Sizes of the subtrees of a subproduct tree handled with Horner's rule.
+HORNER_THRESHOLD = 16
+
+
+def int_to_scalar(x):
+    return Scalar.from_montgomery_int(x * R_INT % MODULUS_INT)
+
+
+# Removes the trailing zero coefficients of `a` in place. Returns `a`.
+def trim(a):
+    while a and a[-1] == 0:
+        a.pop()
+    return a
+
+
+def poly_add(a, b):
+    q = MODULUS_INT
+    if len(a) < len(b):
+        a, b = (b, a)
+    return trim([(x + y) % q for x, y in zip(a, b)] + a[len(b) :])
+
+
+def poly_sub(a, b):
+    q = MODULUS_INT
+    n = max(len(a), len(b))
+    a = a + [0] * (n - len(a))
+    b = b + [0] * (n - len(b))
+    return trim([(x - y) % q for x, y in zip(a, b)])
+
+
+def poly_mul(a, b):
+    q = MODULUS_INT
+    if not a or not b:
+        return []
+
+    if min(len(a), len(b)) <= MUL_THRESHOLD:
+        # Schoolbook multiplication, accumulating unreduced products
+        if len(a) < len(b):
+            a, b = (b, a)
+        out = [0] * (len(a) + len(b) - 1)
+        for i, x in enumerate(b):
+            if x:
+                out[i : i + len(a)] = [
+                    o + x * y for o, y in zip(out[i : i + len(a)], a)
+                ]
+        return trim([o % q for o in out])
+
+    # Pointwise multiplication of the evaluations on a large enough domain
+    size = len(a) + len(b) - 1
+    n = 1 << (size - 1).bit_length()
+    fa = ntt_in_place(a + [0] * (n - len(a)))
+    fb = fa if a is b else ntt_in_place(b + [0] * (n - len(b)))
+    return trim(ntt_in_place([x * y % q for x, y in zip(fa, fb)], True)[:size])
+
+
+# Returns the first k coefficients of the power series 1 / a, by Newton iteration
+# b <- b (2 - a b). Requires a[0] != 0.
+def inverse_series(a, k):
+    q = MODULUS_INT
+    b = [pow(a[0], -1, q)]
+    length = 1
+    while length < k:
+        length = min(2 * length, k)
+        t = [(-x) % q for x in poly_mul(a[:length], b)[:length]]
+        t = t + [0] * (length - len(t))
+        t[0] = (t[0] + 2) % q
+        b = poly_mul(b, t)[:length]
+    return b
+
+
+# Returns the quotient and remainder of the division of `a` by the nonzero `b`.
+def poly_divmod(a, b):
+    q = MODULUS_INT
+    a = trim(list(a))
+    b = trim(list(b))
+    if not b:
+        raise ValueError("Division by the zero polynomial")
+    if len(a) < len(b):
+        return ([], a)
+
+    m = len(a) - len(b)
+    if min(m + 1, len(b)) <= DIVMOD_THRESHOLD:
+        # Long division
+        inv = pow(b[-1], -1, q)
+        quot = [0] * (m + 1)
+        r = a
+        for i in range(m, -1, -1):
+            c = r[i + len(b) - 1] * inv % q
+            quot[i] = c
+            if c:
+                r[i : i + len(b)] = [
+                    (x - c * y) % q for x, y in zip(r[i : i + len(b)], b)
+                ]
+        return (quot, trim(r[: len(b) - 1]))
+
+    # The reversed quotient is the reversed dividend divided by the reversed
+    # divisor, as power series modulo x^(m + 1)
+    rev_b = b[::-1][: m + 1]
+    rev_quot = poly_mul(a[::-1][: m + 1], inverse_series(rev_b, m + 1))[: m + 1]
+    quot = trim((rev_quot + [0] * (m + 1 - len(rev_quot)))[::-1])
+    return (quot, trim(poly_sub(a, poly_mul(b, quot))[: len(b) - 1]))
+
+
+def horner(a, x):
+    q = MODULUS_INT
+    acc = 0
+    for c in reversed(a):
+        acc = (acc * x + c) % q
+    return acc
+
+
+# Returns the formal derivative of `a`.
+def derivative(a):
+    q = MODULUS_INT
+    return trim([i * c % q for i, c in enumerate(a[1:], 1)])
+
+
+# Inverts every (nonzero) integer of `values` modulo q with a single modular
+# inversion.
+def batch_invert(values):
+    q = MODULUS_INT
+    prefix = [1] * len(values)
+    acc = 1
+    for i, x in enumerate(values):
+        prefix[i] = acc
+        acc = acc * x % q
+
+    acc = pow(acc, -1, q)
+    out = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        out[i] = acc * prefix[i] % q
+        acc = acc * values[i] % q
+    return out
+
+
+# Returns the subproduct tree of `points`: its first level holds the linear
+# polynomials x - x_i, and every other level the products of pairs of nodes of
+# the level below it (an unpaired last node is carried over as is). The last
+# level holds the single polynomial prod (x - x_i).
+def subproduct_tree(points):
+    q = MODULUS_INT
+    level = [[(-x) % q, 1] for x in points]
+    tree = [level]
+    while len(level) > 1:
+        level = [
+            poly_mul(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+            for i in range(0, len(level), 2)
+        ]
+        tree.append(level)
+    return tree
+
+
+# Evaluates `a` at every point of `points`, reducing it modulo the nodes of their
+# subproduct tree `tree` from the root down, and finishing with Horner's rule
+# once the subtrees are small.
+def multipoint_evaluate(a, points, tree=None):
+    if len(points) <= HORNER_THRESHOLD:
+        return [horner(a, x) for x in points]
+    if tree is None:
+        tree = subproduct_tree(points)
+
+    # The node of level k with index i covers points [i * 2^k, (i + 1) * 2^k)
+    top = len(tree) - 1
+    remainders = [poly_divmod(a, tree[top][0])[1]]
+    k = top
+    while 1 << k > HORNER_THRESHOLD:
+        k -= 1
+        remainders = [
+            poly_divmod(remainders[i >> 1], node)[1] for i, node in enumerate(tree[k])
+        ]
+
+    size = 1 << k
+    return [horner(remainders[i // size], x) for i, x in enumerate(points)]
+
+
+# Returns the polynomial of degree less than len(points) taking the values
+# `values` at the distinct `points`.
+def interpolate(points, values):
+    q = MODULUS_INT
+    if not points:
+        return []
+
+    tree = subproduct_tree(points)
+    denominators = multipoint_evaluate(derivative(tree[-1][0]), points, tree)
+    if any(d == 0 for d in denominators):
+        raise ValueError("Interpolation points must be distinct")
+
+    # Combine the weighted Lagrange numerators up the tree
+    level = [[y * w % q] for y, w in zip(values, batch_invert(denominators))]
+    for k in range(len(tree) - 1):
+        nodes = tree[k]
+        level = [
+            (
+                poly_add(
+                    poly_mul(level[i], nodes[i + 1]), poly_mul(level[i + 1], nodes[i])
+                )
+                if i + 1 < len(level)
+                else level[i]
+            )
+            for i in range(0, len(level), 2)
+        ]
+    return trim(level[0])
+
+
+# Returns the 2^log_n-th roots of unity w^0, w^1, ..., as integers.
+def domain_points(log_n):
+    q = MODULUS_INT
+    half = twiddles(log_n)
+    if log_n == 0:
+        return half
+    return half + [q - x for x in half]
+
+
+# Evaluates at `z` the polynomial taking the values `evals` on the domain of the
+# len(evals)-th roots of unity, with the barycentric formula
+#
+#     f(z) = (z^n - 1) / n * sum(f_i w^i / (z - w^i))
+#
+# whose denominators are inverted together.
+def barycentric_evaluate(evals, z):
+    q = MODULUS_INT
+    n = len(evals)
+    points = domain_points(domain_log_size(n))
+    zn = pow(z, n, q)
+    if zn == 1:
+        return evals[points.index(z)]
+
+    inverses = batch_invert([(z - w) % q for w in points])
+    acc = sum(f * w % q * d for f, w, d in zip(evals, points, inverses))
+    return acc % q * (zn - 1) % q * pow(n, -1, q) % q
+
+
+# A polynomial over the scalar field, held in coefficient form, in evaluation form
+# on the domain of the n-th roots of unity for some power of two n, or both. Each
+# form is computed from the other (with an NTT) only when it is first needed:
+#
+#     f = Polynomial.from_coefficients(coeffs)
+#     g = Polynomial.from_evaluations(evals)
+#     h = f * g
+#     h.evaluate(z)
+#
+# Evaluations are kept for every domain size they were computed on. Products of
+# polynomials that both have evaluations on a domain large enough to hold the
+# result are computed pointwise, and stay in evaluation form.
+class Polynomial:
+    def __init__(self, coeffs=None, evals=None):
+        # Canonical integer coefficients, without trailing zeros
+        self._coeffs = coeffs
+        # Canonical integer evaluations, indexed by domain size
+        self._evals = evals if evals is not None else {}
+
+    def __add__(self, other):
+        return self.add(other)
+
+    def __sub__(self, other):
+        return self.sub(other)
+
+    def __mul__(self, other):
+        return self.mul(other)
+
+    def __neg__(self):
+        return self.neg()
+
+    def __divmod__(self, other):
+        return self.divmod(other)
+
+    def __floordiv__(self, other):
+        return self.divmod(other)[0]
+
+    def __mod__(self, other):
+        return self.divmod(other)[1]
+
+    def zero():
+        return Polynomial([])
+
+    # Builds a polynomial from its coefficients, in increasing degree order.
+    def from_coefficients(coeffs: List[Scalar]):
+        return Polynomial(trim([scalar_to_int(c) for c in coeffs]))
+
+    # Builds the polynomial of degree less than n taking the values `evals` on the
+    # domain of the n-th roots of unity w^0, w^1, ..., where n = len(evals) is a
+    # power of two.
+    def from_evaluations(evals: List[Scalar]):
+        domain_log_size(len(evals))
+        return Polynomial(None, {len(evals): [scalar_to_int(e) for e in evals]})
+
+    # Returns the polynomial of degree less than len(points) taking the values
+    # `values` at the distinct `points`.
+    def interpolate(points: List[Scalar], values: List[Scalar]):
+        if len(points) != len(values):
+            raise ValueError("Points and values must have the same length")
+        return Polynomial(
+            interpolate(
+                [scalar_to_int(x) for x in points], [scalar_to_int(y) for y in values]
+            )
+        )
+
+    def coeffs_int(self):
+        if self._coeffs is None:
+            n, evals = next(iter(self._evals.items()))
+            self._coeffs = trim(ntt_in_place(list(evals), True))
+        return self._coeffs
+
+    def evals_int(self, n):
+        if n not in self._evals:
+            coeffs = self.coeffs_int()
+            if len(coeffs) > n:
+                raise ValueError("Domain is too small for the polynomial")
+            domain_log_size(n)
+            self._evals[n] = ntt_in_place(coeffs + [0] * (n - len(coeffs)))
+        return self._evals[n]
+
+    # Returns the coefficients of the polynomial, in increasing degree order, up to
+    # the leading nonzero one.
+    def coefficients(self):
+        return [int_to_scalar(c) for c in self.coeffs_int()]
+
+    # Returns the values of the polynomial on the domain of the n-th roots of
+    # unity. `n` defaults to the size of a domain the evaluations are already
+    # known on, or else to the smallest power of two above the degree.
+    def evaluations(self, n=None):
+        if n is None:
+            if self._evals:
+                n = next(iter(self._evals))
+            else:
+                length = len(self.coeffs_int())
+                n = 1 << (length - 1).bit_length() if length else 1
+        return [int_to_scalar(e) for e in self.evals_int(n)]
+
+    # Returns the degree of the polynomial, -1 for the zero polynomial.
+    def degree(self):
+        return len(self.coeffs_int()) - 1
+
+    def is_zero(self):
+        return self.degree() < 0
+
+    def eq(self, other):
+        return self.coeffs_int() == other.coeffs_int()
+
+    # Returns an upper bound on the number of coefficients of the polynomial,
+    # without converting it to coefficient form.
+    def length_bound(self):
+        if self._coeffs is not None:
+            return len(self._coeffs)
+        return min(self._evals)
+
+    # Returns a domain size of at least `size` on which both polynomials already
+    # have evaluations, if any.
+    def common_domain(self, other, size=0):
+        for n in self._evals:
+            if n >= size and n in other._evals:
+                return n
+        return None
+
+    def add(self, rhs):
+        q = MODULUS_INT
+        n = self.common_domain(rhs)
+        if n is not None and (self._coeffs is None or rhs._coeffs is None):
+            a, b = self._evals[n], rhs._evals[n]
+            return Polynomial(None, {n: [(x + y) % q for x, y in zip(a, b)]})
+        return Polynomial(poly_add(self.coeffs_int(), rhs.coeffs_int()))
+
+    def sub(self, rhs):
+        q = MODULUS_INT
+        n = self.common_domain(rhs)
+        if n is not None and (self._coeffs is None or rhs._coeffs is None):
+            a, b = self._evals[n], rhs._evals[n]
+            return Polynomial(None, {n: [(x - y) % q for x, y in zip(a, b)]})
+        return Polynomial(poly_sub(self.coeffs_int(), rhs.coeffs_int()))
+
+    def neg(self):
+        q = MODULUS_INT
+        if self._coeffs is None:
+            return Polynomial(
+                None, {n: [(-e) % q for e in evals] for n, evals in self._evals.items()}
+            )
+        return Polynomial([(-c) % q for c in self._coeffs])
+
+    def mul(self, rhs):
+        q = MODULUS_INT
+        n = self.common_domain(rhs, self.length_bound() + rhs.length_bound() - 1)
+        if n is not None:
+            a, b = self._evals[n], rhs._evals[n]
+            return Polynomial(None, {n: [x * y % q for x, y in zip(a, b)]})
+        return Polynomial(poly_mul(self.coeffs_int(), rhs.coeffs_int()))
+
+    # Multiplies every coefficient of the polynomial by the scalar `s`.
+    def mul_by_scalar(self, s: Scalar):
+        q = MODULUS_INT
+        s = scalar_to_int(s)
+        if s == 0:
+            return Polynomial.zero()
+        if self._coeffs is None:
+            return Polynomial(
+                None,
+                {n: [e * s % q for e in evals] for n, evals in self._evals.items()},
+            )
+        return Polynomial([c * s % q for c in self._coeffs])
+
+    # Returns the quotient and the remainder of the division by `divisor`, which
+    # must not be zero.
+    def divmod(self, divisor):
+        quot, rem = poly_divmod(self.coeffs_int(), divisor.coeffs_int())
+        return (Polynomial(quot), Polynomial(rem))
+
+    # Evaluates the polynomial at `x`: with Horner's rule in coefficient form, or
+    # with the barycentric formula in evaluation form.
+    def evaluate(self, x: Scalar):
+        z = scalar_to_int(x)
+        if self._coeffs is None:
+            n, evals = next(iter(self._evals.items()))
+            return int_to_scalar(barycentric_evaluate(evals, z))
+        return int_to_scalar(horner(self._coeffs, z))
+
+    # Evaluates the polynomial at every point of `points`.
+    def evaluate_many(self, points: List[Scalar]):
+        values = multipoint_evaluate(
+            self.coeffs_int(), [scalar_to_int(x) for x in points]
+        )
+        return [int_to_scalar(y) for y in values]
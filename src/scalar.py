@@ -5,8 +5,14 @@ from src.utils import (
     adc,
     wrapping_mul_u64,
     wrapping_sub_u64,
+    array_to_number,
+    number_to_array,
+    montgomery_batch_invert,
+    pow_sliding_window,
+    pow_fixed_window,
     CtOption,
     Choice,
+    BACKEND,
 )
 
 
@@ -61,6 +67,9 @@ class Scalar:
     def one():
         return R
 
+    def is_zero(self):
+        return self.eq(Scalar.zero())
+
     # Adds `rhs` to `self`, returning the result.
     def add(self, rhs):
         d0, carry = adc(self.array[0], rhs.array[0], 0)
@@ -216,6 +225,15 @@ class Scalar:
 
         return CtOption(tmp, Choice(1) if is_some else Choice(0))
 
+    # Returns the integer holding the Montgomery form of `self`.
+    def montgomery_int(self):
+        return array_to_number(self.array)
+
+    # Builds an element from the integer holding its Montgomery form.
+    @staticmethod
+    def from_montgomery_int(value):
+        return Scalar(number_to_array(value, 4))
+
     def from_u512(limbs):
         # We reduce an arbitrary 512-bit number by decomposing it into two 256-bit digits
         # with the higher bits multiplied by 2^256. Thus, we perform two reductions
@@ -380,16 +398,32 @@ class Scalar:
 
         return CtOption(t0, Choice(1) if not self.eq(Scalar.zero()) else Choice(0))
 
+    # Computes the multiplicative inverse with CPython's extended Euclidean
+    # algorithm instead of an exponentiation.
+    #
+    # **This operation is variable time.** It must only be used on public data;
+    # `invert` remains the constant-time default.
+    def invert_vartime(self):
+        t = array_to_number(self.array)
+        if t == 0:
+            return CtOption(Scalar.zero(), Choice(0))
+
+        # For t = aR this gives (aR)^{-1}, and the Montgomery multiplication
+        # by R^3 brings it back to Montgomery form a^{-1}R.
+        return CtOption(
+            Scalar(number_to_array(pow(t, -1, MODULUS_INT), 4)) * R3, Choice(1)
+        )
+
+    # Inverts every element of `elements` at the cost of a single inversion,
+    # using Montgomery's trick. Zero elements are skipped and map to zero.
+    @staticmethod
+    def batch_invert(elements):
+        return montgomery_batch_invert(Scalar, elements)
+
     def pow(self, by):
-        res = Scalar.one()
-        for e in reversed(by):
-            for i in range(63, -1, -1):
-                res = res.square()
-                tmp = res * self
-                res = Scalar.conditional_select(
-                    tmp, res, Choice(0) if (((e >> i) & 0x1) & 0xFF) else Choice(1)
-                )
-        return res
+        # Fixed 4-bit windows, with constant-time table lookups, over every
+        # bit of every limb of the exponent.
+        return pow_fixed_window(self, array_to_number(by), 64 * len(by))
 
     # Exponentiates `self` by `by`, where `by` is a
     # little-endian order integer exponent.
@@ -398,14 +432,7 @@ class Scalar:
     # to the exponent.** If the exponent is fixed,
     # this operation is effectively constant time.
     def pow_vartime(self, by):
-        res = Scalar.one()
-        for e in reversed(by):
-            for i in range(63, -1, -1):
-                res = res.square()
-
-                if ((e >> i) & 1) == 1:
-                    res *= self
-        return res
+        return pow_sliding_window(self, array_to_number(by))
 
     def from_raw(val):
         return Scalar(val) * R2
@@ -414,6 +441,116 @@ class Scalar:
         return self + self
 
 
+# A `Scalar` backed by a single Python integer instead of four 64-bit limbs.
+# The integer holds the Montgomery form aR mod q, so `array`, `to_bytes` and
+# `from_bytes` behave exactly as with the limb representation.
+class ScalarNative(Scalar):
+    def __init__(self, array):
+        if len(array) != 4:
+            raise ValueError("Scalar array must have exactly 4 elements")
+        self.value = array_to_number(array)
+
+    @property
+    def array(self):
+        return number_to_array(self.value, 4)
+
+    @staticmethod
+    def from_value(value):
+        res = ScalarNative.__new__(ScalarNative)
+        res.value = value
+        return res
+
+    @staticmethod
+    def zero():
+        return ScalarNative.from_value(0)
+
+    def eq(self, other):
+        return self.value == other.value
+
+    def is_zero(self):
+        return self.value == 0
+
+    def conditional_select(a, b, choice: Choice):
+        return ScalarNative.from_value(
+            choice.value * b.value + (1 - choice.value) * a.value
+        )
+
+    @staticmethod
+    def reduce_wide(t):
+        # Montgomery reduction of the double-width integer `t`, computing
+        # t / R mod q with the same carry handling as the limb code.
+        t = ((t + ((t * INV_WIDE) & MASK_256) * MODULUS_INT) >> 256) & MASK_256
+        return t - MODULUS_INT if t >= MODULUS_INT else t
+
+    @staticmethod
+    def montgomery_reduce(r0, r1, r2, r3, r4, r5, r6, r7):
+        return ScalarNative.from_value(
+            ScalarNative.reduce_wide(array_to_number([r0, r1, r2, r3, r4, r5, r6, r7]))
+        )
+
+    def add(self, rhs):
+        v = (self.value + rhs.value) & MASK_256
+        return ScalarNative.from_value(v - MODULUS_INT if v >= MODULUS_INT else v)
+
+    def sub(self, rhs):
+        v = self.value - rhs.value
+        return ScalarNative.from_value((v + MODULUS_INT if v < 0 else v) & MASK_256)
+
+    def mul(self, rhs):
+        return ScalarNative.from_value(ScalarNative.reduce_wide(self.value * rhs.value))
+
+    def square(self):
+        return ScalarNative.from_value(
+            ScalarNative.reduce_wide(self.value * self.value)
+        )
+
+    def neg(self):
+        v = self.value
+        return ScalarNative.from_value((MODULUS_INT - v) & MASK_256 if v else 0)
+
+    def to_bytes(self):
+        return list(ScalarNative.reduce_wide(self.value).to_bytes(32, "little"))
+
+    def montgomery_int(self):
+        return self.value
+
+    @staticmethod
+    def from_montgomery_int(value):
+        return ScalarNative.from_value(value)
+
+    def from_bytes(bytes):
+        v = int.from_bytes(bytes[0:32], byteorder="little")
+
+        # The encoding is canonical if and only if it is smaller than the modulus.
+        is_some = v < MODULUS_INT
+
+        # Convert to Montgomery form by computing
+        # (a.R^0 * R^2) / R = a.R
+        tmp = ScalarNative.from_value(ScalarNative.reduce_wide(v * R2.value))
+
+        return CtOption(tmp, Choice(1) if is_some else Choice(0))
+
+    def invert(self):
+        # Exponentiate by q - 2 with CPython's native modular exponentiation.
+        # For aR this yields (aR)^{-1}, which is turned back into Montgomery
+        # form a^{-1}R by a Montgomery multiplication with R^3.
+        t = pow(self.value, MODULUS_INT - 2, MODULUS_INT)
+        t0 = ScalarNative.from_value(ScalarNative.reduce_wide(t * R3.value))
+
+        return CtOption(t0, Choice(1) if self.value != 0 else Choice(0))
+
+    def pow_vartime(self, by):
+        # CPython's modular exponentiation works on the canonical value a, which
+        # is converted back to Montgomery form aR afterwards.
+        a = ScalarNative.reduce_wide(self.value)
+        r = pow(a, array_to_number(by), MODULUS_INT)
+        return ScalarNative.from_value(ScalarNative.reduce_wide(r * R2.value))
+
+
+if BACKEND == "native":
+    Scalar = ScalarNative
+
+
 # Constant representing the modulus
 # q = 0x73eda753299d7d483339d80809a1d80553bda402fffe5bfeffffffff00000001
 MODULUS = Scalar(
@@ -425,6 +562,11 @@ MODULUS = Scalar(
     ]
 )
 
+# q as a single integer, for the native backend
+MODULUS_INT = array_to_number(MODULUS.array)
+
+MASK_256 = (1 << 256) - 1
+
 # The number of bits needed to represent the modulus.
 MODULUS_BITS = 255
 
@@ -441,6 +583,9 @@ GENERATOR = Scalar(
 # INV = -(q^{-1} mod 2^64) mod 2^64
 INV = 0xFFFF_FFFE_FFFF_FFFF
 
+# INV_WIDE = -(q^{-1} mod 2^256) mod 2^256, used by whole-integer Montgomery reduction
+INV_WIDE = -pow(MODULUS_INT, -1, 1 << 256) & MASK_256
+
 # R = 2^256 mod q
 R = Scalar(
     [
@@ -0,0 +1,91 @@
+import unittest
+import os
+import random
+import tempfile
+from src.fixed_base import FixedBaseTable, HEADER
+from src.g1 import G1Affine, G1Projective
+from src.g2 import G2Affine
+from src.scalar import Scalar
+from src.instrument import OpCounter
+
+
+class TestFixedBaseTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(0)
+        cls.scalars = [Scalar.from_bytes_wide(rng.randbytes(64))] + [
+            Scalar.zero(),
+            Scalar.one(),
+            -Scalar.one(),
+        ]
+        cls.g1 = G1Projective.generator().double()
+        cls.g1_table = FixedBaseTable.build(cls.g1, 3)
+
+    def test_g1(self):
+        for s in self.scalars:
+            self.assertTrue(
+                self.g1_table.multiply(s).eq(self.g1.multiply(s.to_bytes()))
+            )
+
+        # Affine bases and other widths
+        table = FixedBaseTable.build(G1Affine.from_g1_projective(self.g1), 2)
+        s = self.scalars[0]
+        self.assertTrue(table.multiply(s).eq(self.g1.multiply(s.to_bytes())))
+
+        table = FixedBaseTable.build(G1Projective.identity(), 2)
+        self.assertTrue(table.multiply(s).is_identity())
+
+    def test_g2(self):
+        g = G2Affine.generator()
+        table = FixedBaseTable.build(g, 2)
+        for s in self.scalars[:2]:
+            self.assertTrue(table.multiply(s).eq(g * s))
+
+    def test_counts(self):
+        with OpCounter() as counter:
+            self.g1_table.multiply(self.scalars[0])
+        self.assertEqual(counter.counts["G1.add_mixed"], len(self.g1_table.windows))
+
+    def test_generator(self):
+        table = FixedBaseTable.generator(G1Projective)
+        self.assertIs(FixedBaseTable.generator(G1Projective), table)
+        s = self.scalars[0]
+        self.assertTrue(table.multiply(s).eq(G1Projective.generator() * s))
+
+    def test_save_load(self):
+        s = self.scalars[0]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "g1.table")
+            self.g1_table.save(path)
+            table = FixedBaseTable.load(path)
+
+        self.assertEqual(table.group, "G1")
+        self.assertEqual(table.width, 3)
+        self.assertTrue(table.multiply(s).eq(self.g1_table.multiply(s)))
+
+    def test_errors(self):
+        data = self.g1_table.to_bytes()
+        self.assertEqual(FixedBaseTable.from_bytes(data).to_bytes(), data)
+
+        corrupted = bytearray(data)
+        corrupted[-100] ^= 1
+        unsupported = bytearray(data)
+        unsupported[8] = 2
+        for invalid in [
+            data[:-1],
+            data[: HEADER.size],
+            b"\0" * len(data),
+            bytes(corrupted),
+            bytes(unsupported),
+        ]:
+            with self.assertRaises(ValueError):
+                FixedBaseTable.from_bytes(invalid)
+
+        with self.assertRaises(ValueError):
+            FixedBaseTable.build(self.g1, 1)
+        with self.assertRaises(ValueError):
+            self.g1_table.multiply((1 << 300) + 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
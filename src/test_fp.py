@@ -1,7 +1,10 @@
 import unittest
 from src.fp import (
     Fp,
+    MODULUS_INT,
 )
+from src.chain import chain_pm3div4, chain_pm2, chain_pp1div4, chain_pm1div2
+import random
 
 from src.utils import array_to_number, Choice
 
@@ -769,5 +772,166 @@ class TestConditionnalSelect(unittest.TestCase):
         self.assertTrue(Fp.conditional_select(a, b, Choice(0)).eq(a))
 
 
+class TestIntegerArithmetic(unittest.TestCase):
+    # Checks the active backend (`BLS12_381_BACKEND`) against plain integer
+    # arithmetic modulo p.
+    def test_matches_integer_arithmetic(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            a = Fp.random(rng)
+            b = Fp.random(rng)
+            x = int.from_bytes(a.to_bytes(), "big")
+            y = int.from_bytes(b.to_bytes(), "big")
+
+            self.assertEqual(
+                int.from_bytes((a * b).to_bytes(), "big"), x * y % MODULUS_INT
+            )
+            self.assertEqual(
+                int.from_bytes(a.square().to_bytes(), "big"), x * x % MODULUS_INT
+            )
+            self.assertEqual(
+                int.from_bytes((a + b).to_bytes(), "big"), (x + y) % MODULUS_INT
+            )
+            self.assertEqual(
+                int.from_bytes((a - b).to_bytes(), "big"), (x - y) % MODULUS_INT
+            )
+            self.assertEqual(int.from_bytes((-a).to_bytes(), "big"), -x % MODULUS_INT)
+            self.assertEqual(
+                int.from_bytes(Fp.sum_of_products([a, b], [b, a]).to_bytes(), "big"),
+                2 * x * y % MODULUS_INT,
+            )
+
+
+class TestBatchInvert(unittest.TestCase):
+    def test_batch_invert(self):
+        rng = random.Random(0)
+        v = [Fp.random(rng), Fp.zero(), Fp.random(rng), Fp.one(), Fp.zero()]
+
+        inverses = Fp.batch_invert(v)
+
+        self.assertEqual(len(inverses), len(v))
+        for a, a_inv in zip(v, inverses):
+            if a.is_zero():
+                self.assertTrue(a_inv.is_zero())
+            else:
+                self.assertTrue(a_inv.eq(a.invert().value))
+                self.assertTrue((a * a_inv).eq(Fp.one()))
+
+    def test_batch_invert_empty(self):
+        self.assertEqual(Fp.batch_invert([]), [])
+
+
+class TestAdditionChains(unittest.TestCase):
+    def test_chains_match_pow_vartime(self):
+        def limbs(e):
+            return [(e >> (64 * i)) & ((1 << 64) - 1) for i in range(6)]
+
+        a = Fp.random(random.Random(0))
+        p = MODULUS_INT
+
+        self.assertTrue(chain_pm3div4(a).eq(a.pow_vartime(limbs((p - 3) // 4))))
+        self.assertTrue(chain_pm2(a).eq(a.pow_vartime(limbs(p - 2))))
+        self.assertTrue(chain_pp1div4(a).eq(a.pow_vartime(limbs((p + 1) // 4))))
+        self.assertTrue(chain_pm1div2(a).eq(a.pow_vartime(limbs((p - 1) // 2))))
+
+
+class TestVartime(unittest.TestCase):
+    def test_invert_vartime(self):
+        rng = random.Random(0)
+        for _ in range(10):
+            a = Fp.random(rng)
+            self.assertTrue(a.invert_vartime().value.eq(a.invert().value))
+            self.assertTrue(a.invert_vartime().choice)
+
+        self.assertFalse(Fp.zero().invert_vartime().choice)
+
+    def test_legendre(self):
+        rng = random.Random(0)
+        self.assertEqual(Fp.zero().legendre(), 0)
+        self.assertEqual(Fp.one().legendre(), 1)
+        self.assertEqual((-Fp.one()).legendre(), -1)
+        for _ in range(10):
+            a = Fp.random(rng)
+            self.assertEqual(a.square().legendre(), 1)
+            self.assertEqual(a.legendre() == 1, bool(a.sqrt().choice))
+
+
+class TestLazyReduction(unittest.TestCase):
+    def test_from_wide_matches_mul(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            a = Fp.random(rng)
+            b = Fp.random(rng)
+            self.assertTrue(Fp.from_wide(a.mul_wide(b)).eq(a * b))
+
+    def test_from_wide_accumulated(self):
+        rng = random.Random(1)
+        a, b, c, d = [Fp.random(rng) for _ in range(4)]
+
+        # a difference of products may go negative before the reduction
+        t = a.mul_wide(b) - c.mul_wide(d) - c.mul_wide(d)
+        self.assertTrue(Fp.from_wide(t).eq(a * b - c * d - c * d))
+
+        t = a.mul_wide(b) + c.mul_wide(d) + a.mul_wide(d)
+        self.assertTrue(Fp.from_wide(t).eq(a * b + c * d + a * d))
+
+    def test_from_wide_zero(self):
+        self.assertTrue(Fp.from_wide(0).is_zero())
+
+
+class TestBulkCodec(unittest.TestCase):
+    def test_round_trip(self):
+        rng = random.Random(0)
+        elements = [Fp.random(rng) for _ in range(10)] + [Fp.zero(), -Fp.one()]
+
+        encoded = Fp.encode_many(elements)
+        self.assertEqual(bytes(encoded), b"".join(e.to_bytes() for e in elements))
+
+        decoded = Fp.decode_many(encoded)
+        self.assertEqual(decoded.choice, 1)
+        self.assertEqual(len(decoded.value), len(elements))
+        for a, b in zip(decoded.value, elements):
+            self.assertTrue(a.eq(b))
+
+    def test_buffer_types(self):
+        rng = random.Random(1)
+        elements = [Fp.random(rng) for _ in range(3)]
+        data = b"".join(e.to_bytes() for e in elements)
+
+        for buffer in [data, bytearray(data), memoryview(data)[48:]]:
+            decoded = Fp.decode_many(buffer)
+            self.assertEqual(decoded.choice, 1)
+            self.assertTrue(decoded.value[-1].eq(elements[-1]))
+
+    def test_preallocated_output(self):
+        rng = random.Random(2)
+        elements = [Fp.random(rng) for _ in range(3)]
+        out = bytearray(200)
+
+        res = Fp.encode_many(elements, memoryview(out)[8:])
+        self.assertEqual(out[8:152], b"".join(e.to_bytes() for e in elements))
+        self.assertEqual(out[:8], bytearray(8))
+        self.assertEqual(out[152:], bytearray(48))
+        self.assertIsInstance(res, memoryview)
+
+        with self.assertRaises(ValueError):
+            Fp.encode_many(elements, bytearray(100))
+
+    def test_non_canonical(self):
+        data = Fp.one().to_bytes() + MODULUS_INT.to_bytes(48, "big")
+        self.assertEqual(Fp.decode_many(data).choice, 0)
+        self.assertEqual(Fp.decode_many(data[:48]).choice, 1)
+
+    def test_bad_length(self):
+        with self.assertRaises(ValueError):
+            Fp.decode_many(bytes(47))
+
+    def test_empty(self):
+        decoded = Fp.decode_many(b"")
+        self.assertEqual(decoded.value, [])
+        self.assertEqual(decoded.choice, 1)
+        self.assertEqual(Fp.encode_many([]), bytearray())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -792,3 +792,73 @@ class TestConditionnalSelect(unittest.TestCase):
 
         self.assertTrue(Fp12.conditional_select(a, b, Choice(1)).eq(b))
         self.assertTrue(Fp12.conditional_select(a, b, Choice(0)).eq(a))
+
+
+class TestBatchInvert(unittest.TestCase):
+    def test_batch_invert(self):
+        rng = random.Random(0)
+        v = [Fp12.random(rng), Fp12.zero(), Fp12.random(rng), Fp12.one(), Fp12.zero()]
+
+        inverses = Fp12.batch_invert(v)
+
+        self.assertEqual(len(inverses), len(v))
+        for a, a_inv in zip(v, inverses):
+            if a.is_zero():
+                self.assertTrue(a_inv.is_zero())
+            else:
+                self.assertTrue(a_inv.eq(a.invert().value))
+                self.assertTrue((a * a_inv).eq(Fp12.one()))
+
+    def test_batch_invert_empty(self):
+        self.assertEqual(Fp12.batch_invert([]), [])
+
+
+class TestLazyReduction(unittest.TestCase):
+    def test_mul_matches_schoolbook(self):
+        rng = random.Random(0)
+        for _ in range(3):
+            a = Fp12.random(rng)
+            b = Fp12.random(rng)
+            c0 = a.c0 * b.c0 + (a.c1 * b.c1).mul_by_nonresidue()
+            c1 = a.c0 * b.c1 + a.c1 * b.c0
+            self.assertTrue((a * b).eq(Fp12(c0, c1)))
+            self.assertTrue(a.square().eq(a * a))
+
+    def test_mul_by_014(self):
+        rng = random.Random(1)
+        a = Fp12.random(rng)
+        c0 = Fp2.random(rng)
+        c1 = Fp2.random(rng)
+        c4 = Fp2.random(rng)
+        b = Fp12(Fp6(c0, c1, Fp2.zero()), Fp6(Fp2.zero(), c4, Fp2.zero()))
+        self.assertTrue(a.mul_by_014(c0, c1, c4).eq(a * b))
+
+
+class TestPowVartime(unittest.TestCase):
+    def test_pow_vartime(self):
+        rng = random.Random(2)
+        a = Fp12.random(rng)
+        expected = a.square() * a
+        for _ in range(6):
+            expected = expected.square()
+        expected = expected * a
+
+        # 0b11000001 = 193, little-endian limbs
+        self.assertTrue(a.pow_vartime([193, 0]).eq(expected))
+        self.assertTrue(a.pow_vartime([0, 0]).eq(Fp12.one()))
+
+
+class TestFrobeniusMapK(unittest.TestCase):
+    def test_matches_repeated_frobenius(self):
+        rng = random.Random(0)
+        a = Fp12.random(rng)
+
+        b = a
+        for k in range(13):
+            self.assertTrue(a.frobenius_map(k).eq(b))
+            b = b.frobenius_map()
+
+    def test_p6_is_conjugation(self):
+        rng = random.Random(1)
+        a = Fp12.random(rng)
+        self.assertTrue(a.frobenius_map(6).eq(a.conjugate()))
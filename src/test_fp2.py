@@ -1,10 +1,13 @@
 import unittest
+import random
 from src.fp import (
     Fp,
+    MODULUS_INT,
 )
 from src.fp2 import (
     Fp2,
 )
+from src.chain import chain_pm3div4, chain_pm2, chain_pp1div4, chain_pm1div2
 from src.utils import array_to_number, Choice
 
 
@@ -867,5 +870,78 @@ class TestConditionnalSelect(unittest.TestCase):
         self.assertTrue(Fp2.conditional_select(a, b, Choice(0)).eq(a))
 
 
+class TestBatchInvert(unittest.TestCase):
+    def test_batch_invert(self):
+        rng = random.Random(0)
+        v = [Fp2.random(rng), Fp2.zero(), Fp2.random(rng), Fp2.one(), Fp2.zero()]
+
+        inverses = Fp2.batch_invert(v)
+
+        self.assertEqual(len(inverses), len(v))
+        for a, a_inv in zip(v, inverses):
+            if a.is_zero():
+                self.assertTrue(a_inv.is_zero())
+            else:
+                self.assertTrue(a_inv.eq(a.invert().value))
+                self.assertTrue((a * a_inv).eq(Fp2.one()))
+
+    def test_batch_invert_empty(self):
+        self.assertEqual(Fp2.batch_invert([]), [])
+
+
+class TestAdditionChains(unittest.TestCase):
+    def test_chains_match_pow_vartime(self):
+        def limbs(e):
+            return [(e >> (64 * i)) & ((1 << 64) - 1) for i in range(6)]
+
+        a = Fp2.random(random.Random(0))
+        p = MODULUS_INT
+
+        self.assertTrue(chain_pm3div4(a).eq(a.pow_vartime(limbs((p - 3) // 4))))
+        self.assertTrue(chain_pm2(a).eq(a.pow_vartime(limbs(p - 2))))
+        self.assertTrue(chain_pp1div4(a).eq(a.pow_vartime(limbs((p + 1) // 4))))
+        self.assertTrue(chain_pm1div2(a).eq(a.pow_vartime(limbs((p - 1) // 2))))
+
+
+class TestIsSquare(unittest.TestCase):
+    def test_is_square(self):
+        rng = random.Random(0)
+        self.assertTrue(Fp2.zero().is_square())
+        self.assertTrue(Fp2.one().is_square())
+        for _ in range(10):
+            a = Fp2.random(rng)
+            self.assertTrue(a.square().is_square())
+            self.assertEqual(a.is_square(), bool(a.sqrt().choice))
+
+
+class TestLazyReduction(unittest.TestCase):
+    def test_mul_wide(self):
+        rng = random.Random(0)
+        for _ in range(10):
+            a = Fp2.random(rng)
+            b = Fp2.random(rng)
+            self.assertTrue(Fp2.from_wide(a.mul_wide(b)).eq(a * b))
+            self.assertTrue(Fp2.from_wide(a.square_wide()).eq(a.square()))
+
+
+class TestBulkCodec(unittest.TestCase):
+    def test_round_trip(self):
+        rng = random.Random(0)
+        elements = [Fp2.random(rng) for _ in range(5)]
+
+        encoded = Fp2.encode_many(elements)
+        self.assertEqual(len(encoded), 96 * len(elements))
+        self.assertEqual(bytes(encoded[:48]), elements[0].c1.to_bytes())
+
+        decoded = Fp2.decode_many(memoryview(encoded))
+        self.assertEqual(decoded.choice, 1)
+        for a, b in zip(decoded.value, elements):
+            self.assertTrue(a.eq(b))
+
+    def test_bad_length(self):
+        with self.assertRaises(ValueError):
+            Fp2.decode_many(bytes(48))
+
+
 if __name__ == "__main__":
     unittest.main()
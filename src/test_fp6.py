@@ -7,6 +7,7 @@ from src.fp2 import (
 )
 from src.fp6 import (
     Fp6,
+    FROBENIUS_COEFFS_C2,
 )
 import random
 from src.utils import array_to_number, Choice
@@ -750,5 +751,79 @@ class TestConditionnalSelect(unittest.TestCase):
         self.assertTrue(Fp6.conditional_select(a, b, Choice(0)).eq(a))
 
 
+class TestBatchInvert(unittest.TestCase):
+    def test_batch_invert(self):
+        rng = random.Random(0)
+        v = [Fp6.random(rng), Fp6.zero(), Fp6.random(rng), Fp6.one(), Fp6.zero()]
+
+        inverses = Fp6.batch_invert(v)
+
+        self.assertEqual(len(inverses), len(v))
+        for a, a_inv in zip(v, inverses):
+            if a.is_zero():
+                self.assertTrue(a_inv.is_zero())
+            else:
+                self.assertTrue(a_inv.eq(a.invert().value))
+                self.assertTrue((a * a_inv).eq(Fp6.one()))
+
+    def test_batch_invert_empty(self):
+        self.assertEqual(Fp6.batch_invert([]), [])
+
+
+class TestLazyReduction(unittest.TestCase):
+    def test_mul_wide(self):
+        rng = random.Random(0)
+        for _ in range(5):
+            a = Fp6.random(rng)
+            b = Fp6.random(rng)
+            self.assertTrue(Fp6.from_wide(a.mul_wide(b)).eq(a.mul_interleaved(b)))
+            self.assertTrue(a.square().eq(a.mul_interleaved(a)))
+
+    def test_mul_by_nonresidue_wide(self):
+        rng = random.Random(1)
+        a = Fp6.random(rng)
+        b = Fp6.random(rng)
+        w = Fp6.mul_by_nonresidue_wide(a.mul_wide(b))
+        self.assertTrue(Fp6.from_wide(w).eq((a * b).mul_by_nonresidue()))
+
+    def test_sparse_mul(self):
+        rng = random.Random(2)
+        a = Fp6.random(rng)
+        c0 = Fp2.random(rng)
+        c1 = Fp2.random(rng)
+        self.assertTrue(a.mul_by_01(c0, c1).eq(a * Fp6(c0, c1, Fp2.zero())))
+        self.assertTrue(a.mul_by_1(c1).eq(a * Fp6(Fp2.zero(), c1, Fp2.zero())))
+
+
+class TestFrobeniusMapK(unittest.TestCase):
+    def test_matches_repeated_frobenius(self):
+        rng = random.Random(0)
+        a = Fp6.random(rng)
+
+        b = a
+        for k in range(8):
+            self.assertTrue(a.frobenius_map(k).eq(b))
+            b = b.frobenius_map()
+
+    def test_coefficients(self):
+        self.assertTrue(
+            FROBENIUS_COEFFS_C2[1].eq(
+                Fp2(
+                    Fp(
+                        [
+                            0x890D_C9E4_8675_45C3,
+                            0x2AF3_2253_3285_A5D5,
+                            0x5088_0866_309B_7E2C,
+                            0xA20D_1B8C_7E88_1024,
+                            0x14E4_F04F_E2DB_9068,
+                            0x14E5_6D3F_1564_853A,
+                        ]
+                    ),
+                    Fp.zero(),
+                )
+            )
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import random
+from src.fp import (
+    Fp,
+)
+from src.fp_vector import (
+    FpVector,
+)
+
+
+def random_elements(rng, n):
+    return [Fp.random(rng) for _ in range(n)] + [Fp.zero(), Fp.one(), -Fp.one()]
+
+
+class TestConversion(unittest.TestCase):
+    def test_round_trip(self):
+        rng = random.Random(0)
+        a = random_elements(rng, 10)
+        v = FpVector.from_list(a)
+
+        self.assertEqual(len(v), len(a))
+        for x, y in zip(v.to_list(), a):
+            self.assertTrue(x.eq(y))
+        self.assertTrue(v[3].eq(a[3]))
+
+    def test_zeros(self):
+        self.assertTrue(all(x.is_zero() for x in FpVector.zeros(4).to_list()))
+
+
+class TestArithmetic(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1)
+        self.a = random_elements(rng, 20)
+        self.b = random_elements(rng, 20)[::-1]
+        self.va = FpVector.from_list(self.a)
+        self.vb = FpVector.from_list(self.b)
+
+    def check(self, vector, expected):
+        self.assertEqual(len(vector), len(expected))
+        for x, y in zip(vector.to_list(), expected):
+            self.assertTrue(x.eq(y))
+
+    def test_add(self):
+        self.check(self.va + self.vb, [x + y for x, y in zip(self.a, self.b)])
+
+    def test_sub(self):
+        self.check(self.va - self.vb, [x - y for x, y in zip(self.a, self.b)])
+
+    def test_neg(self):
+        self.check(-self.va, [-x for x in self.a])
+
+    def test_mul(self):
+        self.check(self.va * self.vb, [x * y for x, y in zip(self.a, self.b)])
+
+    def test_square(self):
+        self.check(self.va.square(), [x.square() for x in self.a])
+
+    def test_mul_by_fp(self):
+        s = self.b[0]
+        self.check(self.va.mul_by_fp(s), [x * s for x in self.a])
+
+    def test_sum(self):
+        expected = Fp.zero()
+        for x in self.a:
+            expected = expected + x
+        self.assertTrue(self.va.sum().eq(expected))
+
+    def test_inner_product(self):
+        self.assertTrue(
+            self.va.inner_product(self.vb).eq(Fp.sum_of_products(self.a, self.b))
+        )
+
+    def test_montgomery_reduce(self):
+        wide = [x.mul_wide(y) for x, y in zip(self.a, self.b)]
+        self.assertTrue(FpVector.montgomery_reduce(wide).eq(self.va * self.vb))
+
+    def test_eq(self):
+        self.assertTrue(self.va.eq(FpVector.from_list(self.a)))
+        self.assertFalse(self.va.eq(self.vb))
+
+    def test_length_mismatch(self):
+        short = FpVector.from_list(self.b[:-1])
+        for op in [
+            FpVector.add,
+            FpVector.sub,
+            FpVector.mul,
+            FpVector.inner_product,
+        ]:
+            with self.assertRaises(ValueError):
+                op(self.va, short)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,10 +11,12 @@ from src.fp6 import (
 from src.fp12 import (
     Fp12,
 )
-from src.g1 import G1Affine, G1Projective, BETA
+from src.g1 import G1Affine, G1Projective, BETA, GLV_LAMBDA, GLV_X2, add_mixed
+from src.msm import pippenger
+from src.map_g1 import map_to_curve
 import random
 from src.utils import array_to_number, Choice, BLS_X, BLS_X_IS_NEGATIVE
-from src.scalar import Scalar
+from src.scalar import Scalar, MODULUS
 
 
 class TestG1(unittest.TestCase):
@@ -521,6 +523,20 @@ class TestScalarMultiplication(unittest.TestCase):
         c = a * b
         self.assertTrue(((g * a) * b).eq(g * c))
 
+    def test_fixed_window(self):
+        g = G1Projective.generator()
+        # Digits of both signs, and a carry into the top window
+        for k in [0, 1, 8, 9, 0x8888, (1 << 256) - 1]:
+            expected = g.multiply_vartime(k)
+            self.assertTrue(g.multiply(list(k.to_bytes(32, "little"))).eq(expected))
+
+        # Scalars longer than 256 bits
+        k = (1 << 300) + 5
+        expected = g.multiply_vartime(k)
+        self.assertTrue(g.multiply(list(k.to_bytes(40, "little"))).eq(expected))
+
+        self.assertTrue(G1Projective.identity().multiply([0xFF] * 32).is_identity())
+
 
 class TestMulByX(unittest.TestCase):
     def test_mul_by_x(self):
@@ -620,3 +636,150 @@ class TestBatchNormalize(unittest.TestCase):
 
                     for i in range(3):
                         self.assertTrue(t[i].eq(expected[i]))
+
+
+def msm_reference(points, scalars):
+    acc = G1Projective.identity()
+    for p, s in zip(points, scalars):
+        acc = acc + p * s
+    return acc
+
+
+class TestMsm(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(0)
+        g = G1Projective.generator()
+        cls.points = [g]
+        for _ in range(5):
+            cls.points.append(cls.points[-1].double() + g)
+        cls.affine = [G1Affine.identity() for _ in cls.points]
+        G1Projective.batch_normalize(cls.points, cls.affine)
+
+        cls.scalars = [Scalar.from_bytes_wide(rng.randbytes(64)) for _ in range(3)] + [
+            Scalar.zero(),
+            Scalar.one(),
+            -Scalar.one(),
+        ]
+        cls.sum = msm_reference(cls.points, cls.scalars)
+
+    def test_msm(self):
+        expected = self.sum
+        for batch_affine in [False, True]:
+            self.assertTrue(
+                G1Projective.msm(self.affine, self.scalars, batch_affine).eq(expected)
+            )
+
+        # Projective and identity inputs
+        points = self.points[:3] + self.affine[3:] + [G1Affine.identity()]
+        scalars = self.scalars + [Scalar.one()]
+        for batch_affine in [False, True]:
+            self.assertTrue(
+                G1Projective.msm(points, scalars, batch_affine).eq(expected)
+            )
+
+    def test_batch_affine_doubling(self):
+        # Equal and opposite points land in the same buckets
+        p = self.affine[1]
+        points = [p, p, p, p.neg(), self.affine[2]]
+        scalars = [self.scalars[0]] * 4 + [self.scalars[1]]
+        expected = msm_reference(
+            [G1Projective.from_g1_affine(p).double(), self.points[2]],
+            [self.scalars[0], self.scalars[1]],
+        )
+        for batch_affine in [False, True]:
+            self.assertTrue(
+                G1Projective.msm(points, scalars, batch_affine).eq(expected)
+            )
+
+    def test_window_width(self):
+        expected = self.sum
+        for width, batch_affine in [(2, False), (4, True)]:
+            self.assertTrue(
+                pippenger(
+                    G1Projective,
+                    G1Projective.from_g1_affine,
+                    add_mixed,
+                    self.affine,
+                    self.scalars,
+                    width,
+                    batch_affine,
+                ).eq(expected)
+            )
+
+    def test_errors(self):
+        self.assertTrue(G1Projective.msm([], []).is_identity())
+        with self.assertRaises(ValueError):
+            G1Projective.msm(self.affine, self.scalars[:-1])
+        for k in [1 << 256, (1 << 300) + 5, -1]:
+            with self.assertRaises(ValueError):
+                G1Projective.msm(self.affine[:1], [k])
+
+
+class TestMultiplyVartime(unittest.TestCase):
+    def test_multiply_vartime(self):
+        rng = random.Random(2)
+        p = G1Projective.generator().double()
+        for s in [Scalar.from_bytes_wide(rng.randbytes(64)), -Scalar.one()]:
+            expected = p.multiply(s.to_bytes())
+            self.assertTrue(p.multiply_vartime(s).eq(expected))
+            self.assertTrue(p.multiply_vartime(s.to_bytes()).eq(expected))
+
+        # Small scalars use narrower NAFs
+        for k in [0, 1, 2, 3, 7, 1 << 20, 0xFFFF_FFFF_FFFF_FFFF]:
+            expected = p.multiply(list(k.to_bytes(32, "little")))
+            self.assertTrue(p.multiply_vartime(k).eq(expected))
+
+        self.assertTrue(G1Projective.identity().multiply_vartime(3).is_identity())
+
+
+class TestGlv(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1)
+        self.p = G1Projective.generator().double()
+        self.scalars = [Scalar.from_bytes_wide(rng.randbytes(64)) for _ in range(2)] + [
+            Scalar.zero(),
+            Scalar.one(),
+            -Scalar.one(),
+        ]
+
+    def test_eigenvalue(self):
+        q = array_to_number(MODULUS.array)
+        self.assertEqual((GLV_LAMBDA * GLV_LAMBDA + GLV_LAMBDA + 1) % q, 0)
+        self.assertTrue(
+            self.p.endomorphism().eq(
+                self.p.multiply(list(GLV_LAMBDA.to_bytes(32, "little")))
+            )
+        )
+
+    def test_decompose(self):
+        for s in self.scalars:
+            k = int.from_bytes(bytes(s.to_bytes()), "little")
+            k1, k2 = G1Projective.glv_decompose(k)
+            self.assertEqual(k1 + k2 * GLV_X2, k)
+            self.assertLess(max(k1, k2), 1 << 128)
+
+        q = array_to_number(MODULUS.array)
+        for k in [q, 1 << 256, -1]:
+            with self.assertRaises(ValueError):
+                G1Projective.glv_decompose(k)
+        with self.assertRaises(ValueError):
+            self.p.multiply_glv(q)
+
+    def test_multiply(self):
+        for s in self.scalars:
+            expected = self.p.multiply(s.to_bytes())
+            self.assertTrue(self.p.multiply_glv(s).eq(expected))
+            self.assertTrue(self.p.multiply_glv_vartime(s).eq(expected))
+            self.assertTrue((self.p * s).eq(expected))
+
+        # Points outside of G1 are multiplied correctly by the `*` operator
+        p = map_to_curve(Fp.one() + Fp.one())
+        self.assertFalse(G1Affine.from_g1_projective(p).is_torsion_free())
+        s = self.scalars[0]
+        self.assertTrue((p * s).eq(p.multiply_vartime(s)))
+        self.assertTrue((G1Affine.from_g1_projective(p) * s).eq(p.multiply_vartime(s)))
+
+        identity = G1Projective.identity()
+        self.assertTrue(identity.multiply_glv(self.scalars[0]).is_identity())
+        self.assertTrue(identity.multiply_glv_vartime(self.scalars[0]).is_identity())
@@ -561,6 +561,20 @@ class TestScalarMultiplication(unittest.TestCase):
         c = a * b
         self.assertTrue(((g * a) * b).eq(g * c))
 
+    def test_fixed_window(self):
+        g = G2Projective.generator()
+        # Digits of both signs, and a carry into the top window
+        for k in [0, 1, 8, 9, 0x8888, (1 << 256) - 1]:
+            expected = g.multiply_vartime(k)
+            self.assertTrue(g.multiply(list(k.to_bytes(32, "little"))).eq(expected))
+
+        # Scalars longer than 256 bits
+        k = (1 << 300) + 5
+        expected = g.multiply_vartime(k)
+        self.assertTrue(g.multiply(list(k.to_bytes(40, "little"))).eq(expected))
+
+        self.assertTrue(G2Projective.identity().multiply([0xFF] * 32).is_identity())
+
 
 class TestMultiplyByX(unittest.TestCase):
     def test_mul_by_x(self):
@@ -739,6 +753,9 @@ class TestClearCofactor(unittest.TestCase):
         )
         self.assertTrue(point.is_on_curve())
         self.assertFalse(G2Affine.from_g2_projective(point).is_torsion_free())
+        # The `*` operator is correct outside of G2 too
+        s = Scalar.from_bytes_wide(bytes(range(64)))
+        self.assertTrue((point * s).eq(point.multiply_vartime(s)))
         cleared_point = point.clear_cofactor()
         self.assertTrue(cleared_point.is_on_curve())
         self.assertTrue(G2Affine.from_g2_projective(cleared_point).is_torsion_free())
@@ -820,3 +837,101 @@ class TestBatchNormalize(unittest.TestCase):
 
                     for i in range(3):
                         self.assertTrue(t[i].eq(expected[i]))
+
+
+def msm_reference(points, scalars):
+    acc = G2Projective.identity()
+    for p, s in zip(points, scalars):
+        acc = acc + p * s
+    return acc
+
+
+class TestMsm(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(0)
+        g = G2Projective.generator()
+        cls.points = [g]
+        for _ in range(3):
+            cls.points.append(cls.points[-1].double() + g)
+        cls.affine = [G2Affine.identity() for _ in cls.points]
+        G2Projective.batch_normalize(cls.points, cls.affine)
+
+        cls.scalars = [Scalar.from_bytes_wide(rng.randbytes(64)) for _ in range(2)] + [
+            Scalar.zero(),
+            -Scalar.one(),
+        ]
+        cls.sum = msm_reference(cls.points, cls.scalars)
+
+    def test_msm(self):
+        for batch_affine in [False, True]:
+            self.assertTrue(
+                G2Projective.msm(self.affine, self.scalars, batch_affine).eq(self.sum)
+            )
+
+        # Projective and identity inputs
+        points = self.points[:2] + self.affine[2:] + [G2Affine.identity()]
+        scalars = self.scalars + [Scalar.one()]
+        self.assertTrue(G2Projective.msm(points, scalars).eq(self.sum))
+
+    def test_batch_affine_doubling(self):
+        # Equal and opposite points land in the same buckets
+        p = self.affine[1]
+        points = [p, p, p, p.neg()]
+        scalars = [self.scalars[0]] * 4
+        expected = G2Projective.from_g2_affine(p).double() * self.scalars[0]
+        self.assertTrue(G2Projective.msm(points, scalars, True).eq(expected))
+
+    def test_errors(self):
+        self.assertTrue(G2Projective.msm([], []).is_identity())
+        with self.assertRaises(ValueError):
+            G2Projective.msm(self.affine, self.scalars[:-1])
+
+
+class TestMultiplyVartime(unittest.TestCase):
+    def test_multiply_vartime(self):
+        rng = random.Random(2)
+        p = G2Projective.generator().double()
+        for s in [Scalar.from_bytes_wide(rng.randbytes(64)), -Scalar.one()]:
+            expected = p.multiply(s.to_bytes())
+            self.assertTrue(p.multiply_vartime(s).eq(expected))
+            self.assertTrue(p.multiply_vartime(s.to_bytes()).eq(expected))
+
+        # Small scalars use narrower NAFs
+        for k in [0, 1, 2, 3, 7, 1 << 20, 0xFFFF_FFFF_FFFF_FFFF]:
+            expected = p.multiply(list(k.to_bytes(32, "little")))
+            self.assertTrue(p.multiply_vartime(k).eq(expected))
+
+        self.assertTrue(G2Projective.identity().multiply_vartime(3).is_identity())
+
+
+class TestGls(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1)
+        self.p = G2Projective.generator().double()
+        self.scalars = [Scalar.from_bytes_wide(rng.randbytes(64))] + [
+            Scalar.zero(),
+            Scalar.one(),
+            -Scalar.one(),
+        ]
+
+    def test_decompose(self):
+        for s in self.scalars:
+            k = int.from_bytes(bytes(s.to_bytes()), "little")
+            digits = G2Projective.gls_decompose(k)
+            self.assertEqual(sum(d * BLS_X**i for i, d in enumerate(digits)), k)
+            self.assertLess(max(digits), 1 << 64)
+
+        with self.assertRaises(ValueError):
+            G2Projective.gls_decompose(BLS_X**4)
+
+    def test_multiply(self):
+        for s in self.scalars:
+            expected = self.p.multiply(s.to_bytes())
+            self.assertTrue(self.p.multiply_gls(s).eq(expected))
+            self.assertTrue(self.p.multiply_gls_vartime(s).eq(expected))
+            self.assertTrue((self.p * s).eq(expected))
+
+        identity = G2Projective.identity()
+        self.assertTrue(identity.multiply_gls(self.scalars[0]).is_identity())
+        self.assertTrue(identity.multiply_gls_vartime(self.scalars[0]).is_identity())
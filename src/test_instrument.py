@@ -0,0 +1,82 @@
+import unittest
+from src.fp import Fp
+from src.fp2 import Fp2
+from src.g1 import G1Affine, G1Projective
+from src.map_g1 import map_to_curve
+from src.instrument import OpCounter
+
+
+class TestOpCounter(unittest.TestCase):
+    def test_counts_field_operations(self):
+        a = Fp2(Fp.one(), Fp.one() + Fp.one())
+
+        with OpCounter() as counter:
+            b = a * a
+
+        # The Fp work of an Fp2 multiplication is counted at the Fp level
+        self.assertEqual(counter.counts["Fp2.mul"], 1)
+        self.assertGreater(counter.counts["Fp.sum_of_products"], 0)
+
+        with OpCounter() as counter:
+            b = a * a
+            b = b.square()
+            b.c0.invert()
+
+        self.assertEqual(counter.counts["Fp2.mul"], 1)
+        self.assertEqual(counter.counts["Fp2.square"], 1)
+        self.assertEqual(counter.counts["Fp.invert"], 1)
+        self.assertGreater(counter.counts["Fp.mul"] + counter.counts["Fp.square"], 0)
+
+    def test_counts_group_operations(self):
+        g = G1Projective.generator()
+
+        with OpCounter() as counter:
+            g.double()
+            g + g
+            g + G1Affine.generator()
+
+        self.assertEqual(counter.counts["G1.double"], 1)
+        self.assertEqual(counter.counts["G1.add"], 1)
+        self.assertEqual(counter.counts["G1.add_mixed"], 1)
+
+    def test_restores_methods(self):
+        mul = vars(Fp).get("mul")
+        sqrt = vars(Fp).get("sqrt")
+
+        with OpCounter():
+            self.assertIsNot(vars(Fp).get("mul"), mul)
+
+        self.assertIs(vars(Fp).get("mul"), mul)
+        self.assertIs(vars(Fp).get("sqrt"), sqrt)
+
+        with OpCounter() as counter:
+            pass
+        Fp.one() * Fp.one()
+        self.assertEqual(sum(counter.counts.values()), 0)
+
+    def test_records_api_calls(self):
+        u = Fp.one() + Fp.one()
+
+        with OpCounter() as counter:
+            map_to_curve(u)
+
+        self.assertEqual(len(counter.calls), 1)
+        call = counter.calls[0]
+        self.assertEqual(call.name, "map_to_curve")
+        self.assertGreater(call.seconds, 0)
+        self.assertGreater(call.counts["Fp.sqrt"] + call.counts["Fp.mul"], 0)
+        self.assertIn("map_to_curve", counter.report())
+
+        # Without an active counter the call is not recorded anywhere
+        map_to_curve(u)
+        self.assertEqual(len(counter.calls), 1)
+
+    def test_not_reentrant(self):
+        with OpCounter():
+            with self.assertRaises(RuntimeError):
+                with OpCounter():
+                    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import random
+from src.scalar import (
+    Scalar,
+    ROOT_OF_UNITY,
+    GENERATOR,
+    S,
+)
+from src.ntt import (
+    ntt,
+    intt,
+    coset_ntt,
+    coset_intt,
+)
+
+
+def random_scalars(rng, n):
+    return [Scalar.from_bytes_wide(rng.randbytes(64)) for _ in range(n)]
+
+
+# The primitive 2^log_n-th root of unity used by the transforms.
+def root_of_unity(log_n):
+    w = ROOT_OF_UNITY
+    for _ in range(S - log_n):
+        w = w.square()
+    return w
+
+
+# Evaluates the polynomial with coefficients `coeffs` at `x` (Horner's rule).
+def evaluate(coeffs, x):
+    acc = Scalar.zero()
+    for c in reversed(coeffs):
+        acc = acc * x + c
+    return acc
+
+
+class TestNtt(unittest.TestCase):
+    def assert_all_eq(self, a, b):
+        self.assertEqual(len(a), len(b))
+        for x, y in zip(a, b):
+            self.assertTrue(x.eq(y))
+
+    def test_matches_evaluation(self):
+        rng = random.Random(0)
+        # Covers radix-4 passes alone and followed by a radix-2 pass
+        for log_n in range(6):
+            coeffs = random_scalars(rng, 1 << log_n)
+            w = root_of_unity(log_n)
+            points = [Scalar.one()]
+            for _ in range(1, len(coeffs)):
+                points.append(points[-1] * w)
+
+            self.assert_all_eq(ntt(coeffs), [evaluate(coeffs, x) for x in points])
+
+    def test_round_trip(self):
+        rng = random.Random(1)
+        for log_n in [0, 1, 4, 7, 8]:
+            coeffs = random_scalars(rng, 1 << log_n)
+            self.assert_all_eq(intt(ntt(coeffs)), coeffs)
+            self.assert_all_eq(ntt(intt(coeffs)), coeffs)
+
+    def test_coset(self):
+        rng = random.Random(2)
+        coeffs = random_scalars(rng, 16)
+        w = root_of_unity(4)
+        x = GENERATOR
+        expected = []
+        for _ in range(16):
+            expected.append(evaluate(coeffs, x))
+            x = x * w
+
+        evals = coset_ntt(coeffs)
+        self.assert_all_eq(evals, expected)
+        self.assert_all_eq(coset_intt(evals), coeffs)
+
+        shift = Scalar.from_u64(5)
+        self.assert_all_eq(coset_intt(coset_ntt(coeffs, shift), shift), coeffs)
+
+    def test_in_place(self):
+        rng = random.Random(3)
+        coeffs = random_scalars(rng, 32)
+        expected = ntt(coeffs)
+
+        values = list(coeffs)
+        self.assertIs(ntt(values, values), values)
+        self.assert_all_eq(values, expected)
+
+        out = [None] * 32
+        self.assertIs(intt(values, out), out)
+        self.assert_all_eq(out, coeffs)
+
+        with self.assertRaises(ValueError):
+            ntt(coeffs, [None] * 16)
+
+    def test_bad_size(self):
+        for n in [0, 3, 12]:
+            with self.assertRaises(ValueError):
+                ntt([Scalar.one()] * n)
+            with self.assertRaises(ValueError):
+                coset_intt([Scalar.one()] * n)
+
+
+if __name__ == "__main__":
+    unittest.main()
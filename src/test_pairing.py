@@ -23,6 +23,7 @@ from src.pairing import (
     ell,
     G2Prepared,
     multi_miller_loop,
+    GtCompressed,
 )
 
 
@@ -160,3 +161,170 @@ class TestMultiMillerLoop(unittest.TestCase):
             .final_exponentiation()
             .eq(Gt.identity())
         )
+
+
+def random_cyclotomic(rng):
+    # f^((p^6 - 1)(p^2 + 1)) lies in the cyclotomic subgroup
+    f = Fp12.random(rng)
+    t = f.conjugate() * f.invert().value
+    return t.frobenius_map().frobenius_map() * t
+
+
+class TestCompressedCyclotomicSquare(unittest.TestCase):
+    def test_matches_cyclotomic_square(self):
+        rng = random.Random(0)
+        f = random_cyclotomic(rng)
+        g = (f.c0.c1, f.c0.c2, f.c1.c0, f.c1.c2)
+
+        squares = []
+        expected = []
+        for _ in range(3):
+            g = MillerLoopResult.compressed_cyclotomic_square(g)
+            f = MillerLoopResult.cyclotomic_square(f)
+            squares.append(g)
+            expected.append(f)
+
+        for a, b in zip(MillerLoopResult.cyclotomic_decompress(squares), expected):
+            self.assertTrue(a.eq(b))
+
+    def test_decompress_one(self):
+        z = Fp2.zero()
+        one = MillerLoopResult.cyclotomic_decompress([(z, z, z, z)])[0]
+        self.assertTrue(one.eq(Fp12.one()))
+
+    def test_cyclotomic_exp(self):
+        rng = random.Random(1)
+        f = random_cyclotomic(rng)
+
+        # f^x with x = -BLS_X, by plain square-and-multiply
+        expected = Fp12.one()
+        for i in reversed(range(64)):
+            expected = expected.square()
+            if (BLS_X >> i) & 1:
+                expected *= f
+        expected = expected.conjugate()
+
+        self.assertTrue(MillerLoopResult.cyclotomic_exp(f).eq(expected))
+
+
+class TestGtMul(unittest.TestCase):
+    def double_and_add(self, g, s):
+        acc = Gt.identity()
+        for byte in reversed(s.to_bytes()):
+            for i in range(7, -1, -1):
+                acc = Gt(acc.fp.square())
+                if (byte >> i) & 1:
+                    acc = acc + g
+        return acc
+
+    def test_decompose(self):
+        s = -Scalar.one()
+        k = int.from_bytes(bytes(s.to_bytes()), "little")
+        d = Gt.decompose(s)
+        self.assertTrue(all(0 <= di < BLS_X for di in d))
+        self.assertEqual(sum(di * BLS_X**i for i, di in enumerate(d)), k)
+
+    def test_mul(self):
+        rng = random.Random(0)
+        g = Gt.generator()
+        scalars = [
+            Scalar.zero(),
+            Scalar.one(),
+            -Scalar.one(),
+            Scalar.from_bytes(
+                bytes(rng.getrandbits(8) for _ in range(31)) + b"\x01"
+            ).value,
+        ]
+        for s in scalars:
+            expected = self.double_and_add(g, s)
+            self.assertTrue((g * s).eq(expected))
+            self.assertTrue(g.mul_vartime(s).eq(expected))
+
+    def test_double(self):
+        g = Gt.generator()
+        self.assertTrue(g.double().eq(Gt(g.fp.square())))
+
+
+class TestGtSerialization(unittest.TestCase):
+    def setUp(self):
+        self.g = Gt.generator()
+        self.a = self.g.double() + self.g
+        self.elements = [self.g, self.a, Gt.identity(), -self.a]
+
+    def test_is_valid(self):
+        for e in self.elements:
+            self.assertTrue(e.is_valid())
+        self.assertFalse(Gt(Fp12.one() + Fp12.one()).is_valid())
+        self.assertFalse(Gt(Fp12.zero()).is_valid())
+
+    def test_uncompressed(self):
+        for e in self.elements:
+            encoded = e.to_bytes()
+            self.assertEqual(len(encoded), 576)
+
+            decoded = Gt.from_bytes(encoded)
+            self.assertEqual(decoded.choice.value, 1)
+            self.assertTrue(decoded.value.eq(e))
+
+        encoded = (Fp12.one() + Fp12.one()).c0.c0.c0.to_bytes() + bytes(528)
+        self.assertEqual(Gt.from_bytes(encoded).choice.value, 0)
+        self.assertEqual(Gt.from_bytes(encoded[:575]).choice.value, 0)
+        self.assertEqual(Gt.from_bytes(b"").choice.value, 0)
+
+    def test_compress(self):
+        compressed = Gt.batch_compress(self.elements)
+        self.assertTrue(compressed[2].is_identity())
+        self.assertTrue(compressed[3].eq(-compressed[1]))
+
+        for c, e in zip(compressed, self.elements):
+            self.assertTrue(c.eq(e.compress()))
+            self.assertTrue(c.decompress().eq(e))
+
+        for d, e in zip(GtCompressed.batch_decompress(compressed), self.elements):
+            self.assertTrue(d.eq(e))
+
+    def test_compressed_bytes(self):
+        for e in self.elements:
+            encoded = e.compress().to_bytes()
+            self.assertEqual(len(encoded), 288)
+
+            decoded = GtCompressed.from_bytes(encoded)
+            self.assertEqual(decoded.choice.value, 1)
+            self.assertTrue(decoded.value.decompress().eq(e))
+
+        # A point of the torus outside of Gt
+        rng = random.Random(0)
+        c = GtCompressed(Fp6.random(rng))
+        self.assertEqual(GtCompressed.from_bytes(c.to_bytes()).choice.value, 0)
+        encoded = self.elements[1].compress().to_bytes()
+        self.assertEqual(GtCompressed.from_bytes(encoded[:287]).choice.value, 0)
+
+
+class TestGtMultiExp(unittest.TestCase):
+    def test_multi_exp(self):
+        rng = random.Random(0)
+        g = Gt.generator()
+        bases = [g, g.double(), Gt.identity(), -g]
+        scalars = [
+            Scalar.from_bytes(
+                bytes(rng.getrandbits(8) for _ in range(31)) + b"\x02"
+            ).value,
+            -Scalar.one(),
+            Scalar.one(),
+            Scalar.zero(),
+        ]
+
+        expected = Gt.identity()
+        for b, s in zip(bases, scalars):
+            expected = expected + b.mul_vartime(s)
+
+        self.assertTrue(Gt.multi_exp(bases, scalars).eq(expected))
+        self.assertTrue(Gt.multi_exp_vartime(bases, scalars).eq(expected))
+
+    def test_empty(self):
+        self.assertTrue(Gt.multi_exp([], []).is_identity())
+        self.assertTrue(Gt.multi_exp_vartime([], []).is_identity())
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            Gt.multi_exp([Gt.generator()], [])
@@ -0,0 +1,90 @@
+import unittest
+import random
+from concurrent.futures import ProcessPoolExecutor
+import src.parallel_msm
+from src.parallel_msm import parallel_msm
+from src.g1 import G1Affine, G1Projective
+from src.g2 import G2Affine, G2Projective
+from src.scalar import Scalar
+
+
+def random_points(projective, affine, n):
+    g = projective.generator()
+    points = [g]
+    for _ in range(n - 1):
+        points.append(points[-1].double() + g)
+    normalized = [affine.identity() for _ in points]
+    projective.batch_normalize(points, normalized)
+    return normalized
+
+
+class TestParallelMsm(unittest.TestCase):
+    def setUp(self):
+        # Split even the small inputs of the tests
+        self.threshold = src.parallel_msm.PARALLEL_MSM_THRESHOLD
+        src.parallel_msm.PARALLEL_MSM_THRESHOLD = 1
+        self.rng = random.Random(0)
+
+    def tearDown(self):
+        src.parallel_msm.PARALLEL_MSM_THRESHOLD = self.threshold
+
+    def random_scalars(self, n):
+        return [Scalar.from_bytes_wide(self.rng.randbytes(64)) for _ in range(n)]
+
+    def test_g1(self):
+        points = random_points(G1Projective, G1Affine, 5)
+        points[1] = G1Affine.identity()
+        scalars = self.random_scalars(5)
+        expected = G1Projective.msm(points, scalars)
+
+        # Projective inputs are normalized before being packed
+        mixed = points[:2] + [G1Projective.from_g1_affine(p) for p in points[2:]]
+        self.assertTrue(
+            parallel_msm(G1Projective, mixed, scalars, max_workers=3).eq(expected)
+        )
+
+        with ProcessPoolExecutor(2) as executor:
+            self.assertTrue(
+                parallel_msm(
+                    G1Projective, points, scalars, True, 2, executor=executor
+                ).eq(expected)
+            )
+
+    def test_g2(self):
+        points = random_points(G2Projective, G2Affine, 2)
+        scalars = self.random_scalars(2)
+        self.assertTrue(
+            parallel_msm(G2Projective, points, scalars, max_workers=2).eq(
+                G2Projective.msm(points, scalars)
+            )
+        )
+
+    def test_serial_fallback(self):
+        src.parallel_msm.PARALLEL_MSM_THRESHOLD = self.threshold
+        points = random_points(G1Projective, G1Affine, 2)
+        scalars = self.random_scalars(2)
+        self.assertTrue(
+            parallel_msm(G1Projective, points, scalars).eq(
+                G1Projective.msm(points, scalars)
+            )
+        )
+        self.assertTrue(parallel_msm(G2Projective, [], []).is_identity())
+
+    def test_int_scalars(self):
+        g = G1Projective.generator()
+        self.assertTrue(
+            parallel_msm(G1Projective, [g, g], [1, 2], max_workers=2).eq(g.double() + g)
+        )
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            parallel_msm(G1Projective, [G1Affine.generator()], [])
+        with self.assertRaises(ValueError):
+            parallel_msm(Scalar, [Scalar.one()], [Scalar.one()])
+        g = G1Projective.generator()
+        with self.assertRaises(ValueError):
+            parallel_msm(G1Projective, [g, g], [1, 1 << 300], max_workers=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import random
+from src.scalar import (
+    Scalar,
+)
+from src.ntt import (
+    ntt,
+)
+from src.polynomial import (
+    Polynomial,
+)
+
+
+def random_scalars(rng, n):
+    return [Scalar.from_bytes_wide(rng.randbytes(64)) for _ in range(n)]
+
+
+def random_polynomial(rng, n):
+    coeffs = random_scalars(rng, n)
+    coeffs[-1] = coeffs[-1] + Scalar.one() if coeffs[-1].is_zero() else coeffs[-1]
+    return Polynomial.from_coefficients(coeffs)
+
+
+# Multiplies two lists of coefficients the schoolbook way, on `Scalar`s.
+def naive_mul(a, b):
+    out = [Scalar.zero() for _ in range(len(a) + len(b) - 1)]
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            out[i + j] = out[i + j] + x * y
+    return out
+
+
+class TestPolynomial(unittest.TestCase):
+    def assert_all_eq(self, a, b):
+        self.assertEqual(len(a), len(b))
+        for x, y in zip(a, b):
+            self.assertTrue(x.eq(y))
+
+    def test_forms(self):
+        rng = random.Random(0)
+        coeffs = random_scalars(rng, 12)
+        f = Polynomial.from_coefficients(coeffs + [Scalar.zero()] * 3)
+        self.assertEqual(f.degree(), 11)
+        self.assert_all_eq(f.coefficients(), coeffs)
+        self.assert_all_eq(f.evaluations(), ntt(coeffs + [Scalar.zero()] * 4))
+
+        g = Polynomial.from_evaluations(f.evaluations(32))
+        self.assert_all_eq(g.coefficients(), coeffs)
+        self.assertTrue(g.eq(f))
+        self.assertTrue(Polynomial.zero().is_zero())
+        self.assert_all_eq(Polynomial.zero().evaluations(), [Scalar.zero()])
+        with self.assertRaises(ValueError):
+            f.evaluations(8)
+
+    def test_add_sub_neg(self):
+        rng = random.Random(1)
+        f = random_polynomial(rng, 10)
+        g = random_polynomial(rng, 7)
+        self.assertTrue((f + g - g).eq(f))
+        self.assertTrue((f - f).is_zero())
+        self.assertTrue((f + -f).is_zero())
+
+        # In evaluation form
+        fe = Polynomial.from_evaluations(f.evaluations(16))
+        ge = Polynomial.from_evaluations(g.evaluations(16))
+        self.assertTrue((fe + ge).eq(f + g))
+        self.assertTrue((fe - ge).eq(f - g))
+        self.assertTrue((-fe).eq(-f))
+
+    def test_mul(self):
+        rng = random.Random(2)
+        # Schoolbook and NTT products
+        for n, m in [(1, 5), (9, 13), (70, 100)]:
+            a = random_scalars(rng, n)
+            b = random_scalars(rng, m)
+            f = Polynomial.from_coefficients(a) * Polynomial.from_coefficients(b)
+            self.assert_all_eq(f.coefficients(), naive_mul(a, b))
+
+        # Pointwise product in evaluation form
+        f = random_polynomial(rng, 8)
+        g = random_polynomial(rng, 8)
+        fe = Polynomial.from_evaluations(f.evaluations(16))
+        ge = Polynomial.from_evaluations(g.evaluations(16))
+        self.assertTrue((fe * ge).eq(f * g))
+        self.assertTrue((fe * g).eq(f * g))
+
+        s = random_scalars(rng, 1)[0]
+        self.assertTrue(f.mul_by_scalar(s).eq(f * Polynomial.from_coefficients([s])))
+        self.assertTrue(fe.mul_by_scalar(s).eq(f.mul_by_scalar(s)))
+
+    def test_divmod(self):
+        rng = random.Random(3)
+        # Long division and Newton iteration
+        for n, m in [(20, 1), (20, 5), (700, 300), (90, 100)]:
+            a = random_polynomial(rng, n)
+            b = random_polynomial(rng, m)
+            q, r = divmod(a, b)
+            self.assertLess(r.degree(), b.degree())
+            self.assertTrue((b * q + r).eq(a))
+            self.assertTrue((a // b).eq(q))
+            self.assertTrue((a % b).eq(r))
+
+        with self.assertRaises(ValueError):
+            divmod(a, Polynomial.zero())
+
+    def test_evaluate(self):
+        rng = random.Random(4)
+        f = random_polynomial(rng, 50)
+        coeffs = f.coefficients()
+        points = random_scalars(rng, 70)
+
+        expected = []
+        for x in points:
+            acc = Scalar.zero()
+            for c in reversed(coeffs):
+                acc = acc * x + c
+            expected.append(acc)
+
+        self.assert_all_eq([f.evaluate(x) for x in points], expected)
+        self.assert_all_eq(f.evaluate_many(points), expected)
+
+        # Barycentric evaluation in evaluation form, also on the domain itself
+        fe = Polynomial.from_evaluations(f.evaluations(64))
+        self.assert_all_eq([fe.evaluate(x) for x in points[:5]], expected[:5])
+        self.assertTrue(fe.evaluate(Scalar.one()).eq(f.evaluations(64)[0]))
+
+    def test_interpolate(self):
+        rng = random.Random(5)
+        for n in [1, 5, 40]:
+            points = random_scalars(rng, n)
+            values = random_scalars(rng, n)
+            f = Polynomial.interpolate(points, values)
+            self.assertLess(f.degree(), n)
+            self.assert_all_eq(f.evaluate_many(points), values)
+
+        with self.assertRaises(ValueError):
+            Polynomial.interpolate(points[:3] + points[:1], values[:4])
+        with self.assertRaises(ValueError):
+            Polynomial.interpolate(points, values[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
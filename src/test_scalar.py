@@ -25,6 +25,7 @@ from src.scalar import (
     INV,
     S,
     DELTA,
+    MODULUS_INT,
 )
 from src.g1 import G1Affine, G1Projective
 import random
@@ -937,3 +938,50 @@ class TestDouble(unittest.TestCase):
             ]
         )
         self.assertTrue(a.double().eq(a + a))
+
+
+class TestIntegerArithmetic(unittest.TestCase):
+    # Checks the active backend (`BLS12_381_BACKEND`) against plain integer
+    # arithmetic modulo q.
+    def test_matches_integer_arithmetic(self):
+        def to_int(s):
+            return int.from_bytes(bytes(s.to_bytes()), "little")
+
+        rng = random.Random(0)
+        for _ in range(20):
+            a = Scalar.from_bytes_wide(bytes(rng.randint(0, 255) for _ in range(64)))
+            b = Scalar.from_bytes_wide(bytes(rng.randint(0, 255) for _ in range(64)))
+            x = to_int(a)
+            y = to_int(b)
+
+            self.assertEqual(to_int(a * b), x * y % MODULUS_INT)
+            self.assertEqual(to_int(a.square()), x * x % MODULUS_INT)
+            self.assertEqual(to_int(a + b), (x + y) % MODULUS_INT)
+            self.assertEqual(to_int(a - b), (x - y) % MODULUS_INT)
+            self.assertEqual(to_int(-a), -x % MODULUS_INT)
+            self.assertEqual(to_int(a.invert().value), pow(x, -1, MODULUS_INT))
+
+
+class TestBatchInvert(unittest.TestCase):
+    def test_batch_invert(self):
+        rng = random.Random(0)
+        v = [
+            Scalar.from_u64(rng.randint(1, 1 << 64)),
+            Scalar.zero(),
+            Scalar.from_u64(rng.randint(1, 1 << 64)),
+            Scalar.one(),
+            Scalar.zero(),
+        ]
+
+        inverses = Scalar.batch_invert(v)
+
+        self.assertEqual(len(inverses), len(v))
+        for a, a_inv in zip(v, inverses):
+            if a.is_zero():
+                self.assertTrue(a_inv.is_zero())
+            else:
+                self.assertTrue(a_inv.eq(a.invert().value))
+                self.assertTrue((a * a_inv).eq(Scalar.one()))
+
+    def test_batch_invert_empty(self):
+        self.assertEqual(Scalar.batch_invert([]), [])
@@ -1,5 +1,21 @@
 import unittest
-from src.utils import sbb, mac, adc, wrapping_mul_u64
+from src.utils import (
+    sbb,
+    mac,
+    adc,
+    wrapping_mul_u64,
+    array_to_number,
+    number_to_array,
+    jacobi,
+    window_width,
+    PowTable,
+    pow_sliding_window,
+    pow_fixed_window,
+    wnaf,
+    signed_digits,
+)
+from src.fp import Fp, MODULUS_INT
+import random
 
 
 class TestSbb(unittest.TestCase):
@@ -138,5 +154,83 @@ class TestWrappingMulU64(unittest.TestCase):
         )
 
 
+class TestNumberToArray(unittest.TestCase):
+    def test_round_trip(self):
+        n = 0x1234_5678_90AB_CDEF_FEDC_BA09_8765_4321_0000_0000_0000_0001
+        self.assertEqual(number_to_array(n, 4)[0], 1)
+        self.assertEqual(array_to_number(number_to_array(n, 4)), n)
+
+
+class TestJacobi(unittest.TestCase):
+    def test_matches_euler_criterion(self):
+        for p in [3, 5, 7, 11, 13, 101, 1009]:
+            for a in range(2 * p):
+                euler = pow(a, (p - 1) // 2, p)
+                self.assertEqual(jacobi(a, p), -1 if euler == p - 1 else euler)
+
+    def test_composite_modulus(self):
+        # (2 / 15) = (2 / 3)(2 / 5) = 1 although 2 is not a square mod 15
+        self.assertEqual(jacobi(2, 15), 1)
+        self.assertEqual(jacobi(5, 15), 0)
+
+
+def fp_from_int(n):
+    return Fp.from_bytes((n % MODULUS_INT).to_bytes(48, "big")).value
+
+
+class TestWindowedPow(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(0)
+        self.a = self.rng.randrange(1, MODULUS_INT)
+        self.x = fp_from_int(self.a)
+
+    def test_window_width(self):
+        self.assertEqual(window_width(0), 1)
+        self.assertEqual(window_width(64), 3)
+        self.assertEqual(window_width(381), 5)
+
+    def test_sliding_window(self):
+        exponents = [0, 1, 2, 3, 0b1011, 1 << 100, MODULUS_INT - 2]
+        exponents += [self.rng.getrandbits(381) for _ in range(3)]
+        for e in exponents:
+            expected = fp_from_int(pow(self.a, e, MODULUS_INT))
+            self.assertTrue(pow_sliding_window(self.x, e).eq(expected))
+
+    def test_table_reuse(self):
+        for width in [1, 2, 4, 6]:
+            table = PowTable(self.x, width)
+            for e in [0, 5, self.rng.getrandbits(200)]:
+                expected = fp_from_int(pow(self.a, e, MODULUS_INT))
+                self.assertTrue(table.pow_vartime(e).eq(expected))
+
+    def test_fixed_window(self):
+        for e in [0, 1, 15, 16, self.rng.getrandbits(64)]:
+            expected = fp_from_int(pow(self.a, e, MODULUS_INT))
+            self.assertTrue(pow_fixed_window(self.x, e, 64).eq(expected))
+            self.assertTrue(pow_fixed_window(self.x, e, 66, 3).eq(expected))
+
+
+class TestRecoding(unittest.TestCase):
+    def test_wnaf(self):
+        rng = random.Random(0)
+        for k in [0, 1, 7, 255, rng.getrandbits(64), rng.getrandbits(255)]:
+            for width in [2, 4, 5]:
+                digits = wnaf(k, width)
+                self.assertEqual(sum(d << i for i, d in enumerate(digits)), k)
+                for i, d in enumerate(digits):
+                    if d != 0:
+                        self.assertEqual(d & 1, 1)
+                        self.assertLess(abs(d), 1 << (width - 1))
+                        self.assertTrue(all(e == 0 for e in digits[i + 1 : i + width]))
+
+    def test_signed_digits(self):
+        rng = random.Random(1)
+        for k in [0, 8, 15, (1 << 64) - 1, rng.getrandbits(64)]:
+            digits = signed_digits(k, 4, 17)
+            self.assertEqual(len(digits), 17)
+            self.assertEqual(sum(d << (4 * i) for i, d in enumerate(digits)), k)
+            self.assertTrue(all(-8 <= d < 8 for d in digits))
+
+
 if __name__ == "__main__":
     unittest.main()
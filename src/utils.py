@@ -1,3 +1,6 @@
+import os
+
+
 class CtOption:
     def __init__(self, value=None, choice=False):
         self.value = value
@@ -109,6 +112,281 @@ def array_to_number(a):
     return combined_value
 
 
+def number_to_array(n, length):
+    """
+    The function `number_to_array` splits a non-negative integer into 64-bit limbs in little-endian
+    order. It is the inverse of `array_to_number`.
+
+    :param n: The integer to split
+    :param length: The number of 64-bit limbs of the result
+    :return: a list of `length` 64-bit limbs, least significant first.
+    """
+    return [(n >> (64 * i)) & ((1 << 64) - 1) for i in range(length)]
+
+
+def jacobi(a, n):
+    """
+    The function `jacobi` computes the Jacobi symbol (a / n) with the binary algorithm, which only
+    needs shifts, parity checks and reductions instead of a modular exponentiation. It runs in
+    variable time and must only be used on public data.
+
+    :param a: The parameter "a" is the integer whose symbol is computed
+    :param n: The parameter "n" is an odd positive integer; when it is prime the result is the
+    Legendre symbol
+    :return: 0 if `a` and `n` share a factor, otherwise 1 or -1.
+    """
+    a %= n
+    t = 1
+    while a != 0:
+        # Pull out the factors of two, using (2 / n) = -1 iff n = 3, 5 (mod 8)
+        while a & 1 == 0:
+            a >>= 1
+            if n & 7 in (3, 5):
+                t = -t
+
+        # Quadratic reciprocity flips the sign iff a = n = 3 (mod 4)
+        a, n = n, a
+        if a & 3 == 3 and n & 3 == 3:
+            t = -t
+        a %= n
+
+    return t if n == 1 else 0
+
+
+def montgomery_batch_invert(field, elements):
+    """
+    The function `montgomery_batch_invert` inverts every element of `elements` using Montgomery's
+    simultaneous inversion trick: one inversion and about 3N multiplications instead of N inversions.
+
+    :param field: The field type of the elements (`Fp`, `Fp2`, `Fp6`, `Fp12` or `Scalar`). It must
+    provide `one`, `zero`, `conditional_select` and `invert`, and its elements `is_zero`
+    :param elements: The list of field elements to invert
+    :return: a list with the inverse of every element. Zero elements are skipped and map to zero.
+    """
+    # Running products of the nonzero elements seen so far
+    prefix = []
+    acc = field.one()
+    for e in elements:
+        prefix.append(acc)
+        acc = field.conditional_select(
+            acc * e, acc, Choice(1) if e.is_zero() else Choice(0)
+        )
+
+    # This is the inverse of the product of every nonzero element
+    acc = acc.invert().value
+
+    result = [None] * len(elements)
+    for i in reversed(range(len(elements))):
+        skip = Choice(1) if elements[i].is_zero() else Choice(0)
+
+        # prefix[i] * acc cancels every factor except elements[i]
+        result[i] = field.conditional_select(prefix[i] * acc, field.zero(), skip)
+        acc = field.conditional_select(acc * elements[i], acc, skip)
+
+    return result
+
+
+def window_width(bits):
+    """
+    The function `window_width` picks the sliding-window width minimising the number of
+    multiplications needed to exponentiate by an exponent of `bits` bits.
+
+    :param bits: The bit length of the exponent
+    :return: the window width, between 1 and 8
+    """
+    # A window of width w costs 2^(w - 1) multiplications to precompute the odd
+    # powers and saves all but about one multiplication every w + 1 bits.
+    return min(range(1, 9), key=lambda w: (1 << (w - 1)) + bits / (w + 1))
+
+
+class PowTable:
+    """
+    The odd powers base, base^3, ..., base^(2^width - 1) of a field element, used by
+    sliding-window exponentiation. A table can be kept and reused to exponentiate the same
+    base several times.
+    """
+
+    def __init__(self, base, width=5):
+        self.width = width
+        self.powers = [base]
+        if width > 1:
+            base2 = base.square()
+            for _ in range((1 << (width - 1)) - 1):
+                self.powers.append(self.powers[-1] * base2)
+
+    def pow_vartime(self, exponent):
+        """
+        Exponentiates the base of the table by the nonnegative integer `exponent`, using
+        left-to-right sliding windows over its bits.
+
+        **This operation is variable time with respect to the exponent.**
+
+        :param exponent: The exponent, as a Python integer
+        :return: base^exponent
+        """
+        base = self.powers[0]
+        res = None
+
+        i = exponent.bit_length() - 1
+        while i >= 0:
+            if (exponent >> i) & 1 == 0:
+                if res is not None:
+                    res = res.square()
+                i -= 1
+                continue
+
+            # The window runs from bit i down to the lowest set bit j of the next
+            # `width` bits, so that the digit it holds is odd.
+            j = max(i - self.width + 1, 0)
+            while (exponent >> j) & 1 == 0:
+                j += 1
+            digit = (exponent >> j) & ((1 << (i - j + 1)) - 1)
+
+            if res is None:
+                res = self.powers[digit >> 1]
+            else:
+                for _ in range(i - j + 1):
+                    res = res.square()
+                res = res * self.powers[digit >> 1]
+            i = j - 1
+
+        # No bit is set, so the result is the identity
+        return type(base).one() if res is None else res
+
+
+def pow_sliding_window(base, exponent):
+    """
+    The function `pow_sliding_window` exponentiates `base` by the nonnegative integer
+    `exponent` with sliding windows whose width depends on the size of the exponent.
+
+    **This operation is variable time with respect to the exponent.**
+
+    :param base: A field element (`Fp`, `Fp2`, `Fp6`, `Fp12` or `Scalar`)
+    :param exponent: The exponent, as a Python integer
+    :return: base^exponent
+    """
+    return PowTable(base, window_width(exponent.bit_length())).pow_vartime(exponent)
+
+
+def pow_fixed_window(base, exponent, bits, width=4):
+    """
+    The function `pow_fixed_window` exponentiates `base` by `exponent` with fixed windows of
+    `width` bits. Every window performs the same squarings and one multiplication, and the
+    table entry is read by scanning the whole table with `conditional_select`, so the sequence
+    of operations only depends on `bits`, not on the value of the exponent.
+
+    :param base: A field element, whose type provides `one` and `conditional_select`
+    :param exponent: The exponent, as a nonnegative Python integer smaller than 2^bits
+    :param bits: The number of exponent bits to process
+    :param width: The window width
+    :return: base^exponent
+    """
+    field = type(base)
+
+    # table[k] = base^k for 0 <= k < 2^width
+    table = [field.one(), base]
+    for _ in range((1 << width) - 2):
+        table.append(table[-1] * base)
+
+    res = field.one()
+    mask = (1 << width) - 1
+    for k in reversed(range((bits + width - 1) // width)):
+        for _ in range(width):
+            res = res.square()
+
+        digit = (exponent >> (k * width)) & mask
+        tmp = table[0]
+        for idx in range(1, len(table)):
+            tmp = field.conditional_select(
+                tmp, table[idx], Choice(1) if idx == digit else Choice(0)
+            )
+        res = res * tmp
+
+    return res
+
+
+def wnaf(k, width):
+    """
+    The function `wnaf` computes the width-`width` non-adjacent form of `k`: digits that are
+    either zero or odd with absolute value below 2^(width - 1), such that any `width`
+    consecutive digits contain at most one nonzero digit.
+
+    :param k: The nonnegative integer to recode
+    :param width: The window width, at least 2
+    :return: the list of digits, least significant first, with sum(d * 2^i) == k
+    """
+    digits = []
+    while k > 0:
+        if k & 1:
+            d = k & ((1 << width) - 1)
+            if d >= 1 << (width - 1):
+                d -= 1 << width
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+
+    return digits
+
+
+def signed_digits(k, width, count):
+    """
+    The function `signed_digits` recodes `k` into `count` signed base-2^width digits in
+    [-2^(width - 1), 2^(width - 1)). The number of digits is fixed by the caller, so it does
+    not depend on the value of `k`.
+
+    :param k: The nonnegative integer to recode, smaller than
+    (2^(width - 1) - 1) * 2^(width * (count - 1)) so that the carry fits in the top digit
+    :param width: The window width
+    :param count: The number of digits
+    :return: the list of digits, least significant first, with sum(d * 2^(width * i)) == k
+    """
+    digits = []
+    for _ in range(count):
+        d = k & ((1 << width) - 1)
+
+        # Digits of 2^(width - 1) or more become negative and carry one into
+        # the next window.
+        carry = d >> (width - 1)
+        digits.append(d - (carry << width))
+        k = (k >> width) + carry
+
+    return digits
+
+
 # The BLS parameter x for BLS12-381 is -0xd201000000010000
 BLS_X = 0xD201_0000_0001_0000
 BLS_X_IS_NEGATIVE = True
+
+
+def x_digits(k):
+    """
+    The function `x_digits` splits `k` into its four base-X digits, where X = -x = BLS_X. The
+    Frobenius map on Gt and psi on G2 both act as multiplication by p = x (mod q), so these
+    digits turn a 255-bit scalar multiplication into four 64-bit ones.
+
+    :param k: The nonnegative integer to split, smaller than X^4 (so any value below q)
+    :return: the list of digits (k0, k1, k2, k3), least significant first, with 0 <= ki < X and
+    sum(ki * X^i) == k
+    """
+    if not 0 <= k < BLS_X**4:
+        raise ValueError("Scalar must be in the range [0, X^4)")
+
+    digits = []
+    for _ in range(4):
+        k, d = divmod(k, BLS_X)
+        digits.append(d)
+
+    return digits
+
+
+# Arithmetic backend used by the field types. "limbs" emulates the 64-bit limb
+# arithmetic of the original Rust implementation, "native" stores every element
+# as a single Python integer and relies on CPython's bignum multiplication.
+# The backend is selected once, at import time, through the `BLS12_381_BACKEND`
+# environment variable.
+BACKEND = os.environ.get("BLS12_381_BACKEND", "limbs")
+
+if BACKEND not in ("limbs", "native"):
+    raise ValueError("BLS12_381_BACKEND must be either 'limbs' or 'native'")